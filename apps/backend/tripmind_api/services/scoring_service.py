@@ -151,7 +151,9 @@ class ScoringService:
         scored_pois = []
         for poi in poi_list:
             category = poi.get("category", "기타")
-            rating = poi.get("rating", 3.0)
+            rating = poi.get("rating")
+            if rating is None:  # 평점 정보 없는 POI (MCP 카탈로그는 rating=None)
+                rating = 3.0
             
             weight = current_weight.get(category, 1.0)
             score = rating * weight
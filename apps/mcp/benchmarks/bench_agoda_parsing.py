@@ -0,0 +1,114 @@
+# mcp/benchmarks/bench_agoda_parsing.py
+"""
+Agoda 응답 파싱 벤치마크: 전체 json 파싱 vs 스트리밍(필요 필드만, 상위 N개에서 중단)
+
+- 호텔: apps/mcp/hotel_response_full.json (실제 응답 샘플, 약 1.5MB)
+- 항공: bundle 수를 늘린 합성 왕복 응답
+응답 본문은 64KB 청크로 흘려보내며, tracemalloc으로 파싱 중 Python 힙 최대 증가량을 잽니다.
+
+실행 (apps/mcp 디렉토리에서):
+    python -m benchmarks.bench_agoda_parsing
+"""
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from mcp_server import json_stream
+from mcp_server.clients.agoda_client import AgodaClient
+
+HOTEL_SAMPLE = Path(__file__).resolve().parent.parent / "hotel_response_full.json"
+CHUNK_SIZE = 64 * 1024
+
+
+def _flight_body(num_bundles: int) -> bytes:
+    rng = random.Random(0)
+    segment = {"departDateTime": "2025-12-06T09:00:00", "arrivalDateTime": "2025-12-06T11:30:00",
+               "carrierContent": {"carrierName": "Korean Air", "carrierCode": "KE", "logo": "x" * 200},
+               "aircraft": {"name": "A330", "details": ["y" * 50] * 10}, "fareRules": ["z" * 100] * 5}
+    bundles = [{
+        "bundlePrice": [{"price": {"usd": {"display": {"perBook": {"allInclusive": rng.randint(200, 900)}}}}}],
+        "itineraries": [{"itineraryInfo": {"totalTripDuration": 150 + i}, "inboundSlice": {"segments": [segment] * 2}}],
+        "outboundSlice": {"segments": [dict(segment, departDateTime=f"2025-12-06T{i % 24:02d}:00:00")] * 2},
+    } for i in range(num_bundles)]
+    return json.dumps({"retry": {"next": 0}, "trips": [{"isCompleted": True, "bundles": bundles}]}).encode()
+
+
+async def _chunks(body: bytes):
+    for i in range(0, len(body), CHUNK_SIZE):
+        yield body[i:i + CHUNK_SIZE]
+
+
+def measure(label: str, fn, repeat: int = 5):
+    """파싱 시간(최솟값, tracemalloc 없이)과 Python 힙 최대 증가량을 따로 측정"""
+    result = fn()  # warm-up
+    elapsed = min(_timed(fn) for _ in range(repeat))
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10}: {elapsed:8.1f} ms, peak +{(peak - base) / 1024 / 1024:6.2f} MB, {result} items")
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def hotels_full(client, body):
+    data = json.loads(body)["data"]["citySearch"]
+    return len([client._parse_hotel_property(h, "Tokyo") for h in data["properties"][:AgodaClient.HOTEL_PAGE_SIZE]])
+
+
+def hotels_stream(client, body):
+    async def run():
+        paths = {path: AgodaClient.HOTEL_PROPERTY_FIELDS for path in AgodaClient.HOTEL_PROPERTY_PATHS}
+        hotels = []
+        async for _, value in json_stream.iter_paths(_chunks(body), paths):
+            hotels.append(client._parse_hotel_property(value, "Tokyo"))
+            if len(hotels) >= AgodaClient.HOTEL_PAGE_SIZE:
+                break
+        return len(hotels)
+    return asyncio.run(run())
+
+
+def flights_full(client, body):
+    trip = json.loads(body)["trips"][0]
+    flights = client._parse_flight_bundles(trip["bundles"], "ICN", "NRT")
+    return len(sorted(flights, key=lambda f: f["price_krw"])[:AgodaClient.FLIGHT_TOP_N])
+
+
+class _StreamedResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def aiter_bytes(self):
+        return _chunks(self.body)
+
+
+def flights_stream(client, body):
+    found = {}
+    asyncio.run(client._read_flight_poll(_StreamedResponse(body), "ICN", "NRT", found))
+    return len(found)
+
+
+if __name__ == "__main__":
+    print(f"ijson backend: {json_stream.ijson.backend if json_stream.ijson else 'not installed (fallback)'}")
+    client = AgodaClient()
+    client._get_usd_to_krw_rate = lambda: 1400.0
+
+    body = HOTEL_SAMPLE.read_bytes()
+    print(f"\n호텔 응답 ({len(body) / 1024 / 1024:.2f} MB)")
+    measure("json 전체", lambda: hotels_full(client, body))
+    measure("스트리밍", lambda: hotels_stream(client, body))
+
+    for n in (200, 1000):
+        body = _flight_body(n)
+        print(f"\n항공 응답 bundle {n}개 ({len(body) / 1024 / 1024:.2f} MB)")
+        measure("json 전체", lambda: flights_full(client, body))
+        measure("스트리밍", lambda: flights_stream(client, body))
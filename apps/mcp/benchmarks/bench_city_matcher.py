@@ -0,0 +1,44 @@
+# mcp/benchmarks/bench_city_matcher.py
+"""
+도시 이름 → IATA 색인 조회 벤치마크 (기존 선형 부분 문자열 탐색과 비교)
+
+실행 (apps/mcp 디렉토리에서):
+    python -m benchmarks.bench_city_matcher
+"""
+import time
+
+from mcp_server.clients.agoda_client import AgodaClient
+
+QUERIES = [
+    "도쿄", "도쿄 3박 4일 맛집 여행", "Kuala Lumpur", "東京都", "빈탄 리조트",
+    "Ho Chi Minh City", "로스앤젤레스", "unknown city somewhere", "괌여행", "malaga",
+]
+
+
+def linear_scan(query: str):
+    """이전 구현: 정확 일치 후 모든 키에 대해 양방향 부분 문자열 검사"""
+    lookup_key = query.lower()
+    if lookup_key in AgodaClient.CITY_IATA_MAP:
+        return AgodaClient.CITY_IATA_MAP[lookup_key]
+    for key, code in AgodaClient.CITY_IATA_MAP.items():
+        if key in lookup_key or lookup_key in key:
+            return code
+    return None
+
+
+def bench(fn, repeat: int = 2000) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for q in QUERIES:
+            fn(q)
+    return (time.perf_counter() - started) / (repeat * len(QUERIES)) * 1e6
+
+
+if __name__ == "__main__":
+    matcher = AgodaClient.CITY_MATCHER
+    print(f"별칭 수: {len(AgodaClient.CITY_IATA_MAP)}")
+    print(f"선형 탐색     : {bench(linear_scan):6.2f} µs/query")
+    print(f"Aho-Corasick : {bench(matcher.match):6.2f} µs/query")
+    print()
+    for q in QUERIES:
+        print(f"{q!r:>28} → 기존 {linear_scan(q)!s:>5} / 색인 {matcher.match(q)!s:>5}")
@@ -0,0 +1,34 @@
+# mcp/benchmarks/bench_geo_clustering.py
+"""
+일자별 POI 클러스터링 벤치마크
+
+실행 (apps/mcp 디렉토리에서):
+    python -m benchmarks.bench_geo_clustering
+"""
+import random
+import time
+
+from mcp_server.services.geo_clustering import cluster_pois_by_day
+
+
+def _make_pois(n: int, seed: int = 42) -> list[dict]:
+    """서울 도심 크기(약 30km 범위)에 무작위로 흩어진 가짜 POI 생성"""
+    rng = random.Random(seed)
+    return [
+        {"name": f"poi-{i}", "lat": 37.45 + rng.random() * 0.25, "lng": 126.85 + rng.random() * 0.30}
+        for i in range(n)
+    ]
+
+
+def bench(n: int, days: int, repeat: int = 50) -> float:
+    pois = _make_pois(n)
+    cluster_pois_by_day(pois, days)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        cluster_pois_by_day(pois, days)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    for n, days in [(50, 3), (150, 5), (300, 7), (500, 10)]:
+        print(f"POI {n:>4} / {days:>2}일: {bench(n, days):6.2f} ms")
@@ -0,0 +1,162 @@
+# mcp/mcp_server/cache.py
+"""
+MCP 서버 공용 비동기 인메모리 캐시
+
+- TTL이 지나면 stale 상태가 되고, stale_ttl 동안은 기존 값을 즉시 반환하면서
+  백그라운드에서 새 값을 가져옵니다 (stale-while-revalidate).
+- 같은 키에 대한 동시 miss는 하나의 upstream 호출로 합쳐집니다 (request coalescing).
+  기다리던 호출자가 모두 취소되면 공유 fetch도 취소합니다 (아무도 받지 않을 결과에 쿼터를 쓰지 않음).
+- max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다 (LRU).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CacheEntry:
+    __slots__ = ("value", "fetched_at", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fetched_at: float, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class Uncached:
+    """fetcher가 값을 이것으로 감싸 반환하면 기다리는 호출자에게는 값을 주되 캐시에는 저장하지 않습니다 (부분 결과 등)."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class AsyncTTLCache:
+    """stale-while-revalidate + 동시 요청 병합을 지원하는 비동기 TTL 캐시"""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 1024,
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ):
+        """
+        Args:
+            name: 로그/메트릭에 쓰이는 캐시 이름
+            ttl: 신선(fresh) 상태로 간주하는 시간(초)
+            stale_ttl: TTL 이후 stale 값을 그대로 내주며 갱신하는 추가 시간(초)
+            max_entries: 최대 항목 수 (LRU 제거)
+            cacheable: 저장할 값인지 판단하는 함수 (빈 결과/에러 결과는 저장하지 않기 위함)
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}  # 공유 fetch → 기다리는 호출자 수
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "coalesced": 0}
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """만료 여부와 무관하게 저장된 항목을 반환 (없으면 None)"""
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, fetched_at: Optional[float] = None) -> None:
+        now = time.time()
+        fetched_at = fetched_at if fetched_at is not None else now
+        fresh_until = fetched_at + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(value, fetched_at, fresh_until, fresh_until + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Tuple[Any, float, str]:
+        """
+        캐시 조회 후 필요하면 fetcher로 값을 가져옵니다.
+
+        Returns:
+            (값, 값을 가져온 시각(epoch 초), 상태: "hit" | "stale" | "miss")
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.value, entry.fetched_at, "hit"
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                self._schedule_refresh(key, fetcher, ttl)
+                return entry.value, entry.fetched_at, "stale"
+
+        self._stats["misses"] += 1
+        value, fetched_at = await self._fetch_coalesced(key, fetcher, ttl)
+        return value, fetched_at, "miss"
+
+    async def _fetch_coalesced(self, key: Hashable, fetcher, ttl) -> Tuple[Any, float]:
+        """
+        같은 키의 fetch를 하나의 Task로 실행하고 모든 호출자가 shield 해서 기다립니다.
+        어느 호출자가 취소(wait_for 시간 초과 등)되어도 다른 호출자가 기다리는 동안에는 공유 fetch가 계속되고,
+        마지막 호출자까지 취소되면 공유 fetch도 취소합니다.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+        else:
+            inflight = asyncio.create_task(self._run_fetch(key, fetcher, ttl))
+            # 기다리던 호출자가 모두 취소된 뒤 실패해도 'never retrieved' 경고가 나지 않도록 소비
+            inflight.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[key] = inflight
+        self._waiters[inflight] = self._waiters.get(inflight, 0) + 1
+        try:
+            return await asyncio.shield(inflight)
+        finally:
+            remaining = self._waiters.pop(inflight) - 1
+            if remaining:
+                self._waiters[inflight] = remaining
+            elif not inflight.done():
+                inflight.cancel()
+
+    async def _run_fetch(self, key: Hashable, fetcher, ttl) -> Tuple[Any, float]:
+        try:
+            value = await fetcher()
+            fetched_at = time.time()
+            if isinstance(value, Uncached):
+                value = value.value
+            elif self.cacheable(value):
+                self.set(key, value, ttl=ttl, fetched_at=fetched_at)
+            return value, fetched_at
+        finally:
+            self._inflight.pop(key, None)
+
+    def _schedule_refresh(self, key: Hashable, fetcher, ttl) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                self._stats["refreshes"] += 1
+                await self._fetch_coalesced(key, fetcher, ttl)
+            except Exception as e:
+                print(f"[Cache:{self.name}] ⚠️ Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), **self._stats}
@@ -4,10 +4,20 @@ import re
 import httpx
 import json
 import asyncio
+import contextlib
 import google.generativeai as genai
-import requests
-from datetime import date
+from datetime import date, datetime, timezone
+from ..cache import AsyncTTLCache, Uncached
+from .. import json_stream, metrics
+from ..rate_limiter import rapidapi_limiter
+from ..resilience import (
+    GEMINI_BREAKER, GEMINI_RETRY, GEMINI_RETRY_ON, STATE_OPEN,
+    ResilientTransport, RetryPolicy, call_async, get_breaker,
+)
+from .exchange_client import exchange_rate_table
 from ..config import settings
+from ..services.city_matcher import CityMatcher
+from ..stores.resolution_store import resolution_store, KIND_IATA, KIND_PLACE_ID
 
 
 class AgodaClientError(Exception):
@@ -15,88 +25,20 @@ class AgodaClientError(Exception):
     pass
 
 
-class ExchangeService:
-    """한국수출입은행 환율 정보 간편 조회"""
-    
+class _FlightSearchProgress:
+    """진행 중인 공유 항공권 검색의 최신 polling 스냅샷 (같은 검색을 기다리는 호출자들이 구독)"""
+
     def __init__(self):
-        try:
-            # ✅ 정확한 API URL (oapi 서브도메인)
-            self.base_url = settings.EXCHANGE_BASE or "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON"
-            self.auth_key = settings.EXCHANGE_API_KEY
-            self.data_code = settings.EXCHANGE_DATA_CODE or "AP01"
-            self.enabled = True
-            
-            # urllib3 경고 숨기기
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            
-        except AttributeError:
-            print("[ExchangeService] ⚠️ Exchange API settings not found, using fallback rate")
-            self.enabled = False
-    
-    def get_rate(self, currency_code: str, search_date: str = None) -> float:
-        if not self.enabled:
-            return 1300.0
-        
-        try:
-            params = {
-                "authkey": self.auth_key,
-                "data": self.data_code
-            }
-            
-            if search_date:
-                params["searchdate"] = search_date
-            
-            response = requests.get(
-                self.base_url,
-                params=params,
-                timeout=10,
-                verify=False
-            )
-            response.raise_for_status()
-            
-            # ✅ JSON 파싱 에러 방지
-            try:
-                rows = response.json()
-            except ValueError as e:
-                print(f"[ExchangeService] ❌ JSON parse error: {e}")
-                print(f"[ExchangeService] Raw response: {response.text[:200]}")
-                return 1300.0
-            
-            # ✅ 응답 검증 (기존과 동일)
-            if not rows or not isinstance(rows, list):
-                print(f"[ExchangeService] ⚠️ Invalid response format")
-                return 1300.0
-            
-            # 첫 번째 항목의 result 확인
-            if rows and rows[0].get("result") != 1:
-                result_code = rows[0].get("result")
-                error_msg = {
-                    2: "DATA 코드 오류",
-                    3: "인증코드 오류", 
-                    4: "일일제한횟수 마감"
-                }.get(result_code, f"알 수 없는 오류 ({result_code})")
-                print(f"[ExchangeService] ❌ API Error: {error_msg}")
-                return 1300.0
-            
-            # USD 찾기
-            for row in rows:
-                cur_unit = row.get("cur_unit", "")
-                if cur_unit.upper().startswith("USD"):
-                    deal_bas_r = row.get("deal_bas_r", "0")
-                    try:
-                        rate = float(deal_bas_r.replace(",", ""))
-                        print(f"[ExchangeService] ✅ USD: {rate} KRW")
-                        return rate
-                    except (ValueError, AttributeError):
-                        continue
-            
-            print(f"[ExchangeService] ⚠️ USD not found")
-            return 1300.0
-            
-        except Exception as e:
-            print(f"[ExchangeService] ❌ Error: {e}")
-            return 1300.0
+        self.snapshot: dict | None = None
+        self.changed = asyncio.Event()
+        self.active = False  # 공유 검색이 이 객체에 스냅샷을 올리는 중인지
+
+    def publish(self, snapshot: dict) -> None:
+        self.snapshot = snapshot
+        # 이벤트를 교체해 두면 기다리던 호출자는 깨어나고, 다음 대기는 새 스냅샷을 기다림
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
 
 class AgodaClient:
     """RapidAPI Agoda API 통합 클라이언트"""
@@ -119,23 +61,41 @@ class AgodaClient:
             print(f"[AgodaClient] Gemini Init Failed: {e}")
             self.use_llm = False
         
-        # ✅ 환율 서비스 및 캐시
-        self.exchange_service = ExchangeService()
-        self._usd_to_krw_rate = None
+        # ✅ 환율 테이블 (서버 시작 시 미리 로드, 주기적 갱신 — 조회 시 네트워크 호출 없음)
+        self.exchange_rates = exchange_rate_table
+
+        # 항공권 polling 등에서 재사용하는 공유 HTTP 클라이언트 (지연 생성)
+        self._http_client: httpx.AsyncClient | None = None
+
+        # ✅ 도시 → place_id / IATA 해석 결과 영구 저장소 (워커 간 공유)
+        self.resolution_store = resolution_store
+
+        # ✅ 항공권 검색 결과 캐시 (빈 결과는 저장하지 않음)
+        self.flight_cache = AsyncTTLCache(
+            "flights",
+            ttl=settings.FLIGHT_CACHE_TTL,
+            stale_ttl=settings.FLIGHT_CACHE_STALE_TTL,
+            max_entries=2048,
+            cacheable=bool,
+        )
+        # 호텔 상세: (hotelId, 체크인, 체크아웃, 인원) 단위 캐시 + 백그라운드 prefetch Task 보관
+        self.hotel_details_cache = AsyncTTLCache(
+            "hotel_details",
+            ttl=settings.HOTEL_DETAILS_CACHE_TTL,
+            max_entries=4096,
+        )
+        self._prefetch_tasks = set()
+        # 캐시 키 → 진행 중인 공유 항공권 검색의 스냅샷, 조기 반환한 호출자가 남겨 둔 검색 Task
+        self._flight_progress: dict = {}
+        self._background_searches = set()
+        # 모든 RapidAPI 호출이 공유하는 속도 제한/쿼터 추적 (공유 HTTP 클라이언트의 transport, 재시도 포함)
+        self.rate_limiter = rapidapi_limiter
+        metrics.register("cache.flights", self.flight_cache.stats)
+        metrics.register("cache.hotel_details", self.hotel_details_cache.stats)
     
     def _get_usd_to_krw_rate(self) -> float:
-        """USD → KRW 환율 조회 (캐시 사용)"""
-        if self._usd_to_krw_rate:
-            return self._usd_to_krw_rate
-        
-        try:
-            self._usd_to_krw_rate = self.exchange_service.get_rate("USD")
-            print(f"[Agoda] ✅ USD/KRW rate: {self._usd_to_krw_rate}")
-        except Exception as e:
-            print(f"[Agoda] ⚠️ Exchange API error: {e}, using fallback rate: 1300")
-            self._usd_to_krw_rate = 1300.0
-        
-        return self._usd_to_krw_rate
+        """USD → KRW 환율 (메모리 테이블 조회)"""
+        return self.exchange_rates.get_rate("USD")
 
     async def _ask_llm_for_iata(self, location: str) -> str | None:
         """LLM에게 도시 이름을 주고 IATA 코드를 물어봅니다."""
@@ -147,7 +107,10 @@ class AgodaClient:
             Return ONLY the code (e.g., NRT). No extra text.
             If multiple airports, choose the main international one.
             """
-            response = await self.llm_model.generate_content_async(prompt)
+            response = await call_async(
+                GEMINI_BREAKER, GEMINI_RETRY,
+                lambda: self.llm_model.generate_content_async(prompt), retry_on=GEMINI_RETRY_ON
+            )
             code = response.text.strip().upper()
             if re.match(r'^[A-Z]{3}$', code):
                 return code
@@ -317,6 +280,29 @@ class AgodaClient:
         "양양": "YNY", "yangyang": "YNY",
     }
 
+    # CITY_IATA_MAP 별칭 색인 (클래스 로드 시 한 번 생성, 질의 길이에 비례하는 조회)
+    CITY_MATCHER = CityMatcher(CITY_IATA_MAP)
+
+    # 공항이 여러 개인 도시: 대표 공항 코드 → 출발 후보 공항 (도시 이름으로 출발지를 말한 경우)
+    MULTI_AIRPORT_CITIES = {
+        "ICN": ("ICN", "GMP"),
+        "NRT": ("NRT", "HND"),
+        "KIX": ("KIX", "ITM"),
+        "PVG": ("PVG", "SHA"),
+        "PEK": ("PEK", "PKX"),
+        "TPE": ("TPE", "TSA"),
+        "BKK": ("BKK", "DMK"),
+        "LHR": ("LHR", "LGW"),
+        "JFK": ("JFK", "EWR", "LGA"),
+        "CDG": ("CDG", "ORY"),
+    }
+    # 특정 공항을 가리키는 별칭 (이 경우 그 공항만 검색)
+    AIRPORT_ALIASES = {
+        "인천", "김포", "나리타", "하네다", "간사이", "간사이공항", "김해",
+        "푸동", "홍차오", "타오위안", "수완나품", "돈므앙", "히드로",
+    }
+    DEFAULT_ORIGIN_AIRPORTS = ("ICN",)
+
     async def _get_iata_code(self, client: httpx.AsyncClient, city_name: str) -> str | None:
         """도시 이름을 IATA 코드로 변환"""
         if not city_name:
@@ -331,34 +317,34 @@ class AgodaClient:
         if iata_match:
             return iata_match.group(1)
 
-        # 3. 하드코딩 테이블 조회 (네트워크 없이 즉시 반환)
         clean = re.sub(r'\([^)]*\)', '', city_name).strip()
         clean = re.split(r'[/,]', clean)[0].strip()
-        lookup_key = clean.lower()
-        # 전체 문자열 → 부분 문자열 순서로 탐색
-        if lookup_key in self.CITY_IATA_MAP:
-            code = self.CITY_IATA_MAP[lookup_key]
-            print(f"[AgodaClient] 🗺️ IATA table hit: {city_name} → {code}")
+
+        # 3. 이전에 해석해 둔 결과 / 관리자 보정값 (영구 저장소, 메모리 조회)
+        stored = await asyncio.to_thread(self.resolution_store.get_value, KIND_IATA, clean)
+        if stored:
+            print(f"[AgodaClient] 🗄️ IATA store hit: {city_name} → {stored}")
+            return stored
+
+        # 4. 하드코딩 테이블 색인 조회 (정확 일치 → 경계 규칙을 지키는 별칭 매칭 → 접두어)
+        found = self.CITY_MATCHER.find(clean)
+        if found:
+            alias, code = found
+            print(f"[AgodaClient] 🗺️ IATA table hit: {city_name} → {code} (via '{alias}')")
             return code
-        for key, code in self.CITY_IATA_MAP.items():
-            if key in lookup_key or lookup_key in key:
-                print(f"[AgodaClient] 🗺️ IATA table partial: {city_name} → {code} (via '{key}')")
-                return code
 
-        # 4. LLM에게 물어보기
+        # 5. LLM에게 물어보기
         llm_code = await self._ask_llm_for_iata(city_name)
         if llm_code:
+            await asyncio.to_thread(self.resolution_store.put, KIND_IATA, clean, llm_code, source="gemini", confidence=0.6)
             return llm_code
 
-        # 5. API 검색 (Fallback)
+        # 6. API 검색 (Fallback)
         try:
-            clean_query = re.sub(r'\([^)]*\)', '', city_name).strip()
-            clean_query = re.split(r'[/,]', clean_query)[0].strip()
-            
             response = await client.get(
                 f"{self.base_url}/flights/auto-complete",
                 headers=self.headers,
-                params={"query": clean_query}
+                params={"query": clean}
             )
             
             if response.status_code == 200:
@@ -369,18 +355,383 @@ class AgodaClient:
                            (first.get("tripLocations") and first["tripLocations"][0].get("code")) or \
                            (first.get("airports") and first["airports"][0].get("code"))
                     if code:
+                        await asyncio.to_thread(self.resolution_store.put, KIND_IATA, clean, code,
+                                                source="agoda_autocomplete", confidence=0.8)
                         return code
             return None
         except:
             return None
 
-    # ✅ search_flights를 동기 함수로 유지 (원본 그대로)
-    def search_flights(self, origin, destination, depart_date, return_date, adults=1):
+    # 항공권 검색 polling 설정 (Agoda는 검색이 끝날 때까지 retry.next(ms) 후 재요청을 요구)
+    FLIGHT_MAX_POLLS = 10
+    FLIGHT_MAX_POLL_DELAY = 5.0
+    FLIGHT_TOP_N = 10
+    FLIGHT_CABIN_CLASS = "ECONOMY"
+
+    # 엔드포인트별 (브레이커 이름, 재시도 정책) — RapidAPI 429는 쿼터 문제이므로 재시도하지 않음
+    RAPIDAPI_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+    ENDPOINT_POLICIES = (
+        ("/flights/search", "agoda.flights", RetryPolicy(attempts=2, base_delay=0.5, retry_statuses=RAPIDAPI_RETRY_STATUSES)),
+        ("/hotels/search", "agoda.hotels", RetryPolicy(attempts=3, retry_statuses=RAPIDAPI_RETRY_STATUSES)),
+        ("/hotels/details", "agoda.hotel_details", RetryPolicy(attempts=2, retry_statuses=RAPIDAPI_RETRY_STATUSES)),
+        ("/auto-complete", "agoda.autocomplete", RetryPolicy(attempts=3, retry_statuses=RAPIDAPI_RETRY_STATUSES)),
+    )
+    DEFAULT_POLICY = ("agoda.other", RetryPolicy(attempts=2, retry_statuses=RAPIDAPI_RETRY_STATUSES))
+
+    def _route_request(self, request: httpx.Request):
+        path = request.url.path
+        for fragment, breaker_name, policy in self.ENDPOINT_POLICIES:
+            if fragment in path:
+                return breaker_name, policy
+        return self.DEFAULT_POLICY
+
+    def _upstream_unavailable(self, breaker_name: str) -> bool:
+        """쿼터 소진 또는 브레이커 open: 새 요청 대신 캐시로 응답해야 하는 상태"""
+        return self.rate_limiter.cached_only or get_breaker(breaker_name).state == STATE_OPEN
+
+    async def resolve_origin_airports(self, origin: str | None) -> list:
+        """
+        출발지를 검색할 출발 공항 후보 목록으로 변환합니다.
+
+        "서울" → [ICN, GMP], "부산" → [PUS], "김포" / "GMP" → [GMP]
+        해석하지 못하면 DEFAULT_ORIGIN_AIRPORTS 를 사용합니다.
+        도시의 모든 공항으로 넓히는 것은 FLIGHT_MULTI_AIRPORT_ORIGINS가 켜져 있을 때만입니다
+        (공항마다 RapidAPI 검색이 한 번씩 더 들어가므로 기본은 대표 공항만).
+        """
+        text = (origin or "").strip()
+        if not text:
+            return list(self.DEFAULT_ORIGIN_AIRPORTS)
+        if re.fullmatch(r'[A-Za-z]{3}', text):
+            return [text.upper()]
+
+        found = self.CITY_MATCHER.find(text)
+        if found and found[0] in self.AIRPORT_ALIASES:
+            return [found[1]]
+
+        code = await self._get_iata_code(self._get_http_client(), text)
+        if not code:
+            print(f"[Agoda] ⚠️ Could not resolve origin '{origin}', using {self.DEFAULT_ORIGIN_AIRPORTS}")
+            return list(self.DEFAULT_ORIGIN_AIRPORTS)
+        if not settings.FLIGHT_MULTI_AIRPORT_ORIGINS:
+            return [code]
+        return list(self.MULTI_AIRPORT_CITIES.get(code, (code,)))
+
+    async def search_flights_from_airports(self, origins: list, destination, depart_date, return_date, adults=1,
+                                           min_results: int | None = None):
+        """
+        여러 출발 공항에서 동시에 항공권을 검색해 가격순 후보 하나로 합칩니다.
+
+        각 공항 검색은 FLIGHT_ORIGIN_TIMEOUT 초 안에 끝나지 않으면 취소되어
+        느린 공항 하나가 전체 응답을 늦추지 않습니다. (모든 요청은 공유 RapidAPI 제한기를 거침)
+        한 공항 검색이 실패해도 그 공항만 빈 결과로 처리하고 나머지 공항 결과는 그대로 합칩니다.
         """
-        항공권 검색 (왕복)
+        timeout = settings.FLIGHT_ORIGIN_TIMEOUT
+
+        async def search(origin):
+            try:
+                return await asyncio.wait_for(
+                    self.search_flights(origin, destination, depart_date, return_date, adults, min_results=min_results),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"[Agoda] ⏱️ Flight search from {origin} timed out after {timeout}s")
+                return []
+            except Exception as e:
+                print(f"[Agoda] ❌ Flight search from {origin} failed: {e}")
+                return []
+
+        origins = [o for o in dict.fromkeys(origins) if o and o != destination]
+        results = await asyncio.gather(*(search(o) for o in origins))
+
+        merged = {}
+        for flights in results:
+            for flight in flights:
+                key = (flight['origin'],) + self._flight_itinerary_key(flight)
+                if key not in merged or flight['price_krw'] < merged[key]['price_krw']:
+                    merged[key] = flight
+        ranked = sorted(merged.values(), key=lambda f: f['price_krw'])[:self.FLIGHT_TOP_N]
+        print(f"[Agoda] ✈️ Merged flights from {origins}: {[len(r) for r in results]} → {len(ranked)}")
+        return ranked
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """연결을 재사용하는 공유 AsyncClient (이벤트 루프 하나에서 여러 검색이 함께 사용)"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                # 재시도 → 속도 제한/쿼터 → 실제 전송 (재시도마다 토큰을 얻고 쿼터에 반영)
+                transport=ResilientTransport(
+                    self._route_request,
+                    self.rate_limiter.transport(
+                        httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+                    ),
+                ),
+            )
+        return self._http_client
+
+    async def aclose(self):
+        """서버 종료 시 진행 중인 prefetch/백그라운드 항공권 검색과 공유 HTTP 클라이언트 정리"""
+        tasks = list(self._prefetch_tasks) + list(self._background_searches)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def iter_flight_results(self, origin, destination, depart_date, return_date, adults=1):
+        """
+        항공권 검색 결과를 polling 라운드마다 점진적으로 돌려주는 async iterator
+
+        Agoda는 검색이 끝나기 전 라운드에도 쓸 만한 bundle을 내려주므로,
+        매 라운드마다 지금까지 찾은 항공편(여정 기준 중복 제거, 가격 오름차순)을 yield 합니다.
+        호출 측은 충분히 좋은 결과가 나오면 반복을 멈춰 나머지 polling을 생략할 수 있습니다.
+
+        Yields:
+            dict: {
+                "flights": [...],      # 지금까지 찾은 항공편 (가격 오름차순)
+                "completed": bool,     # Agoda 검색 완료 여부 (마지막 yield에서 True 또는 polling 소진)
+                "poll": int            # 0부터 시작하는 polling 라운드
+            }
+        """
+        url = f"{self.base_url}/flights/search-roundtrip"
+        querystring = {
+            "origin": origin,
+            "destination": destination,
+            "departureDate": depart_date,
+            "returnDate": return_date,
+            "adults": str(adults),
+            "children": "0",
+            "infants": "0",
+            "cabinClass": self.FLIGHT_CABIN_CLASS,
+            "currency": "USD",
+            "market": "en-us",
+            "countryCode": "US"
+        }
+
+        print(f"[Agoda] 🔍 Searching flights: {origin} → {destination} ({depart_date} ~ {return_date})")
+
+        client = self._get_http_client()
+        found = {}  # 여정 키 → 항공편 (같은 여정은 더 싼 가격만 유지)
+
+        for poll in range(self.FLIGHT_MAX_POLLS + 1):
+            async with client.stream("GET", url, headers=self.headers, params=querystring) as response:
+                response.raise_for_status()
+                is_completed, retry_delay = await self._read_flight_poll(response, origin, destination, found)
+
+            completed = bool(is_completed) or not retry_delay or poll == self.FLIGHT_MAX_POLLS
+            print(f"[Agoda] ⏳ Poll {poll}: {len(found)} flights so far (isCompleted={is_completed})")
+
+            yield {
+                "flights": sorted(found.values(), key=lambda f: f['price_krw']),
+                "completed": completed,
+                "poll": poll
+            }
+            if completed:
+                return
+
+            # ✅ retry.next(ms)만큼 non-blocking 대기
+            await asyncio.sleep(min(retry_delay / 1000, self.FLIGHT_MAX_POLL_DELAY))
+
+    # _parse_flight_bundles가 실제로 읽는 bundle 필드
+    FLIGHT_BUNDLE_FIELDS = (
+        "bundlePrice.item.price.usd.display.perBook.allInclusive",
+        "itineraries.item.itineraryInfo.totalTripDuration",
+        "itineraries.item.inboundSlice.segments.item.departDateTime",
+        "itineraries.item.inboundSlice.segments.item.arrivalDateTime",
+        "outboundSlice.segments.item.departDateTime",
+        "outboundSlice.segments.item.arrivalDateTime",
+        "outboundSlice.segments.item.carrierContent.carrierName",
+    )
+
+    async def _read_flight_poll(self, response: httpx.Response, origin: str, destination: str, found: dict):
+        """
+        polling 응답 하나를 스트리밍으로 읽어 found(여정 키 → 항공편)에 합칩니다.
+
+        bundle은 읽는 즉시 작은 항공편 dict로 바꾸고 원본은 버리며, found는 가장 싼
+        FLIGHT_TOP_N개 여정만 유지하므로 bundle 수와 무관하게 메모리 사용량이 일정합니다.
+
+        Returns:
+            (첫 trip의 isCompleted, retry.next(ms))
+        """
+        is_completed = None
+        retry_delay = None
+        paths = {
+            "trips.item.bundles.item": self.FLIGHT_BUNDLE_FIELDS,
+            "trips.item.isCompleted": None,
+            "retry.next": None,
+        }
+        async with contextlib.aclosing(json_stream.iter_paths(response.aiter_bytes(), paths)) as values:
+            async for path, value in values:
+                if path == "retry.next":
+                    retry_delay = value
+                elif path == "trips.item.isCompleted":
+                    if is_completed is None:
+                        is_completed = value
+                else:
+                    for flight in self._parse_flight_bundles([value], origin, destination):
+                        key = self._flight_itinerary_key(flight)
+                        if key not in found or flight['price_krw'] < found[key]['price_krw']:
+                            found[key] = flight
+                    if len(found) > 2 * self.FLIGHT_TOP_N:
+                        self._keep_cheapest(found, self.FLIGHT_TOP_N)
+        self._keep_cheapest(found, self.FLIGHT_TOP_N)
+        return is_completed, retry_delay
+
+    @staticmethod
+    def _keep_cheapest(found: dict, n: int) -> None:
+        """found에서 가장 싼 n개 여정만 남깁니다 (제자리 수정)"""
+        if len(found) <= n:
+            return
+        keep = set(sorted(found, key=lambda k: found[k]['price_krw'])[:n])
+        for key in [k for k in found if k not in keep]:
+            del found[key]
+
+    @staticmethod
+    def _flight_itinerary_key(flight: dict) -> tuple:
+        """같은 여정(항공사 + 왕복 시각 + 경유 수)을 식별하는 키"""
+        return (
+            flight['airline'],
+            flight['outbound_departure_time'],
+            flight['outbound_arrival_time'],
+            flight['inbound_departure_time'],
+            flight['inbound_arrival_time'],
+            flight['segments'],
+        )
+
+    def _flight_cache_key(self, origin, destination, depart_date, return_date, adults=1) -> tuple:
+        return (origin, destination, depart_date, return_date, int(adults), self.FLIGHT_CABIN_CLASS)
+
+    @staticmethod
+    def _with_fetch_time(flights: list, fetched_at: float) -> list:
+        fetched_iso = datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat()
+        return [{**f, 'price_fetched_at': fetched_iso} for f in flights]
+
+    async def search_flights(self, origin, destination, depart_date, return_date, adults=1,
+                             min_results: int | None = None, max_price_krw: int | None = None):
+        """
+        항공권 검색 (캐시 우선)
+
+        (출발지, 도착지, 가는 날, 오는 날, 인원, 좌석 등급) 단위로 끝까지 polling 한 결과만 캐시합니다.
+        TTL이 지난 항목은 즉시 반환하면서 백그라운드에서 다시 검색합니다 (stale-while-revalidate).
+        각 항공편에는 가격을 조회한 시각(price_fetched_at, UTC ISO)이 붙습니다.
+        RapidAPI 쿼터가 바닥났거나 항공권 API 브레이커가 열린 동안에는 만료 여부와 무관하게 캐시된 결과만 반환합니다.
+
+        Args:
+            min_results: 이 개수 이상의 항공편이 (max_price_krw 이하로) 모이면 검색 완료 전이라도 그 스냅샷을 반환.
+                         공유 검색은 백그라운드에서 끝까지 polling 해 완전한 결과를 캐시합니다.
+            max_price_krw: 조기 반환 판단 시 인정할 최대 가격 (None이면 가격 무관)
+        """
+        flights, status = [], "miss"
+        async with contextlib.aclosing(
+            self.iter_flight_search(origin, destination, depart_date, return_date, adults)
+        ) as progress:
+            async for snapshot in progress:
+                flights, status = snapshot["flights"], snapshot["status"]
+                if snapshot["completed"]:
+                    break
+                if min_results:
+                    good = [f for f in flights if max_price_krw is None or f['price_krw'] <= max_price_krw]
+                    if len(good) >= min_results:
+                        print(f"[Agoda] ⚡ Early return after poll {snapshot['poll']}: {len(good)} flights meet threshold "
+                              f"(search continues in background)")
+                        break
+        print(f"[Agoda] 🗄️ Flight cache {status}: {origin} → {destination} ({depart_date} ~ {return_date})")
+        return flights
+
+    async def iter_flight_search(self, origin, destination, depart_date, return_date, adults=1):
+        """
+        캐시/공유 검색을 거쳐 항공권 검색 진행 상황을 돌려주는 async iterator
+
+        - 캐시에 있으면 (또는 쿼터 소진/브레이커 open으로 캐시만 쓸 수 있으면) 완료 스냅샷 하나만 yield 합니다.
+        - 같은 검색이 이미 진행 중이면 새로 polling 하지 않고 그 검색의 스냅샷을 함께 받습니다.
+        - 호출자가 완료 전에 반복을 멈춰도 공유 검색은 끝까지 진행되어 완전한 결과가 캐시됩니다.
+          호출자 Task가 취소되면 이 호출자의 대기를 취소하고, 같은 검색을 기다리는 다른 호출자가 없으면 검색도 멈춥니다.
+
+        Yields:
+            dict: {
+                "flights": [...],  # 지금까지 찾은 항공편 (가격 오름차순, price_fetched_at 포함)
+                "completed": bool, # 마지막 yield에서만 True
+                "poll": int | None,
+                "status": str      # "searching" | "hit" | "stale" | "miss" | "cached-only" | "cached-only miss"
+            }
+        """
+        key = self._flight_cache_key(origin, destination, depart_date, return_date, adults)
+        if self._upstream_unavailable("agoda.flights"):
+            entry = self.flight_cache.peek(key)
+            if entry:
+                yield {"flights": self._with_fetch_time(entry.value, entry.fetched_at),
+                       "completed": True, "poll": None, "status": "cached-only"}
+            else:
+                yield {"flights": [], "completed": True, "poll": None, "status": "cached-only miss"}
+            return
+
+        progress = self._flight_progress.setdefault(key, _FlightSearchProgress())
+        search = asyncio.ensure_future(self.flight_cache.get_or_fetch(
+            key, lambda: self._fetch_flights_shared(key, origin, destination, depart_date, return_date, adults)
+        ))
+        try:
+            seen = None
+            while not search.done():
+                snapshot = progress.snapshot
+                if snapshot is not None and snapshot is not seen and not snapshot["completed"]:
+                    seen = snapshot
+                    yield {"flights": self._with_fetch_time(snapshot["flights"], datetime.now(timezone.utc).timestamp()),
+                           "completed": False, "poll": snapshot["poll"], "status": "searching"}
+                    continue
+                changed = asyncio.ensure_future(progress.changed.wait())
+                try:
+                    await asyncio.wait({search, changed}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    changed.cancel()
+
+            flights, fetched_at, status = search.result()
+            last = progress.snapshot
+            yield {"flights": self._with_fetch_time(flights, fetched_at), "completed": True,
+                   "poll": last["poll"] if last else None, "status": status}
+        except GeneratorExit:
+            # 조기 반환: 공유 검색은 끝까지 진행해 캐시를 채우도록 Task를 보관
+            if not search.done():
+                self._background_searches.add(search)
+                search.add_done_callback(self._background_searches.discard)
+                search.add_done_callback(lambda task: task.cancelled() or task.exception())
+            raise
+        except asyncio.CancelledError:
+            search.cancel()
+            raise
+        finally:
+            if not progress.active and self._flight_progress.get(key) is progress:
+                del self._flight_progress[key]
+
+    async def _fetch_flights_shared(self, key, origin, destination, depart_date, return_date, adults):
+        """캐시 miss 시 하나만 실행되는 공유 검색: 끝까지 polling 하며 라운드마다 스냅샷을 공개"""
+        progress = self._flight_progress.setdefault(key, _FlightSearchProgress())
+        progress.active = True
+        try:
+            flights, complete = await self._search_flights_live(
+                origin, destination, depart_date, return_date, adults, progress=progress
+            )
+        finally:
+            progress.active = False
+            if self._flight_progress.get(key) is progress:
+                del self._flight_progress[key]
+        # 오류로 중간에 끊긴 결과는 기다리던 호출자에게만 주고 캐시하지 않음
+        return flights if complete else Uncached(flights)
+
+    async def _search_flights_live(self, origin, destination, depart_date, return_date, adults=1,
+                                   progress: _FlightSearchProgress | None = None):
+        """
+        항공권 검색 (왕복, 비동기, 캐시 없이 Agoda 직접 호출)
+
+        polling은 asyncio.sleep으로 대기하므로 스레드를 점유하지 않으며,
+        호출한 Task가 취소되면 즉시 중단됩니다.
+
+        Args:
+            progress: 주어지면 polling 라운드마다 스냅샷을 공개 (같은 검색을 기다리는 호출자의 조기 반환용)
         
         Returns:
-            list: 항공편 리스트, 각 항공편은 다음 필드를 포함:
+            (flights, complete): complete는 오류 없이 검색이 끝났는지 여부
+            flights: 항공편 리스트 (가격 오름차순, 상위 FLIGHT_TOP_N개), 각 항공편은 다음 필드를 포함:
                 - outbound_departure_time: 출국편 출발 시간
                 - outbound_arrival_time: 출국편 도착 시간
                 - inbound_departure_time: 입국편 출발 시간 (왕복인 경우)
@@ -389,180 +740,120 @@ class AgodaClient:
                 - airline: 항공사
                 - duration: 총 소요 시간 (분)
         """
+        flights = []
+        complete = False
         try:
-            # API 호출
-            url = "https://agoda-com.p.rapidapi.com/flights/search-roundtrip"
-            
-            querystring = {
-                "origin": origin,
-                "destination": destination,
-                "departureDate": depart_date,
-                "returnDate": return_date,
-                "adults": str(adults),
-                "children": "0",
-                "infants": "0",
-                "cabinClass": "ECONOMY",
-                "currency": "USD",
-                "market": "en-us",
-                "countryCode": "US"
-            }
-            
-            headers = {
-                "x-rapidapi-key": self.api_key,
-                "x-rapidapi-host": "agoda-com.p.rapidapi.com"
-            }
-            
-            print(f"[Agoda] 🔍 Searching flights: {origin} → {destination} ({depart_date} ~ {return_date})")
-            
-            response = requests.get(url, headers=headers, params=querystring, timeout=60)
-            response.raise_for_status()
-            
-            data = response.json()
-
-            # ✅ Retry 로직 (비동기 검색 대응)
-            import time
-            retry_info = data.get('retry') or {}
-            max_retries = 10
-            retry_count = 0
-
-            while retry_info.get('next') and retry_count < max_retries:
-                trips = data.get('trips', [])
-                if trips and trips[0].get('isCompleted') and trips[0].get('bundles'):
-                    print(f"[Agoda] ✅ Search completed! Found {len(trips[0].get('bundles', []))} bundles")
-                    break
-
-                retry_delay = min((retry_info.get('next') or 2000) / 1000, 5.0)
-                print(f"[Agoda] ⏳ Search in progress, retrying in {retry_delay}s... ({retry_count + 1}/{max_retries})")
-                time.sleep(retry_delay)
-
-                response = requests.get(url, headers=headers, params=querystring, timeout=60)
-                response.raise_for_status()
-                data = response.json()
-                retry_info = data.get('retry') or {}
-                retry_count += 1
-
-            # ✅ 디버깅 로그 추가
-            print(f"[Agoda] 🔍 API Response keys: {list(data.keys())}")
-            print(f"[Agoda] 🔍 Status: {data.get('status')}")
-            print(f"[Agoda] 🔍 Retry info: {data.get('retry')}")
-
-            trips = data.get('trips', [])
-            if not trips:
-                print(f"[Agoda] ❌ No trips in response")
-                return []
+            async with contextlib.aclosing(
+                self.iter_flight_results(origin, destination, depart_date, return_date, adults)
+            ) as polls:
+                async for snapshot in polls:
+                    flights = snapshot["flights"]
+                    complete = snapshot["completed"]
+                    if progress is not None:
+                        progress.publish(snapshot)
 
-            trip = trips[0]
-            print(f"[Agoda] 🔍 Trip[0] keys: {list(trip.keys())}")
-            print(f"[Agoda] 🔍 isCompleted: {trip.get('isCompleted')}")
-            print(f"[Agoda] 🔍 Bundles count: {len(trip.get('bundles', []))}")
-
-            bundles = trip.get('bundles', [])
-            # isCompleted가 False여도 bundles가 있으면 사용
-            if not bundles:
-                print(f"[Agoda] ❌ No bundles found (isCompleted={trip.get('isCompleted')})")
-                return []
-            
-            if not bundles:
-                print(f"[Agoda] No flight bundles found")
-                return []
-            
-            flights = []
-            
-            # ✅ 환율 가져오기
-            usd_to_krw = self._get_usd_to_krw_rate()
-            
-            for bundle in bundles[:10]:  # 상위 10개만
-                try:
-                    # 가격 정보
-                    price_info = bundle.get('bundlePrice', [{}])[0].get('price', {}).get('usd', {})
-                    price_usd = price_info.get('display', {}).get('perBook', {}).get('allInclusive', 0)
-                    
-                    # USD → KRW 변환
-                    price_krw = int(price_usd * usd_to_krw)
-                    
-                    # 여정 정보
-                    itineraries = bundle.get('itineraries', [])
-                    if not itineraries:
-                        continue
-                    
-                    itinerary_info = itineraries[0].get('itineraryInfo', {})
-                    
-                    # Outbound (출국편)
-                    outbound_slice = bundle.get('outboundSlice', {})
-                    outbound_segments = outbound_slice.get('segments', [])
-                    
-                    # ✅ 출국편 시간 추출
-                    outbound_departure_time = None
-                    outbound_arrival_time = None
-                    
-                    if outbound_segments:
-                        # 첫 번째 구간의 출발 시간
-                        outbound_departure_time = outbound_segments[0].get('departDateTime')
-                        # 마지막 구간의 도착 시간
-                        outbound_arrival_time = outbound_segments[-1].get('arrivalDateTime')
-                    
-                    # Inbound (입국편) - 왕복인 경우에만
-                    if itineraries:
-                        first_itinerary = itineraries[0]
-                        inbound_slice = first_itinerary.get('inboundSlice')
-                    inbound_departure_time = None
-                    inbound_arrival_time = None
-                    
-                    if inbound_slice:
-                        inbound_segments = inbound_slice.get('segments', [])
-                        if inbound_segments:
-                            # 첫 번째 구간의 출발 시간
-                            inbound_departure_time = inbound_segments[0].get('departDateTime')
-                            # 마지막 구간의 도착 시간
-                            inbound_arrival_time = inbound_segments[-1].get('arrivalDateTime')
-                    
-                    # 항공사 정보
-                    carrier = outbound_segments[0].get('carrierContent', {}) if outbound_segments else {}
-                    airline = carrier.get('carrierName', 'Unknown')
-                    
-                    # 총 소요 시간
-                    total_duration = itinerary_info.get('totalTripDuration', 0)
-                    
-                    # 항공편 딕셔너리 생성
-                    flight = {
-                        'price_krw': price_krw,
-                        'price_usd': price_usd,
-                        'airline': airline,
-                        'duration': total_duration,
-                        'outbound_departure_time': outbound_departure_time,
-                        'outbound_arrival_time': outbound_arrival_time,
-                        'inbound_departure_time': inbound_departure_time,
-                        'inbound_arrival_time': inbound_arrival_time,
-                        'origin': origin,
-                        'destination': destination,
-                        'segments': len(outbound_segments)
-                    }
-                    
-                    flights.append(flight)
-                    
-                except Exception as e:
-                    print(f"[Agoda] Error parsing flight bundle: {e}")
-                    continue
-            
-            print(f"[Agoda] ✅ Found {len(flights)} flights")
-            return flights
-            
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
+            complete = False
             print(f"[Agoda] Request timeout")
-            return []
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            complete = False
             print(f"[Agoda] Request error: {e}")
-            return []
         except Exception as e:
+            complete = False
             print(f"[Agoda] Unexpected error: {e}")
             import traceback
             traceback.print_exc()
-            return []
+
+        # 오류가 나도 그 전 라운드까지 찾은 결과는 반환
+        flights = flights[:self.FLIGHT_TOP_N]
+        print(f"[Agoda] ✅ Found {len(flights)} flights (complete={complete})")
+        return flights, complete
+
+    def _parse_flight_bundles(self, bundles: list, origin: str, destination: str) -> list:
+        """Agoda 항공권 bundle 목록을 응답용 항공편 dict 목록으로 변환"""
+        flights = []
+
+        # ✅ 환율 가져오기
+        usd_to_krw = self._get_usd_to_krw_rate()
+
+        for bundle in bundles:
+            try:
+                # 가격 정보
+                price_info = bundle.get('bundlePrice', [{}])[0].get('price', {}).get('usd', {})
+                price_usd = price_info.get('display', {}).get('perBook', {}).get('allInclusive', 0)
+
+                # USD → KRW 변환
+                price_krw = int(price_usd * usd_to_krw)
+
+                # 여정 정보
+                itineraries = bundle.get('itineraries', [])
+                if not itineraries:
+                    continue
+
+                itinerary_info = itineraries[0].get('itineraryInfo', {})
+
+                # Outbound (출국편)
+                outbound_slice = bundle.get('outboundSlice', {})
+                outbound_segments = outbound_slice.get('segments', [])
+
+                # ✅ 출국편 시간 추출 (첫 구간 출발, 마지막 구간 도착)
+                outbound_departure_time = None
+                outbound_arrival_time = None
+                if outbound_segments:
+                    outbound_departure_time = outbound_segments[0].get('departDateTime')
+                    outbound_arrival_time = outbound_segments[-1].get('arrivalDateTime')
+
+                # Inbound (입국편) - 왕복인 경우에만
+                inbound_slice = itineraries[0].get('inboundSlice')
+                inbound_departure_time = None
+                inbound_arrival_time = None
+                if inbound_slice:
+                    inbound_segments = inbound_slice.get('segments', [])
+                    if inbound_segments:
+                        inbound_departure_time = inbound_segments[0].get('departDateTime')
+                        inbound_arrival_time = inbound_segments[-1].get('arrivalDateTime')
+
+                # 항공사 정보
+                carrier = outbound_segments[0].get('carrierContent', {}) if outbound_segments else {}
+                airline = carrier.get('carrierName', 'Unknown')
+
+                flights.append({
+                    'price_krw': price_krw,
+                    'price_usd': price_usd,
+                    'airline': airline,
+                    'duration': itinerary_info.get('totalTripDuration', 0),  # 총 소요 시간
+                    'outbound_departure_time': outbound_departure_time,
+                    'outbound_arrival_time': outbound_arrival_time,
+                    'inbound_departure_time': inbound_departure_time,
+                    'inbound_arrival_time': inbound_arrival_time,
+                    'origin': origin,
+                    'destination': destination,
+                    'segments': len(outbound_segments)
+                })
+
+            except Exception as e:
+                print(f"[Agoda] Error parsing flight bundle: {e}")
+                continue
+
+        return flights
 
     async def _get_place_id(self, client: httpx.AsyncClient, query: str) -> str | None:
-        """도시 이름을 Agoda Place ID로 변환"""
+        """도시 이름을 Agoda Place ID로 변환 (영구 저장소 우선)"""
         clean_query = re.split(r'[/,]', query)[0].strip()
-        
+
+        stored = await asyncio.to_thread(self.resolution_store.get_value, KIND_PLACE_ID, clean_query)
+        if stored:
+            print(f"[Agoda] 🗄️ place_id store hit: {clean_query} → {stored}")
+            return stored
+
+        place_id = await self._fetch_place_id(client, clean_query)
+        if place_id:
+            await asyncio.to_thread(self.resolution_store.put, KIND_PLACE_ID, clean_query, place_id,
+                                    source="agoda_autocomplete", confidence=0.9)
+        return place_id
+
+    async def _fetch_place_id(self, client: httpx.AsyncClient, clean_query: str) -> str | None:
+        """/hotels/auto-complete 로 place_id 조회"""
         try:
             print(f"[DEBUG] 🔍 Searching place_id for: {clean_query}")
             
@@ -626,230 +917,344 @@ class AgodaClient:
             import traceback
             print(f"[DEBUG] ❌ Traceback: {traceback.format_exc()}")
             return None
-    async def search_hotels(self, destination: str, start_date: date, end_date: date, pax: int = 2):
-        """호텔 검색"""
-        print(f"[DEBUG] 🏨 Hotel search called: destination={destination}, dates={start_date}~{end_date}")
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            place_id = await self._get_place_id(client, destination)
-            print(f"[DEBUG] 🏨 place_id result: {place_id}")
-            
-            if not place_id:
-                print(f"[Agoda] ❌ Could not find place_id for: {destination}")
-                return []
-            
-            print(f"[DEBUG] 🏨 Creating params...")
-
-            params = {
-                "id": place_id,
-                "checkinDate": start_date.strftime("%Y-%m-%d"),
-                "checkoutDate": end_date.strftime("%Y-%m-%d"),
-                "adult": str(pax),
-                "currency": "KRW",
-                "language": "en-us",
-                "sort": "Ranking,Desc",
-                "limit": 20,
-                "page": 1
-            }
-            print(f"[DEBUG] 🏨 About to call API...")
-            print(f"[Agoda] 🔍 Searching hotels: {destination} (place_id={place_id})")  
+    # 호텔 검색 페이지 설정
+    HOTEL_PAGE_SIZE = 20
 
-            try:
-                print(f"[DEBUG] 🏨 Making request...")
-                print(f"[DEBUG] 🏨 URL: {self.base_url}/hotels/search-overnight")
-                print(f"[DEBUG] 🏨 Headers: {dict(self.headers)}")
-                print(f"[DEBUG] 🏨 Params: {params}")
-                response = await client.get(
-                    f"{self.base_url}/hotels/search-overnight",
-                    headers=self.headers,
-                    params=params
-                )
-                print(f"[DEBUG] 🏨 Response received: {response.status_code}")
-                print(f"[Agoda] 🔍 Hotel API Status Code: {response.status_code}")
-                
+    # 호텔 검색 응답에서 properties 배열이 올 수 있는 위치 (응답 구조가 여러 형태)
+    HOTEL_PROPERTY_PATHS = (
+        "data.properties.item",
+        "data.searchResult.properties.item",
+        "data.citySearch.searchResult.properties.item",
+        "data.citySearch.properties.item",
+    )
+    # _parse_hotel_property가 실제로 읽는 필드만 남김 (리뷰/시설/프로모션 등은 파싱 중 버림)
+    HOTEL_PROPERTY_FIELDS = (
+        "propertyId",
+        "content.informationSummary.localeName",
+        "content.informationSummary.defaultName",
+        "content.informationSummary.rating",
+        "content.informationSummary.address.area.name",
+        "content.informationSummary.geoInfo.latitude",
+        "content.informationSummary.geoInfo.longitude",
+        "content.images.item",
+        "content.images.hotelImages.item.urls.item.value",
+        "pricing.offers.item.roomOffers.item.room.pricing.item.currency",
+        "pricing.offers.item.roomOffers.item.room.pricing.item.price.perRoomPerNight.exclusive.display",
+    )
+
+    def _parse_hotel_property(self, hotel: dict, destination: str) -> dict:
+        """Agoda property 하나를 응답용 호텔 dict로 변환"""
+        property_id = hotel.get("propertyId")
+        content = hotel.get("content", {})
+        info = content.get("informationSummary", {})
+        pricing = hotel.get("pricing", {})
+
+        # 호텔 이름
+        name = info.get("localeName") or info.get("defaultName") or "이름 없음"
+
+        # ✅ 가격 추출 (정확한 경로)
+        price_val = 0
+        price_currency = "KRW"
+        try:
+            # API 응답 구조: pricing.offers[0].roomOffers[0].room.pricing[0].price.perRoomPerNight.exclusive.display
+            offers = pricing.get("offers", [])
+            if offers and len(offers) > 0:
+                room_offers = offers[0].get("roomOffers", [])
+                if room_offers and len(room_offers) > 0:
+                    room = room_offers[0].get("room", {})
+                    room_pricing = room.get("pricing", [])
+                    if room_pricing and len(room_pricing) > 0:
+                        price_data = room_pricing[0]
+
+                        # 통화 확인
+                        price_currency = price_data.get("currency", "USD").upper()
+
+                        # 가격 추출
+                        price_obj = price_data.get("price", {})
+                        per_room = price_obj.get("perRoomPerNight", {})
+                        exclusive = per_room.get("exclusive", {})
+                        price_val = exclusive.get("display", 0)
+
+            # ✅ KRW가 아니면 환율 테이블로 변환 (환율을 모르는 통화는 값 그대로 사용)
+            if price_val > 0 and price_currency != "KRW":
+                converted = self.exchange_rates.to_krw(price_val, price_currency)
+                if converted is not None:
+                    print(f"[Agoda] 💱 Converted {price_val} {price_currency} → {converted} KRW")
+                    price_val = converted
+                else:
+                    price_val = int(price_val)
+            elif price_val > 0:
+                price_val = int(price_val)
+
+        except Exception as e:
+            print(f"[Agoda] ❌ Price extraction error for hotel {property_id}: {e}")
+            price_val = 0
+
+        # 별점
+        rating = info.get("rating", 0)
+
+        # 위치
+        address = info.get("address", {})
+        area = address.get("area", {})
+        area_name = area.get("name", destination)
+
+        # 좌표
+        geo = info.get("geoInfo", {})
+        latitude = geo.get("latitude")
+        longitude = geo.get("longitude")
+
+        # 이미지
+        img_url = None
+        if "images" in content:
+            images = content["images"]
+            if isinstance(images, dict) and "hotelImages" in images:
+                hotel_images = images["hotelImages"]
+                if hotel_images and isinstance(hotel_images, list):
+                    urls = hotel_images[0].get("urls", [])
+                    if urls:
+                        img_url = urls[0].get("value")
+            elif isinstance(images, list) and images:
+                # 이미지가 리스트인 경우
+                img_url = images[0] if isinstance(images[0], str) else images[0].get("url")
+        
+        return {
+            "id": property_id,
+            "vendor": "Agoda Hotels",
+            "name": name,
+            "location": area_name,
+            "price": price_val,
+            "currency": "KRW",
+            "rating": rating,
+            "image": img_url,
+            "latitude": latitude,
+            "longitude": longitude,
+            "has_details": True
+        }
+
+    async def _fetch_hotel_page(self, client: httpx.AsyncClient, params: dict, page: int, destination: str) -> list | None:
+        """
+        호텔 검색 결과 한 페이지를 가져와 파싱합니다.
+
+        Returns:
+            파싱된 호텔 목록 (실패 시 None)
+        """
+        paths = {"status": None, "errors": None}
+        paths.update({path: self.HOTEL_PROPERTY_FIELDS for path in self.HOTEL_PROPERTY_PATHS})
+        hotels = []
+        try:
+            async with client.stream(
+                "GET",
+                f"{self.base_url}/hotels/search-overnight",
+                headers=self.headers,
+                params={**params, "page": page}
+            ) as response:
+                print(f"[Agoda] 🔍 Hotel page {page} status: {response.status_code}")
                 if response.status_code != 200:
-                    return []
-                
-                response_data = response.json()
-                
-                print(f"[Agoda] 🔍 Hotel Response keys: {list(response_data.keys())}")
-                print(f"[Agoda] 🔍 Hotel Status: {response_data.get('status')}")
+                    return None
 
-                if "errors" in response_data:
-                    print(f"[Agoda] 🔍 Hotel Errors: {response_data.get('errors')}")
-                
-                # 에러 체크
-                if response_data.get("status") is False:
-                    print(f"[DEBUG] 🏨 API returned status=false")
-                    return []
-                
-                if response_data.get("errors"):
-                    print(f"[DEBUG] 🏨 API returned errors: {response_data.get('errors')}")
-                    return []
-
-                data = response_data.get("data")
-                if data is None:
-                    print(f"[Agoda] ❌ No 'data' field in response")
-                    return []
-                
-                print(f"[Agoda] 🔍 Data keys: {list(data.keys())}")
-                
-                # Agoda API 응답 구조 파싱
-                hotels = []
-                if "properties" in data:
-                    hotels = data["properties"]  # ← 예시 응답 구조
-                elif "searchResult" in data:
-                    search_result = data.get("searchResult", {})
-                    hotels = search_result.get("properties", [])
-                elif "citySearch" in data:
-                    city_search = data["citySearch"]
-                    search_result = city_search.get("searchResult", {})
-                    hotels = search_result.get("properties") or city_search.get("properties") or []
-                
-                print(f"[Agoda] 🔍 Found {len(hotels)} hotels")
-                
-                if not hotels:
-                    return []
-                
-                # 호텔 정보 파싱
-                parsed_hotels = []
-                for hotel in hotels:
-                    property_id = hotel.get("propertyId")
-                    content = hotel.get("content", {})
-                    info = content.get("informationSummary", {})
-                    pricing = hotel.get("pricing", {})
-                    
-                    # 호텔 이름
-                    name = info.get("localeName") or info.get("defaultName") or "이름 없음"
-                    
-                    # ✅ 가격 추출 (정확한 경로)
-                    price_val = 0
-                    price_currency = "KRW"
-                    try:
-                        # API 응답 구조: pricing.offers[0].roomOffers[0].room.pricing[0].price.perRoomPerNight.exclusive.display
-                        offers = pricing.get("offers", [])
-                        if offers and len(offers) > 0:
-                            room_offers = offers[0].get("roomOffers", [])
-                            if room_offers and len(room_offers) > 0:
-                                room = room_offers[0].get("room", {})
-                                room_pricing = room.get("pricing", [])
-                                if room_pricing and len(room_pricing) > 0:
-                                    price_data = room_pricing[0]
-                                    
-                                    # 통화 확인
-                                    price_currency = price_data.get("currency", "USD").upper()
-                                    
-                                    # 가격 추출
-                                    price_obj = price_data.get("price", {})
-                                    per_room = price_obj.get("perRoomPerNight", {})
-                                    exclusive = per_room.get("exclusive", {})
-                                    price_val = exclusive.get("display", 0)
-                        
-                        # ✅ USD인 경우에만 KRW로 변환
-                        if price_val > 0 and price_currency == "USD":
-                            exchange_rate = self._get_usd_to_krw_rate()
-                            price_val = int(price_val * exchange_rate)
-                            print(f"[Agoda] 💱 Converted {price_val / exchange_rate:.2f} USD → {price_val} KRW")
-                        elif price_val > 0:
-                            price_val = int(price_val)
-                            
-                    except Exception as e:
-                        print(f"[Agoda] ❌ Price extraction error for hotel {property_id}: {e}")
-                        price_val = 0
-                    
-                    # 별점
-                    rating = info.get("rating", 0)
-                    
-                    # 위치
-                    address = info.get("address", {})
-                    area = address.get("area", {})
-                    area_name = area.get("name", destination)
-                    
-                    # 좌표
-                    geo = info.get("geoInfo", {})
-                    latitude = geo.get("latitude")
-                    longitude = geo.get("longitude")
-                    
-                    # 이미지
-                    img_url = None
-                    if "images" in content:
-                        images = content["images"]
-                        if isinstance(images, dict) and "hotelImages" in images:
-                            hotel_images = images["hotelImages"]
-                            if hotel_images and isinstance(hotel_images, list):
-                                urls = hotel_images[0].get("urls", [])
-                                if urls:
-                                    img_url = urls[0].get("value")
-                        elif isinstance(images, list) and images:
-                            # 이미지가 리스트인 경우
-                            img_url = images[0] if isinstance(images[0], str) else images[0].get("url")
-                    
-                    parsed_hotels.append({
-                        "id": property_id,
-                        "vendor": "Agoda Hotels",
-                        "name": name,
-                        "location": area_name,
-                        "price": price_val,
-                        "currency": "KRW",
-                        "rating": rating,
-                        "image": img_url,
-                        "latitude": latitude,
-                        "longitude": longitude,
-                        "has_details": True
-                    })
-                
-                print(f"[Agoda] ✅ Returning {len(parsed_hotels)} hotels")
-                return parsed_hotels
-                
-            except Exception as e:
-                print(f"[Agoda] ❌ Hotel search error: {e}")
-                import traceback
-                print(f"[DEBUG] 🏨 Traceback: {traceback.format_exc()}")
-                return []
+                # properties 배열을 스트리밍으로 읽고, 페이지 크기만큼 모이면 나머지 본문(집계/지도 등)은 읽지 않음
+                async with contextlib.aclosing(json_stream.iter_paths(response.aiter_bytes(), paths)) as values:
+                    async for path, value in values:
+                        if (path == "status" and value is False) or (path == "errors" and value):
+                            print(f"[Agoda] ❌ Hotel page {page} errors: {value}")
+                            return None
+                        if path in self.HOTEL_PROPERTY_PATHS:
+                            hotels.append(self._parse_hotel_property(value, destination))
+                            if len(hotels) >= params.get("limit", self.HOTEL_PAGE_SIZE):
+                                break
+
+            return hotels
+
+        except httpx.HTTPError as e:
+            print(f"[Agoda] ❌ Hotel page {page} request error: {e}")
+            return None
+        except Exception as e:
+            print(f"[Agoda] ❌ Hotel page {page} parse error: {e}")
+            import traceback
+            print(f"[DEBUG] 🏨 Traceback: {traceback.format_exc()}")
+            return None
+
+    @staticmethod
+    def rank_hotels(hotels: list, top_k: int, min_rating: float | None = None, max_price: int | None = None) -> list:
+        """
+        필터(최소 별점, 1박 최대 가격)를 통과한 호텔을 가격·별점 종합 점수로 정렬해 상위 top_k를 반환합니다.
+        점수 = 0.6 × (별점 / 5) + 0.4 × (1 - 가격 / 후보 중 최고가), 가격 정보가 없으면 가격 항목은 0점.
+        """
+        candidates = [
+            h for h in hotels
+            if (min_rating is None or (h.get("rating") or 0) >= min_rating)
+            and (max_price is None or 0 < (h.get("price") or 0) <= max_price)
+        ]
+        highest = max((h.get("price") or 0 for h in candidates), default=0)
+
+        def score(h):
+            price = h.get("price") or 0
+            price_score = 1 - price / highest if price > 0 and highest > 0 else 0
+            return 0.6 * ((h.get("rating") or 0) / 5) + 0.4 * price_score
+
+        return sorted(candidates, key=score, reverse=True)[:top_k]
+
+    async def search_hotels(self, destination: str, start_date: date, end_date: date, pax: int = 2,
+                            pages: int | None = None, top_k: int | None = None,
+                            min_rating: float | None = None, max_price: int | None = None):
+        """
+        호텔 검색 (여러 페이지 동시 조회 + 병합)
+
+        최대 pages 페이지를 HOTEL_PAGE_CONCURRENCY 개씩 동시에 가져와 propertyId 기준으로 중복을 제거하고,
+        가격·별점 기준 상위 top_k개를 반환합니다. 필터를 통과한 호텔이 top_k개 이상 모이거나
+        마지막 페이지(결과가 페이지 크기보다 적음)에 도달하면 남은 페이지는 요청하지 않습니다.
+        """
+        pages = pages or settings.HOTEL_SEARCH_PAGES
+        top_k = top_k or settings.HOTEL_TOP_K
+        concurrency = max(1, settings.HOTEL_PAGE_CONCURRENCY)
+        if isinstance(start_date, str): start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str): end_date = date.fromisoformat(end_date)
+
+        print(f"[DEBUG] 🏨 Hotel search called: destination={destination}, dates={start_date}~{end_date}, pages={pages}")
+        client = self._get_http_client()
+        place_id = await self._get_place_id(client, destination)
+        print(f"[DEBUG] 🏨 place_id result: {place_id}")
+        
+        if not place_id:
+            print(f"[Agoda] ❌ Could not find place_id for: {destination}")
+            return []
+
+        params = {
+            "id": place_id,
+            "checkinDate": start_date.strftime("%Y-%m-%d"),
+            "checkoutDate": end_date.strftime("%Y-%m-%d"),
+            "adult": str(pax),
+            "currency": "KRW",
+            "language": "en-us",
+            "sort": "Ranking,Desc",
+            "limit": self.HOTEL_PAGE_SIZE
+        }
+        print(f"[Agoda] 🔍 Searching hotels: {destination} (place_id={place_id})")
+
+        merged = {}  # propertyId → 호텔 (먼저 나온 순위 유지)
+        next_page = 1
+        while next_page <= pages:
+            wave = list(range(next_page, min(next_page + concurrency, pages + 1)))
+            next_page = wave[-1] + 1
+            results = await asyncio.gather(*(self._fetch_hotel_page(client, params, p, destination) for p in wave))
+
+            last_page_reached = False
+            for result in results:
+                if result is None or len(result) < self.HOTEL_PAGE_SIZE:
+                    last_page_reached = True
+                for hotel in result or []:
+                    key = hotel["id"] if hotel["id"] is not None else (hotel["name"], hotel["latitude"], hotel["longitude"])
+                    merged.setdefault(key, hotel)
+
+            enough = len(self.rank_hotels(list(merged.values()), top_k, min_rating, max_price)) >= top_k
+            if last_page_reached or enough:
+                print(f"[Agoda] ⏹️ Hotel paging stopped after page {wave[-1]} (last_page={last_page_reached}, enough={enough})")
+                break
+
+        ranked = self.rank_hotels(list(merged.values()), top_k, min_rating, max_price)
+        print(f"[Agoda] ✅ Returning {len(ranked)} hotels (merged {len(merged)})")
+        return ranked
+
+    @staticmethod
+    def _hotel_details_key(hotel_id, start_date, end_date, pax: int):
+        if isinstance(start_date, date): start_date = start_date.isoformat()
+        if isinstance(end_date, date): end_date = end_date.isoformat()
+        return (str(hotel_id), start_date, end_date, int(pax))
 
     async def get_hotel_details(self, hotel_id: str, start_date: date, end_date: date, pax: int = 2):
-        """호텔 상세 정보 조회"""
+        """호텔 상세 정보 조회 (캐시 우선, 실패 시 None)"""
+        key = self._hotel_details_key(hotel_id, start_date, end_date, pax)
+        if self._upstream_unavailable("agoda.hotel_details"):
+            entry = self.hotel_details_cache.peek(key)
+            return entry.value if entry else None
+        try:
+            details, _, status = await self.hotel_details_cache.get_or_fetch(
+                key, lambda: self._fetch_hotel_details(*key)
+            )
+        except Exception as e:
+            print(f"[Agoda] ❌ Hotel details error ({hotel_id}): {e}")
+            return None
+        print(f"[Agoda] 🗄️ Hotel details cache {status}: {hotel_id}")
+        return details
+
+    async def get_hotel_details_batch(self, hotel_ids: list, start_date: date, end_date: date, pax: int = 2) -> dict:
+        """
+        여러 호텔의 상세 정보를 동시에 조회합니다 (HOTEL_DETAILS_CONCURRENCY 개씩).
+
+        Returns:
+            {hotelId(str): 상세 정보 또는 None}
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.HOTEL_DETAILS_CONCURRENCY))
+        unique_ids = list(dict.fromkeys(str(h) for h in hotel_ids if h is not None))
+
+        async def fetch(hotel_id):
+            async with semaphore:
+                return await self.get_hotel_details(hotel_id, start_date, end_date, pax)
+
+        results = await asyncio.gather(*(fetch(h) for h in unique_ids))
+        return dict(zip(unique_ids, results))
+
+    def prefetch_hotel_details(self, hotels: list, start_date: date, end_date: date, pax: int = 2, top_n: int | None = None):
+        """
+        상위 top_n개 호텔의 상세 정보를 백그라운드에서 미리 캐시에 채웁니다.
+        (플랜 응답은 기다리지 않고 바로 반환되고, 이후 상세 보기 요청은 캐시에서 응답)
+        """
+        top_n = settings.HOTEL_DETAILS_PREFETCH_N if top_n is None else top_n
+        hotel_ids = [h.get("id") for h in hotels[:top_n] if h.get("id") is not None]
+        if not hotel_ids:
+            return None
+
+        task = asyncio.create_task(self.get_hotel_details_batch(hotel_ids, start_date, end_date, pax))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+        print(f"[Agoda] 📥 Prefetching details for {len(hotel_ids)} hotels")
+        return task
+
+    async def _fetch_hotel_details(self, hotel_id: str, check_in: str, check_out: str, pax: int):
+        """호텔 상세 정보 API 호출 (공유 HTTP 클라이언트 사용)"""
         url = f"{self.base_url}/hotels/details"
         params = {
             "hotelId": hotel_id,
-            "checkIn": start_date.isoformat(),
-            "checkOut": end_date.isoformat(),
+            "checkIn": check_in,
+            "checkOut": check_out,
             "adults": str(pax),
             "currency": "KRW",
             "language": "ko-kr"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=self.headers, params=params)
-                
-                if response.status_code != 200:
-                    return None
-                
-                data = response.json().get("data", {})
-                
-                # 이미지 처리
-                raw_images = data.get("images", [])
-                processed_images = []
-                for img in raw_images:
-                    if isinstance(img, str):
-                        processed_images.append(img)
-                    elif isinstance(img, dict):
-                        img_url = img.get("url") or img.get("original") or img.get("link")
-                        if img_url:
-                            processed_images.append(img_url)
-
-                return {
-                    "id": data.get("hotelId"),
-                    "name": data.get("name"),
-                    "address": data.get("address"),
-                    "description": data.get("shortDescription") or data.get("description"),
-                    "amenities": data.get("amenities", []),
-                    "images": processed_images,
-                    "rating": data.get("starRating"),
-                    "reviews_score": data.get("reviewScore"),
-                    "review_count": data.get("reviewCount"),
-                    "latitude": data.get("latitude"),
-                    "longitude": data.get("longitude")
-                }
-            except:
-                return None
\ No newline at end of file
+        client = self._get_http_client()
+        try:
+            response = await client.get(url, headers=self.headers, params=params)
+            
+            if response.status_code != 200:
+                return None
+            
+            data = response.json().get("data", {})
+            
+            # 이미지 처리
+            raw_images = data.get("images", [])
+            processed_images = []
+            for img in raw_images:
+                if isinstance(img, str):
+                    processed_images.append(img)
+                elif isinstance(img, dict):
+                    img_url = img.get("url") or img.get("original") or img.get("link")
+                    if img_url:
+                        processed_images.append(img_url)
+
+            return {
+                "id": data.get("hotelId"),
+                "name": data.get("name"),
+                "address": data.get("address"),
+                "description": data.get("shortDescription") or data.get("description"),
+                "amenities": data.get("amenities", []),
+                "images": processed_images,
+                "rating": data.get("starRating"),
+                "reviews_score": data.get("reviewScore"),
+                "review_count": data.get("reviewCount"),
+                "latitude": data.get("latitude"),
+                "longitude": data.get("longitude")
+            }
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            print(f"[Agoda] ❌ Hotel details request failed ({hotel_id}): {e}")
+            return None
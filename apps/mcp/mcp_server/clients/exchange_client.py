@@ -0,0 +1,168 @@
+# mcp/mcp_server/clients/exchange_client.py
+import asyncio
+import re
+import time
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+import httpx
+
+from ..config import settings
+from .. import metrics
+
+
+class ExchangeClientError(Exception):
+    """환율 API 클라이언트 관련 에러"""
+    pass
+
+
+class ExchangeRateTable:
+    """
+    한국수출입은행 환율 테이블 (KRW 기준, 전체 통화)
+
+    - 서버 시작 시 미리 받아 두고 EXCHANGE_REFRESH_INTERVAL 마다 백그라운드에서 갱신합니다.
+    - 갱신은 새 dict를 만든 뒤 참조만 교체하므로 읽기 쪽은 lock 없이 항상 일관된 테이블을 봅니다.
+    - 요청 처리 경로에서는 네트워크를 호출하지 않습니다 (없으면 fallback 값 사용).
+    """
+
+    # 테이블을 아직 받지 못했을 때 사용하는 대략적인 값 (기존 동작과 동일한 USD 1300)
+    FALLBACK_RATES = {"KRW": 1.0, "USD": 1300.0}
+
+    # 주말/공휴일에는 빈 응답이 오므로 최근 영업일까지 거슬러 올라가 조회
+    MAX_LOOKBACK_DAYS = 7
+
+    ERROR_MESSAGES = {
+        2: "DATA 코드 오류",
+        3: "인증코드 오류",
+        4: "일일제한횟수 마감"
+    }
+
+    def __init__(self):
+        self.base_url = settings.EXCHANGE_BASE
+        self.auth_key = settings.EXCHANGE_API_KEY
+        self.data_code = settings.EXCHANGE_DATA_CODE or "AP01"
+        self.refresh_interval = settings.EXCHANGE_REFRESH_INTERVAL
+        self.verify_ssl = settings.EXCHANGE_VERIFY_SSL
+
+        self._rates: Mapping[str, float] = MappingProxyType({})
+        self._rate_date: Optional[str] = None
+        self._updated_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def parse_rows(rows: list) -> dict:
+        """
+        API 응답 행을 {통화코드: 1단위당 KRW} 로 변환합니다.
+        "JPY(100)", "IDR(100)" 처럼 단위가 붙은 통화는 1단위 기준으로 나눕니다.
+        """
+        rates = {"KRW": 1.0}
+        for row in rows:
+            match = re.match(r"^([A-Z]{3})(?:\((\d+)\))?$", (row.get("cur_unit") or "").strip().upper())
+            if not match:
+                continue
+            try:
+                rate = float(str(row.get("deal_bas_r", "0")).replace(",", ""))
+            except ValueError:
+                continue
+            if rate <= 0:
+                continue
+            unit = int(match.group(2) or 1)
+            rates[match.group(1)] = rate / unit
+        return rates
+
+    async def _fetch_rows(self, client: httpx.AsyncClient, search_date: date) -> list:
+        params = {
+            "authkey": self.auth_key,
+            "data": self.data_code,
+            "searchdate": search_date.strftime("%Y%m%d")
+        }
+        response = await client.get(self.base_url, params=params)
+        response.raise_for_status()
+        rows = response.json()
+        if not isinstance(rows, list):
+            raise ExchangeClientError("Invalid response format")
+        if rows and rows[0].get("result") != 1:
+            result_code = rows[0].get("result")
+            raise ExchangeClientError(self.ERROR_MESSAGES.get(result_code, f"알 수 없는 오류 ({result_code})"))
+        return rows
+
+    async def refresh(self) -> bool:
+        """환율 테이블을 새로 받아 교체합니다. 실패하면 기존 테이블을 유지합니다."""
+        if not self.auth_key:
+            print("[Exchange] ⚠️ EXCHANGE_API_KEY not set, using fallback rates")
+            return False
+
+        try:
+            async with httpx.AsyncClient(timeout=10.0, verify=self.verify_ssl) as client:
+                day = date.today()
+                for _ in range(self.MAX_LOOKBACK_DAYS):
+                    rows = await self._fetch_rows(client, day)
+                    if rows:
+                        break
+                    day -= timedelta(days=1)
+                else:
+                    print("[Exchange] ⚠️ No rates in the last business days")
+                    return False
+
+            rates = self.parse_rows(rows)
+            self._rates = MappingProxyType(rates)  # 참조 교체 (읽기 쪽 lock 불필요)
+            self._rate_date = day.isoformat()
+            self._updated_at = time.time()
+            print(f"[Exchange] ✅ Loaded {len(rates)} currencies ({self._rate_date}), USD={rates.get('USD')}")
+            return True
+
+        except (httpx.HTTPError, ValueError, ExchangeClientError) as e:
+            print(f"[Exchange] ❌ Refresh failed: {e}")
+            return False
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def start(self, initial_timeout: float = 10.0):
+        """서버 시작 시 호출: 첫 테이블을 받고 주기적 갱신 Task를 시작합니다."""
+        try:
+            await asyncio.wait_for(self.refresh(), timeout=initial_timeout)
+        except asyncio.TimeoutError:
+            print("[Exchange] ⚠️ Initial fetch timed out, will retry in background")
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def get_rate(self, currency: str) -> Optional[float]:
+        """1 단위 통화당 KRW (모르는 통화면 None). 네트워크 호출 없음."""
+        code = (currency or "").upper()
+        rate = self._rates.get(code)
+        if rate is None:
+            rate = self.FALLBACK_RATES.get(code)
+        return rate
+
+    def to_krw(self, amount: float, currency: str) -> Optional[int]:
+        """금액을 KRW로 변환 (환율을 모르면 None)"""
+        rate = self.get_rate(currency)
+        if rate is None:
+            return None
+        return int(amount * rate)
+
+    def snapshot(self) -> dict:
+        """메트릭/디버깅용 상태"""
+        return {
+            "currencies": len(self._rates),
+            "rate_date": self._rate_date,
+            "updated_at": self._updated_at,
+        }
+
+
+# 서버 전체에서 공유하는 환율 테이블 (main.py lifespan에서 start/stop)
+exchange_rate_table = ExchangeRateTable()
+metrics.register("exchange_rates", exchange_rate_table.snapshot)
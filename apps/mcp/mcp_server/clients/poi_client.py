@@ -1,7 +1,15 @@
 # mcp/mcp_server/clients/poi_client.py (수정 버전)
 import httpx
 import asyncio
+import math
+import time
+from typing import Optional
 from ..config import settings
+from .. import metrics
+from ..resilience import ResilientTransport, RetryPolicy
+from ..services.poi_dedup import dedupe_pois
+from ..stores.poi_cache_store import poi_cache_store
+from ..stores.poi_catalog import poi_catalog
 
 class PoiClientError(Exception):
     """POI API 클라이언트 관련 에러"""
@@ -10,127 +18,323 @@ class PoiClientError(Exception):
 class PoiClient:
     """Google/Kakao Maps API를 통해 다양한 카테고리의 POI 목록을 가져오는 클라이언트"""
     
-    def __init__(self):
+    # 엔드포인트별 재시도 정책 (호스트 → 브레이커 이름, 정책)
+    ENDPOINT_POLICIES = {
+        "maps.googleapis.com": ("google_places", RetryPolicy(attempts=3, base_delay=0.3)),
+        "dapi.kakao.com": ("kakao_local", RetryPolicy(attempts=3, base_delay=0.2)),
+    }
+
+    # 캐시 키의 언어 (두 제공자 모두 한국어 결과를 받음)
+    LANGUAGE = "ko"
+
+    def __init__(self, cache_store=None, catalog=None):
         self.google_api_key = settings.GOOGLE_MAP_API_KEY
         self.kakao_api_key = settings.KAKAO_REST_API_KEY
+        # (목적지, 카테고리, 제공자, 언어)별 POI 영구 캐시 — 재시작 후에도 인기 목적지는 API를 타지 않음
+        self.cache_store = cache_store or poi_cache_store
+        self.cache_ttl = settings.POI_CACHE_TTL
+        self.cache_stale_ttl = settings.POI_CACHE_STALE_TTL
+        self._refreshing: dict = {}  # 캐시 키 → 백그라운드 갱신 task (키별로 하나만)
+        metrics.register("cache.pois", self.cache_store.stats)
+        # 주요 목적지 사전 수집 카탈로그 (mmap, main.py lifespan에서 load)
+        self.catalog = catalog or poi_catalog
+        metrics.register("poi_catalog", self.catalog.stats)
+
+    def _route_request(self, request: httpx.Request):
+        return self.ENDPOINT_POLICIES.get(request.url.host, ("poi.other", RetryPolicy(attempts=2)))
+
+    def _new_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=20.0, transport=ResilientTransport(self._route_request))
 
-    async def search_pois(self, destination: str, is_domestic: bool, category: str = "관광"):
+    # 핵심 카테고리별 하루 사용량 (일정 생성 시 하루에 관광 3, 식사 2, 카페 1곳 배정)
+    CATEGORY_PER_DAY = {"관광명소": 3, "맛집": 2, "카페": 1}
+    # 여행 스타일별 카테고리 가중치 (없는 카테고리는 1.0)
+    STYLE_WEIGHTS = {
+        "foodie": {"맛집": 1.5, "카페": 1.5},
+        "relaxation": {"관광명소": 0.7, "카페": 1.3},
+        "activity": {"관광명소": 1.3},
+        "shopping": {"관광명소": 1.2},
+        "sightseeing": {"관광명소": 1.3},
+    }
+    # 기간을 모를 때 카테고리별 개수 (기존 동작)
+    DEFAULT_PER_CATEGORY = 15
+
+    GOOGLE_PAGE_SIZE = 20  # Text Search 한 페이지 결과 수 (최대 3페이지)
+    GOOGLE_MAX_PAGES = 3
+    KAKAO_PAGE_SIZE = 15   # 키워드 검색 size 최댓값 (pageable_count 최대 45)
+    KAKAO_MAX_PAGES = 3
+
+    @classmethod
+    def target_counts(cls, num_days: int = None, travel_style: str = None) -> dict:
+        """
+        카테고리별로 가져올 POI 개수를 여행 기간과 스타일에 맞춰 정합니다.
+        (1일 여행은 최소 개수만, 7일 여행은 페이지를 더 받아 같은 장소가 반복되지 않도록)
+        """
+        if not num_days:
+            return {cat: cls.DEFAULT_PER_CATEGORY for cat in cls.CATEGORY_PER_DAY}
+        weights = cls.STYLE_WEIGHTS.get(travel_style, {})
+        targets = {}
+        for cat, per_day in cls.CATEGORY_PER_DAY.items():
+            wanted = math.ceil(per_day * num_days * weights.get(cat, 1.0) * settings.POI_POOL_HEADROOM)
+            targets[cat] = max(settings.POI_MIN_PER_CATEGORY, min(settings.POI_MAX_PER_CATEGORY, wanted))
+        return targets
+
+    @classmethod
+    def catalog_target_counts(cls, num_days: int = settings.POI_CATALOG_DAYS) -> dict:
+        """카탈로그 빌드용: 모든 여행 스타일 중 카테고리별 최대 개수 (어떤 스타일이든 카탈로그만으로 충분하도록)"""
+        targets = cls.target_counts(num_days)
+        for style in cls.STYLE_WEIGHTS:
+            for cat, target in cls.target_counts(num_days, style).items():
+                targets[cat] = max(targets[cat], target)
+        return targets
+
+    async def search_pois(self, destination: str, is_domestic: bool, category: str = "관광",
+                          num_days: int = None, travel_style: str = None):
         """
         주어진 목적지에 대해 '관광명소', '맛집', '카페' 등 필수 카테고리들을
         동시에 검색하여 통합된 POI 목록을 반환합니다.
+        num_days/travel_style을 주면 카테고리별 개수를 그에 맞게 늘리거나 줄입니다.
+        """
+        # 💡 항상 검색할 핵심 카테고리와 카테고리별 목표 개수
+        targets = self.target_counts(num_days, travel_style)
+        results_by_category = await self.search_pois_by_category(destination, is_domestic, targets)
+
+        # 모든 검색 결과를 하나의 리스트로 통합하고 중복 제거 (가까운 위치 + 비슷한 이름 기준)
+        all_pois = [poi for result in results_by_category.values() for poi in result]
+        unique_pois = dedupe_pois(all_pois)
+        if len(unique_pois) < len(all_pois):
+            print(f"[PoiClient] 🧹 Deduplicated POIs: {len(all_pois)} → {len(unique_pois)}")
+        return unique_pois
+
+    async def search_pois_by_category(self, destination: str, is_domestic: bool, targets: dict,
+                                      use_catalog: bool = True) -> dict:
+        """
+        카테고리별 POI 목록을 반환합니다 (카테고리 간 중복 제거 전).
+        카탈로그에 목표 개수만큼 있는 카테고리는 API를 부르지 않습니다.
+        모자란 카테고리는 캐시/API에서 목표 개수만큼 받아, 카탈로그에 이미 있는 장소(가까운 위치 + 비슷한 이름)를
+        뺀 새 POI로만 모자란 만큼 채웁니다 (실시간 결과 상위권은 대개 카탈로그와 겹치기 때문).
+        """
+        from_catalog = (self.catalog.get(destination) if use_catalog else None) or {}
+        results = {cat: from_catalog.get(cat, [])[:target] for cat, target in targets.items()}
+        missing = {cat: target for cat, target in targets.items() if len(results[cat]) < target}
+        if from_catalog:
+            print(f"[PoiClient] 📚 Catalog hit for '{destination}', topping up: {list(missing) or 'none'}")
+        if not missing:
+            return results
+
+        async with self._new_http_client() as client:
+            # 여러 카테고리 검색 작업을 비동기적으로 동시에 실행 (캐시에 있으면 API 호출 없음)
+            tasks = [self._search_category(client, destination, cat, is_domestic, target)
+                     for cat, target in missing.items()]
+            live_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for (cat, target), result in zip(missing.items(), live_results):
+            if isinstance(result, list):
+                # 카탈로그 POI를 앞에 두고 중복 제거 → 겹치는 실시간 POI는 빠지고 새 POI만 뒤에 남음
+                results[cat] = dedupe_pois(results[cat] + result)[:target]
+            else:
+                print(f"[PoiClient] ⚠️ POI search failed for {destination} / {cat}: {result}")
+        return results
+
+    async def _search_category(self, client: httpx.AsyncClient, destination: str, category: str,
+                               is_domestic: bool, target: int = DEFAULT_PER_CATEGORY) -> list[dict]:
+        """
+        한 카테고리의 POI를 영구 캐시 우선으로 가져옵니다.
+        - TTL 이내: 캐시 그대로 반환
+        - 그 후 stale TTL 이내: 캐시를 바로 반환하고 백그라운드에서 갱신
+        - 없거나 너무 오래됨, 또는 캐시 목록이 목표 개수보다 짧은데 더 받을 수 있음: API 호출 후 저장
+        """
+        provider = "kakao" if is_domestic else "google"
+        cached = await asyncio.to_thread(self.cache_store.get, destination, category, provider, self.LANGUAGE)
+        if cached is not None:
+            pois, fetched_at, complete = cached
+            age = time.time() - fetched_at
+            if len(pois) >= target or complete:
+                if age < self.cache_ttl:
+                    return pois[:target]
+                if age < self.cache_ttl + self.cache_stale_ttl:
+                    self._schedule_refresh(destination, category, is_domestic, max(target, len(pois)))
+                    return pois[:target]
+
+        pois, complete = await self._fetch_category(client, destination, category, is_domestic, target)
+        if pois:
+            await asyncio.to_thread(self.cache_store.put, destination, category, provider, self.LANGUAGE,
+                                    pois, complete=complete)
+        return pois
+
+    async def _fetch_category(self, client: httpx.AsyncClient, destination: str, category: str,
+                              is_domestic: bool, target: int) -> tuple[list[dict], bool]:
+        query = f"{destination} {category}"
+        if is_domestic:
+            return await self._search_kakao(client, query, target)
+        return await self._search_google(client, query, target)
+
+    def _schedule_refresh(self, destination: str, category: str, is_domestic: bool, target: int) -> None:
+        """stale 캐시 항목을 백그라운드에서 다시 가져와 저장합니다 (같은 키는 한 번만)."""
+        provider = "kakao" if is_domestic else "google"
+        key = self.cache_store.make_key(destination, category, provider, self.LANGUAGE)
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                async with self._new_http_client() as client:
+                    pois, complete = await self._fetch_category(client, destination, category, is_domestic, target)
+                if pois:
+                    await asyncio.to_thread(self.cache_store.put, destination, category, provider, self.LANGUAGE,
+                                            pois, complete=complete)
+                    print(f"[PoiClient] 🔄 Refreshed cached POIs: {destination} / {category} ({provider})")
+            except (httpx.HTTPError, PoiClientError) as e:
+                print(f"[PoiClient] ⚠️ Background refresh failed for {destination} / {category}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def _search_google(self, client: httpx.AsyncClient, query: str, target: int = DEFAULT_PER_CATEGORY) -> tuple[list[dict], bool]:
+        """
+        Google Places API (Text Search)를 사용하여 POI를 검색합니다.
+        목표 개수가 첫 페이지(20개)보다 많으면 next_page_token으로 다음 페이지를 이어 받습니다.
+        (토큰은 발급 후 잠시 뒤에야 유효하므로 페이지 사이에 GOOGLE_PAGE_TOKEN_DELAY만큼 기다림)
+
+        Returns:
+            (POI 목록, 제공자 결과를 끝까지 받았는지)
         """
-        # 💡 항상 검색할 핵심 카테고리 목록 정의
-        core_categories = ["관광명소", "맛집", "카페"]
-        
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            # 여러 카테고리 검색 작업을 비동기적으로 동시에 실행
-            tasks = []
-            for cat in core_categories:
-                query = f"{destination} {cat}"
-                if is_domestic:
-                    tasks.append(self._search_kakao(client, query))
-                else:
-                    tasks.append(self._search_google(client, query))
-            
-            results_from_all_categories = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # 모든 검색 결과를 하나의 리스트로 통합하고 중복 제거
-            all_pois = []
-            seen_names = set()
-            for result in results_from_all_categories:
-                if isinstance(result, list):
-                    for poi in result:
-                        if poi['name'] not in seen_names:
-                            all_pois.append(poi)
-                            seen_names.add(poi['name'])
-            return all_pois
-
-    async def _search_google(self, client: httpx.AsyncClient, query: str) -> list[dict]:
-        """Google Places API (Text Search)를 사용하여 POI를 검색합니다."""
         url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
         params = {"query": query, "key": self.google_api_key, "language": "ko", "region": "KR"}
+        pois = []
         try:
+            for page in range(self.GOOGLE_MAX_PAGES):
+                result = await self._get_google_page(client, url, params)
+                if result is None:  # 다음 페이지 토큰이 끝내 유효해지지 않음
+                    return pois, False
+                pois.extend(self._parse_google_place(place) for place in result.get("results", []))
+                next_token = result.get("next_page_token")
+                if not next_token:
+                    return pois[:target], len(pois) <= target
+                if len(pois) >= target:
+                    return pois[:target], False
+                params = {"pagetoken": next_token, "key": self.google_api_key}
+            return pois, True
+        except httpx.HTTPStatusError as e:
+            if pois:  # 다음 페이지 실패: 이미 받은 페이지는 사용
+                print(f"[PoiClient] ⚠️ Google next page failed, keeping {len(pois)} POIs: {e}")
+                return pois, False
+            raise PoiClientError(f"Google POI search failed: {e.response.text}")
+
+    async def _get_google_page(self, client: httpx.AsyncClient, url: str, params: dict) -> Optional[dict]:
+        """Text Search 한 페이지. 토큰이 아직 유효하지 않으면(INVALID_REQUEST) 잠시 뒤 다시 시도합니다."""
+        is_next_page = "pagetoken" in params
+        for attempt in range(3 if is_next_page else 1):
+            if is_next_page:
+                await asyncio.sleep(settings.GOOGLE_PAGE_TOKEN_DELAY)
             response = await client.get(url, params=params)
             response.raise_for_status()
             result = response.json()
-            
-            pois = []
-            for place in result.get("results", [])[:15]: # 카테고리별 상위 15개
-                loc = place.get("geometry", {}).get("location", {})
-                place_name = place.get("name", "")
-                place_rating = place.get("rating", 0)
-                place_types = place.get("types", [])
-                
-                # 카테고리 결정
-                if "restaurant" in place_types or "food" in place_types:
-                    category = "맛집"
-                elif "cafe" in place_types:
-                    category = "카페"
-                else:
-                    category = "관광명소"
-                
-                # ✅ 상세 설명 생성
-                description = place_name
-                if place_rating > 0:
-                    description += f" - {category}"
-                    if category == "맛집":
-                        description += ", 현지 맛집"
-                    elif category == "카페":
-                        description += ", 분위기 좋은 카페"
-                    else:
-                        description += ", 인기 관광지"
-                    description += f" (Rating: {place_rating})"
-                
-                pois.append({
-                    "name": place_name,
-                    "category": category,
-                    "rating": place_rating,  # ✅ Google에서 가져온 실제 rating
-                    "description": description,  # ✅ 상세 설명 추가
-                    "vicinity": place.get("vicinity", ""),  # ✅ 위치 정보 추가
-                    "lat": loc.get("lat"),
-                    "lng": loc.get("lng")
-                })
-            return pois
-        except httpx.HTTPStatusError as e:
-            raise PoiClientError(f"Google POI search failed: {e.response.text}")
+            if not (is_next_page and result.get("status") == "INVALID_REQUEST"):
+                return result
+        return None
+
+    @staticmethod
+    def _parse_google_place(place: dict) -> dict:
+        loc = place.get("geometry", {}).get("location", {})
+        place_name = place.get("name", "")
+        place_rating = place.get("rating", 0)
+        place_types = place.get("types", [])
+        
+        # 카테고리 결정
+        if "restaurant" in place_types or "food" in place_types:
+            category = "맛집"
+        elif "cafe" in place_types:
+            category = "카페"
+        else:
+            category = "관광명소"
+        
+        # ✅ 상세 설명 생성
+        description = place_name
+        if place_rating > 0:
+            description += f" - {category}"
+            if category == "맛집":
+                description += ", 현지 맛집"
+            elif category == "카페":
+                description += ", 분위기 좋은 카페"
+            else:
+                description += ", 인기 관광지"
+            description += f" (Rating: {place_rating})"
+        
+        return {
+            "name": place_name,
+            "category": category,
+            "rating": place_rating,  # ✅ Google에서 가져온 실제 rating
+            "description": description,  # ✅ 상세 설명 추가
+            "vicinity": place.get("vicinity", ""),  # ✅ 위치 정보 추가
+            "lat": loc.get("lat"),
+            "lng": loc.get("lng")
+        }
 
-    async def _search_kakao(self, client: httpx.AsyncClient, query: str) -> list[dict]:
-        """Kakao 키워드 검색 API를 사용하여 POI를 검색합니다."""
+    async def _search_kakao(self, client: httpx.AsyncClient, query: str, target: int = DEFAULT_PER_CATEGORY) -> tuple[list[dict], bool]:
+        """
+        Kakao 키워드 검색 API를 사용하여 POI를 검색합니다.
+        첫 페이지의 pageable_count로 필요한 페이지 수를 정하고 나머지 페이지는 동시에 요청합니다.
+
+        Returns:
+            (POI 목록, 제공자 결과를 끝까지 받았는지)
+        """
         url = "https://dapi.kakao.com/v2/local/search/keyword.json"
         headers = {"Authorization": f"KakaoAK {self.kakao_api_key}"}
-        params = {"query": query, "size": 15} # 카테고리별 상위 15개
-        try:
+
+        async def get_page(page: int) -> dict:
+            params = {"query": query, "size": self.KAKAO_PAGE_SIZE, "page": page}
             response = await client.get(url, headers=headers, params=params)
             response.raise_for_status()
-            result = response.json()
+            return response.json()
 
-            pois = []
-            for place in result.get("documents", []):
-                place_name = place.get("place_name", "")
-                place_rating = float(place.get("rating", 0)) if place.get("rating") else 0
-                category = place.get("category_group_name", "관광명소")
-                
-                # ✅ 상세 설명 생성 (Kakao도 동일하게)
-                description = place_name
-                if place_rating > 0:
-                    description += f" - {category}"
-                    if "음식점" in category:
-                        description += ", 현지 맛집"
-                    elif "카페" in category:
-                        description += ", 분위기 좋은 카페"
-                    else:
-                        description += ", 인기 장소"
-                    description += f" (Rating: {place_rating})"
-                
-                pois.append({
-                    "name": place_name,
-                    "category": category,
-                    "rating": place_rating,  # ✅ 실제 rating
-                    "description": description,  # ✅ 상세 설명 추가
-                    "vicinity": place.get("address_name", ""),  # ✅ 주소 정보
-                    "lat": float(place.get("y")),
-                    "lng": float(place.get("x"))
-                })
-            return pois
+        try:
+            first = await get_page(1)
         except httpx.HTTPStatusError as e:
-            raise PoiClientError(f"Kakao POI search failed: {e.response.text}")
\ No newline at end of file
+            raise PoiClientError(f"Kakao POI search failed: {e.response.text}")
+
+        meta = first.get("meta", {})
+        pages = [first]
+        available = min(meta.get("pageable_count", 0), self.KAKAO_PAGE_SIZE * self.KAKAO_MAX_PAGES)
+        wanted = min(target, available)
+        last_page = 1 if meta.get("is_end", True) else max(1, math.ceil(wanted / self.KAKAO_PAGE_SIZE))
+        if last_page > 1:
+            more = await asyncio.gather(*(get_page(page) for page in range(2, last_page + 1)), return_exceptions=True)
+            for page in more:
+                if isinstance(page, Exception):
+                    print(f"[PoiClient] ⚠️ Kakao extra page failed: {page}")
+                    break
+                pages.append(page)
+
+        pois = [self._parse_kakao_place(place) for page in pages for place in page.get("documents", [])]
+        complete = len(pages) == last_page and target >= available
+        return pois[:target], complete
+
+    @staticmethod
+    def _parse_kakao_place(place: dict) -> dict:
+        place_name = place.get("place_name", "")
+        place_rating = float(place.get("rating", 0)) if place.get("rating") else 0
+        category = place.get("category_group_name", "관광명소")
+        
+        # ✅ 상세 설명 생성 (Kakao도 동일하게)
+        description = place_name
+        if place_rating > 0:
+            description += f" - {category}"
+            if "음식점" in category:
+                description += ", 현지 맛집"
+            elif "카페" in category:
+                description += ", 분위기 좋은 카페"
+            else:
+                description += ", 인기 장소"
+            description += f" (Rating: {place_rating})"
+        
+        return {
+            "name": place_name,
+            "category": category,
+            "rating": place_rating,  # ✅ 실제 rating
+            "description": description,  # ✅ 상세 설명 추가
+            "vicinity": place.get("address_name", ""),  # ✅ 주소 정보
+            "lat": float(place.get("y")),
+            "lng": float(place.get("x"))
+        }
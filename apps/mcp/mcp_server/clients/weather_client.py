@@ -1,10 +1,18 @@
 # mcp/mcp_server/clients/weather_client.py
 
+import asyncio
 import httpx
-from datetime import date, timedelta
-from collections import defaultdict
-from statistics import mean
+import time
+from datetime import date, datetime, timedelta, timezone
+from collections import Counter
+
+import numpy as np
+
 from ..config import settings
+from .. import metrics
+from ..cache import AsyncTTLCache
+from ..resilience import ResilientTransport, RetryPolicy
+from ..stores.resolution_store import KIND_GEOCODE, resolution_store
 
 class WeatherClientError(Exception):
     """날씨 API 클라이언트 관련 에러"""
@@ -13,28 +21,73 @@ class WeatherClientError(Exception):
 class WeatherClient:
     """OpenWeatherMap API를 통해 날씨 정보를 가져오는 클라이언트"""
 
-    def __init__(self):
+    def __init__(self, store=None):
         self.api_key = settings.OWM_API_KEY
         self.geo_url = "http://api.openweathermap.org/geo/1.0/direct"
         self.forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+        # 도시 → 좌표 해석 결과 영구 저장 (도시 좌표는 바뀌지 않으므로 한 번만 geocoding)
+        self.resolution_store = store or resolution_store
+        # (반올림 좌표) → 예보 원본 list, OWM 갱신 주기 경계에서 만료 + 동시 miss 병합
+        self.forecast_cache = AsyncTTLCache("weather_forecast", ttl=settings.WEATHER_FORECAST_UPDATE_HOURS * 3600,
+                                            max_entries=512, cacheable=bool)
+        metrics.register("cache.weather_forecast", self.forecast_cache.stats)
+
+    # OWM 5일/3시간 예보가 닿는 마지막 날짜 (UTC 오늘 + N일)
+    FORECAST_HORIZON_DAYS = 5
+
+    # 엔드포인트별 재시도 정책 (경로 → 브레이커 이름, 정책)
+    ENDPOINT_POLICIES = {
+        "/geo/1.0/direct": ("owm.geocoding", RetryPolicy(attempts=3, base_delay=0.2)),
+        "/data/2.5/forecast": ("owm.forecast", RetryPolicy(attempts=3, base_delay=0.3)),
+    }
+
+    def _route_request(self, request: httpx.Request):
+        return self.ENDPOINT_POLICIES.get(request.url.path, ("owm.other", RetryPolicy(attempts=2)))
+
+    def _new_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=10.0, transport=ResilientTransport(self._route_request))
+
+    def _stored_coordinates(self, destination: str) -> dict | None:
+        value = self.resolution_store.get_value(KIND_GEOCODE, destination)
+        if not value:
+            return None
+        try:
+            lat, lon = (float(v) for v in value.split(","))
+        except ValueError:
+            print(f"[Weather] ⚠️ Invalid stored coordinates for '{destination}': {value}")
+            return None
+        return {"lat": lat, "lon": lon}
 
     async def _get_coordinates(self, client: httpx.AsyncClient, destination: str) -> dict | None:
-        """도시 이름을 기반으로 위도와 경도를 찾습니다."""
+        """도시 이름을 기반으로 위도와 경도를 찾습니다 (저장된 결과 우선, 없으면 OWM geocoding 후 저장)."""
+        coords = await asyncio.to_thread(self._stored_coordinates, destination)
+        if coords:
+            return coords
+
         params = {"q": destination, "limit": 1, "appid": self.api_key}
         try:
             response = await client.get(self.geo_url, params=params)
             response.raise_for_status()
             locations = response.json()
             if locations:
-                return {"lat": locations[0]["lat"], "lon": locations[0]["lon"]}
+                coords = {"lat": locations[0]["lat"], "lon": locations[0]["lon"]}
+                await asyncio.to_thread(
+                    self.resolution_store.put,
+                    KIND_GEOCODE, destination, f"{coords['lat']:.5f},{coords['lon']:.5f}",
+                    source="owm_geocoding", confidence=0.9
+                )
+                return coords
         except httpx.HTTPStatusError as e:
             print(f"Error fetching coordinates for '{destination}': {e} - Response: {e.response.text}")
             return None
         return None
 
-    async def get_weather_forecast(self, destination: str, start_date: date, end_date: date):
+    async def get_weather_forecast(self, destination: str, start_date: date, end_date: date,
+                                   coords: dict | None = None):
         """
         주어진 기간과 목적지의 날짜별 날씨 예보를 가져옵니다.
+        coords({"lat", "lon"})를 알고 있으면 넘겨서 geocoding 호출을 건너뜁니다.
+        여행이 예보 범위(FORECAST_HORIZON_DAYS) 밖에서 시작하면 API를 호출하지 않고 '정보 없음' 날짜를 반환합니다.
         
         Returns:
             dict: {
@@ -55,110 +108,151 @@ class WeatherClient:
                 ]
             }
         """
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            coords = await self._get_coordinates(client, destination)
-            if not coords:
-                raise WeatherClientError(f"Could not find coordinates for '{destination}'")
+        # 예보 원본의 dt_txt는 UTC 기준이므로 범위도 UTC 날짜로 판단
+        horizon = datetime.now(timezone.utc).date() + timedelta(days=self.FORECAST_HORIZON_DAYS)
+        if start_date > horizon:
+            print(f"[Weather] ⏭️ {destination} trip starts after forecast horizon ({horizon}), skipping API calls")
+            return self._placeholder_days(destination, start_date, end_date)
+
+        if not coords:
+            async with self._new_http_client() as client:
+                coords = await self._get_coordinates(client, destination)
+        if not coords:
+            raise WeatherClientError(f"Could not find coordinates for '{destination}'")
+
+        try:
+            items = await self._get_forecast_items(coords)
+        except httpx.HTTPStatusError as e:
+            raise WeatherClientError(f"Failed to get weather forecast: {e.response.text}")
 
+        try:
+            return self._aggregate_daily(destination, items, start_date, end_date)
+        except (KeyError, IndexError) as e:
+            raise WeatherClientError(f"Failed to parse weather forecast response: {e}")
+
+    @staticmethod
+    def forecast_ttl(now: float | None = None) -> float:
+        """
+        다음 OWM 예보 갱신 시각까지 남은 시간(초).
+        예보는 UTC 00/03/06... 시에 갱신되고 게시까지 약간 걸리므로 (경계 + PUBLISH_LAG)에 만료합니다.
+        """
+        now = time.time() if now is None else now
+        period = settings.WEATHER_FORECAST_UPDATE_HOURS * 3600
+        lag = settings.WEATHER_FORECAST_PUBLISH_LAG
+        next_update = (now - lag) // period * period + period + lag
+        return max(1.0, next_update - now)
+
+    async def _get_forecast_items(self, coords: dict) -> list:
+        """
+        반올림한 좌표의 5일/3시간 예보 원본 list (캐시 우선).
+        여행 기간과 무관하게 원본을 한 번만 저장하므로 어떤 날짜 범위든 다시 호출하지 않고 집계합니다.
+        공유 fetch는 먼저 부른 호출자가 취소돼도 다른 호출자가 기다리는 동안 계속되므로 호출자와 무관한 자체 client로 요청합니다.
+        """
+        decimals = settings.WEATHER_COORD_DECIMALS
+        key = (round(coords["lat"], decimals), round(coords["lon"], decimals))
+
+        async def fetch():
             params = {
-                "lat": coords["lat"],
-                "lon": coords["lon"],
+                "lat": key[0],
+                "lon": key[1],
                 "appid": self.api_key,
                 "units": "metric",  # 섭씨 온도
                 "lang": "kr"        # 한국어 설명
             }
-            
-            try:
+            async with self._new_http_client() as client:
                 response = await client.get(self.forecast_url, params=params)
                 response.raise_for_status()
-                forecast_data = response.json()
-                
-                # ✅ 날짜별로 데이터 그룹화
-                daily_data = defaultdict(list)
-                
-                for item in forecast_data.get("list", []):
-                    # dt_txt 형식: "2025-12-06 15:00:00"
-                    forecast_datetime = item["dt_txt"]
-                    forecast_date = forecast_datetime.split(" ")[0]  # "2025-12-06"
-                    
-                    # 여행 기간 내의 데이터만 수집
-                    item_date = date.fromisoformat(forecast_date)
-                    if start_date <= item_date <= end_date:
-                        daily_data[forecast_date].append(item)
-                
-                if not daily_data:
-                    # ✅ 데이터가 없으면 여행 기간만큼 빈 데이터 생성
-                    print(f"[Weather] No forecast data available for {destination} ({start_date} ~ {end_date})")
-                    daily_forecasts = []
-                    current_date = start_date
-                    while current_date <= end_date:
-                        daily_forecasts.append({
-                            "date": current_date.isoformat(),
-                            "temp": None,
-                            "temp_min": None,
-                            "temp_max": None,
-                            "condition": "N/A",
-                            "description": "정보 없음",
-                            "icon": "01d",
-                            "humidity": None,
-                            "wind_speed": None
-                        })
-                        current_date += timedelta(days=1)
-                    
-                    return {
-                        "location": destination,
-                        "daily": daily_forecasts
-                    }
-                
-                # ✅ 각 날짜별로 평균/대표값 계산
-                daily_forecasts = []
-                
-                for forecast_date in sorted(daily_data.keys()):
-                    day_items = daily_data[forecast_date]
-                    
-                    # 온도 평균 및 min/max
-                    temps = [item["main"]["temp"] for item in day_items]
-                    temp_mins = [item["main"]["temp_min"] for item in day_items]
-                    temp_maxs = [item["main"]["temp_max"] for item in day_items]
-                    
-                    avg_temp = round(mean(temps), 1)
-                    min_temp = round(min(temp_mins), 1)
-                    max_temp = round(max(temp_maxs), 1)
-                    
-                    # 가장 빈번한 날씨 상태 (영어 main)
-                    conditions = [item["weather"][0]["main"] for item in day_items]
-                    main_condition = max(set(conditions), key=conditions.count)
-                    
-                    # 가장 빈번한 날씨 설명 (한국어)
-                    descriptions = [item["weather"][0]["description"] for item in day_items]
-                    main_description = max(set(descriptions), key=descriptions.count)
-                    
-                    # 대표 아이콘 (가장 많이 등장하는 아이콘)
-                    icons = [item["weather"][0]["icon"] for item in day_items]
-                    main_icon = max(set(icons), key=icons.count)
-                    
-                    # 습도, 풍속 평균
-                    avg_humidity = round(mean([item["main"]["humidity"] for item in day_items]))
-                    avg_wind = round(mean([item["wind"]["speed"] for item in day_items]), 1)
-                    
-                    daily_forecasts.append({
-                        "date": forecast_date,
-                        "temp": avg_temp,
-                        "temp_min": min_temp,
-                        "temp_max": max_temp,
-                        "condition": main_condition,        # "Clear", "Clouds", "Rain" 등
-                        "description": main_description,    # "맑음", "구름 조금" 등
-                        "icon": main_icon,                  # "01d", "02d" 등
-                        "humidity": avg_humidity,           # %
-                        "wind_speed": avg_wind              # m/s
-                    })
-                
-                return {
-                    "location": destination,
-                    "daily": daily_forecasts
-                }
-
-            except httpx.HTTPStatusError as e:
-                raise WeatherClientError(f"Failed to get weather forecast: {e.response.text}")
-            except (KeyError, IndexError) as e:
-                raise WeatherClientError(f"Failed to parse weather forecast response: {e}")
\ No newline at end of file
+                return response.json().get("list", [])
+
+        items, _, status = await self.forecast_cache.get_or_fetch(key, fetch, ttl=self.forecast_ttl())
+        if status == "hit":
+            print(f"[Weather] ⚡ Forecast cache hit for {key}")
+        return items
+
+    @staticmethod
+    def _placeholder_days(destination: str, start_date: date, end_date: date) -> dict:
+        """예보가 없을 때 여행 기간만큼 '정보 없음' 날짜를 채워 반환합니다."""
+        daily_forecasts = []
+        current_date = start_date
+        while current_date <= end_date:
+            daily_forecasts.append({
+                "date": current_date.isoformat(),
+                "temp": None,
+                "temp_min": None,
+                "temp_max": None,
+                "condition": "N/A",
+                "description": "정보 없음",
+                "icon": "01d",
+                "humidity": None,
+                "wind_speed": None
+            })
+            current_date += timedelta(days=1)
+
+        return {
+            "location": destination,
+            "daily": daily_forecasts
+        }
+
+    def _aggregate_daily(self, destination: str, items: list, start_date: date, end_date: date) -> dict:
+        """
+        3시간 단위 예보 원본을 여행 기간의 날짜별 요약으로 집계합니다.
+        dt_txt("2025-12-06 15:00:00")의 날짜 문자열을 ISO 문자열끼리 비교해 거르고,
+        수치는 NumPy 배열로 한 번에, 대표 날씨는 Counter로 날짜마다 한 번씩 셉니다.
+        """
+        # ✅ 여행 기간 내의 데이터만 수집 (ISO 날짜 문자열은 사전순 = 날짜순)
+        day_keys = np.array([item["dt_txt"][:10] for item in items], dtype=str)
+        in_range = np.nonzero((day_keys >= start_date.isoformat()) & (day_keys <= end_date.isoformat()))[0]
+
+        if in_range.size == 0:
+            # ✅ 데이터가 없으면 여행 기간만큼 빈 데이터 생성
+            print(f"[Weather] No forecast data available for {destination} ({start_date} ~ {end_date})")
+            return self._placeholder_days(destination, start_date, end_date)
+
+        # ✅ 날짜별 그룹 번호 (dates는 정렬된 고유 날짜)
+        dates, group = np.unique(day_keys[in_range], return_inverse=True)
+        counts = np.bincount(group, minlength=dates.size)
+
+        def column(getter) -> np.ndarray:
+            return np.array([getter(items[i]) for i in in_range], dtype=float)
+
+        def group_mean(values: np.ndarray) -> np.ndarray:
+            return np.bincount(group, weights=values, minlength=dates.size) / counts
+
+        # 온도 평균 및 min/max, 습도/풍속 평균
+        avg_temps = group_mean(column(lambda item: item["main"]["temp"]))
+        min_temps = np.full(dates.size, np.inf)
+        np.minimum.at(min_temps, group, column(lambda item: item["main"]["temp_min"]))
+        max_temps = np.full(dates.size, -np.inf)
+        np.maximum.at(max_temps, group, column(lambda item: item["main"]["temp_max"]))
+        avg_humidity = group_mean(column(lambda item: item["main"]["humidity"]))
+        avg_wind = group_mean(column(lambda item: item["wind"]["speed"]))
+
+        # 가장 빈번한 날씨 상태(영어 main) / 설명(한국어) / 아이콘
+        conditions = [Counter() for _ in range(dates.size)]
+        descriptions = [Counter() for _ in range(dates.size)]
+        icons = [Counter() for _ in range(dates.size)]
+        for g, i in zip(group, in_range):
+            weather = items[i]["weather"][0]
+            conditions[g][weather["main"]] += 1
+            descriptions[g][weather["description"]] += 1
+            icons[g][weather["icon"]] += 1
+
+        # ✅ 각 날짜별로 평균/대표값 정리
+        daily_forecasts = []
+        for g, forecast_date in enumerate(dates):
+            daily_forecasts.append({
+                "date": str(forecast_date),
+                "temp": round(float(avg_temps[g]), 1),
+                "temp_min": round(float(min_temps[g]), 1),
+                "temp_max": round(float(max_temps[g]), 1),
+                "condition": conditions[g].most_common(1)[0][0],      # "Clear", "Clouds", "Rain" 등
+                "description": descriptions[g].most_common(1)[0][0],  # "맑음", "구름 조금" 등
+                "icon": icons[g].most_common(1)[0][0],                # "01d", "02d" 등
+                "humidity": round(float(avg_humidity[g])),            # %
+                "wind_speed": round(float(avg_wind[g]), 1)            # m/s
+            })
+
+        return {
+            "location": destination,
+            "daily": daily_forecasts
+        }
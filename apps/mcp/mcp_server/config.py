@@ -4,6 +4,9 @@ from dotenv import load_dotenv, find_dotenv
 # TripMind/ 디렉토리의 최상위 .env 파일을 찾아 환경 변수를 로드합니다.
 load_dotenv(find_dotenv())
 
+# 로컬 영구 데이터(SQLite 등)를 저장하는 기본 디렉토리: apps/mcp/data
+_DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
 class Settings:
     """MCP 서버가 사용하는 모든 환경 변수를 관리하는 클래스입니다."""
     
@@ -21,11 +24,81 @@ class Settings:
     RAPID_API_KEY: str = os.getenv("RAPID_API_KEY")
     RAPID_HOST: str = os.getenv("RAPID_HOST")
     RAPID_BASE: str = os.getenv("RAPID_BASE")
+    # RapidAPI 공용 속도 제한 (초당 요청 수 / 버스트) + 남은 쿼터가 이 값 이하이면 캐시 전용
+    RAPIDAPI_RATE_PER_SEC: float = float(os.getenv("RAPIDAPI_RATE_PER_SEC", "5"))
+    RAPIDAPI_BURST: float = float(os.getenv("RAPIDAPI_BURST", "10"))
+    RAPIDAPI_QUOTA_RESERVE: int = int(os.getenv("RAPIDAPI_QUOTA_RESERVE", "50"))
 
     # Exchange APIs
     EXCHANGE_BASE = os.getenv("EXCHANGE_BASE", "https://oapi.koreaexim.go.kr/site/program/financial/exchangeJSON")
     EXCHANGE_API_KEY = os.getenv("EXCHANGE_API_KEY")
     EXCHANGE_DATA_CODE = os.getenv("EXCHANGE_DATA_CODE", "AP01")
+    EXCHANGE_REFRESH_INTERVAL: int = int(os.getenv("EXCHANGE_REFRESH_INTERVAL", str(6 * 3600)))
+    # 수출입은행 서버 인증서 체인 문제로 기본값은 검증 생략 (기존 동작 유지)
+    EXCHANGE_VERIFY_SSL: bool = os.getenv("EXCHANGE_VERIFY_SSL", "false").lower() == "true"
+
+    # Circuit breaker (최근 BREAKER_WINDOW 호출 중 실패/지연 비율이 임계치를 넘으면 RECOVERY 동안 차단)
+    BREAKER_WINDOW: int = int(os.getenv("BREAKER_WINDOW", "20"))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "15"))
+    BREAKER_SLOW_CALL_RATE: float = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.8"))
+    BREAKER_RECOVERY_SECONDS: float = float(os.getenv("BREAKER_RECOVERY_SECONDS", "30"))
+
+    # Flight search cache (초 단위: TTL 이후 STALE_TTL 동안은 기존 값을 주고 백그라운드 갱신)
+    FLIGHT_CACHE_TTL: int = int(os.getenv("FLIGHT_CACHE_TTL", "300"))
+    FLIGHT_CACHE_STALE_TTL: int = int(os.getenv("FLIGHT_CACHE_STALE_TTL", "1800"))
+
+    # 날씨 예보 캐시: OWM 5일/3시간 예보는 UTC 기준 3시간마다 갱신 → 다음 갱신 시각(+게시 지연)까지 유지
+    WEATHER_FORECAST_UPDATE_HOURS: int = int(os.getenv("WEATHER_FORECAST_UPDATE_HOURS", "3"))
+    WEATHER_FORECAST_PUBLISH_LAG: int = int(os.getenv("WEATHER_FORECAST_PUBLISH_LAG", "600"))
+    WEATHER_COORD_DECIMALS: int = int(os.getenv("WEATHER_COORD_DECIMALS", "2"))  # 캐시 키 좌표 반올림 (약 1km)
+
+    # 출발 공항별 항공권 검색 제한 시간 (초, 여러 출발 공항 동시 검색 시)
+    FLIGHT_ORIGIN_TIMEOUT: float = float(os.getenv("FLIGHT_ORIGIN_TIMEOUT", "45"))
+    # 도시 이름 출발지를 그 도시의 모든 공항(서울 → ICN+GMP)으로 넓혀 검색할지 (공항 수만큼 RapidAPI 쿼터 사용)
+    FLIGHT_MULTI_AIRPORT_ORIGINS: bool = os.getenv("FLIGHT_MULTI_AIRPORT_ORIGINS", "false").lower() == "true"
+
+    # 운임 캘린더 (기본/최대 ±일수, 동시 검색 수, 전체 제한 시간 초)
+    FARE_CALENDAR_FLEX_DAYS: int = int(os.getenv("FARE_CALENDAR_FLEX_DAYS", "2"))
+    FARE_CALENDAR_MAX_FLEX_DAYS: int = int(os.getenv("FARE_CALENDAR_MAX_FLEX_DAYS", "3"))
+    FARE_CALENDAR_CONCURRENCY: int = int(os.getenv("FARE_CALENDAR_CONCURRENCY", "3"))
+    FARE_CALENDAR_DEADLINE: float = float(os.getenv("FARE_CALENDAR_DEADLINE", "120"))
+
+    # Hotel search paging (최대 페이지 수 / 동시 요청 수 / 반환 개수)
+    HOTEL_SEARCH_PAGES: int = int(os.getenv("HOTEL_SEARCH_PAGES", "3"))
+    HOTEL_PAGE_CONCURRENCY: int = int(os.getenv("HOTEL_PAGE_CONCURRENCY", "2"))
+    HOTEL_TOP_K: int = int(os.getenv("HOTEL_TOP_K", "20"))
+
+    # Hotel details (캐시 TTL / 플랜 생성 후 미리 받아 둘 상위 호텔 수 / 동시 요청 수)
+    HOTEL_DETAILS_CACHE_TTL: int = int(os.getenv("HOTEL_DETAILS_CACHE_TTL", "3600"))
+    HOTEL_DETAILS_PREFETCH_N: int = int(os.getenv("HOTEL_DETAILS_PREFETCH_N", "5"))
+    HOTEL_DETAILS_CONCURRENCY: int = int(os.getenv("HOTEL_DETAILS_CONCURRENCY", "3"))
+
+    # Local persistent data (워커 프로세스 간 공유)
+    MCP_DATA_DIR: str = os.getenv("MCP_DATA_DIR", _DEFAULT_DATA_DIR)
+    RESOLUTION_DB_PATH: str = os.getenv("RESOLUTION_DB_PATH", os.path.join(MCP_DATA_DIR, "resolutions.sqlite3"))
+    # 다른 워커의 수정(관리자 보정 등)을 확인하는 간격(초)
+    RESOLUTION_SYNC_INTERVAL: float = float(os.getenv("RESOLUTION_SYNC_INTERVAL", "30"))
+    POI_CACHE_DB_PATH: str = os.getenv("POI_CACHE_DB_PATH", os.path.join(MCP_DATA_DIR, "poi_cache.sqlite3"))
+    # 주요 목적지 POI 카탈로그 (scripts/build_poi_catalog.py 로 생성, 서버 시작 시 mmap)
+    POI_CATALOG_PATH: str = os.getenv("POI_CATALOG_PATH", os.path.join(MCP_DATA_DIR, "poi_catalog.bin"))
+    POI_CATALOG_DAYS: int = int(os.getenv("POI_CATALOG_DAYS", "7"))  # 이 기간 여행까지 카탈로그만으로 충분하도록 수집
+
+    # POI 영구 캐시 (초 단위): TTL 이내는 그대로, 이후 STALE_TTL 동안은 바로 쓰고 백그라운드 갱신
+    POI_CACHE_TTL: int = int(os.getenv("POI_CACHE_TTL", str(3 * 24 * 3600)))
+    POI_CACHE_STALE_TTL: int = int(os.getenv("POI_CACHE_STALE_TTL", str(30 * 24 * 3600)))
+    POI_CACHE_MAX_ENTRIES: int = int(os.getenv("POI_CACHE_MAX_ENTRIES", "5000"))
+
+    # POI 후보 풀 크기: 카테고리별 (하루 사용량 × 일수 × 스타일 가중치 × 여유 배수), 최소/최대로 제한
+    POI_POOL_HEADROOM: float = float(os.getenv("POI_POOL_HEADROOM", "2.0"))
+    POI_MIN_PER_CATEGORY: int = int(os.getenv("POI_MIN_PER_CATEGORY", "10"))
+    POI_MAX_PER_CATEGORY: int = int(os.getenv("POI_MAX_PER_CATEGORY", "60"))
+    # Google next_page_token이 유효해지기까지 기다리는 시간(초)
+    GOOGLE_PAGE_TOKEN_DELAY: float = float(os.getenv("GOOGLE_PAGE_TOKEN_DELAY", "2.0"))
+
+    # Admin API (/admin/*) — 설정하지 않으면 관리자 API는 비활성화됩니다.
+    MCP_ADMIN_TOKEN: str = os.getenv("MCP_ADMIN_TOKEN")
 
 # 다른 파일에서 from .config import settings 로 참조할 수 있도록 인스턴스를 생성합니다.
 settings = Settings()
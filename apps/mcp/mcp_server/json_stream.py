@@ -0,0 +1,150 @@
+# mcp/mcp_server/json_stream.py
+"""
+큰 JSON 응답을 끝까지 메모리에 올리지 않고 필요한 값만 꺼내는 스트리밍 파서
+
+- ijson 이벤트를 한 번 훑으면서 지정한 경로(ijson prefix 표기, 배열 원소는 "item")의 값만 만들어 yield 합니다.
+- fields를 주면 그 값 안에서도 해당 하위 경로만 남기고 나머지 이벤트는 버립니다
+  (예: 호텔 property의 리뷰/시설 등 쓰지 않는 큰 서브트리).
+- 호출 측이 반복을 멈추면 나머지 본문은 읽지 않습니다 (상위 N개만 필요할 때).
+- ijson이 없으면 본문 전체를 json으로 읽은 뒤 같은 순서 규칙으로 값을 돌려줍니다.
+
+경로 예: "data.citySearch.properties.item", "trips.item.bundles.item", "retry.next"
+"""
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # ijson이 없으면 전체 본문 파싱으로 동작
+    ijson = None
+
+CONTAINER_START = ("start_map", "start_array")
+CONTAINER_END = ("end_map", "end_array")
+
+
+class _FieldFilter:
+    """값 내부 경로가 fields 중 하나의 조상/자신/자손인지 판정 (결과는 경로별로 캐시)"""
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self._cache: Dict[str, bool] = {"": True}
+
+    def __call__(self, path: str) -> bool:
+        keep = self._cache.get(path)
+        if keep is None:
+            keep = any(
+                path == f or f.startswith(path + ".") or path.startswith(f + ".")
+                for f in self.fields
+            )
+            self._cache[path] = keep
+        return keep
+
+
+class _PathExtractor:
+    """ijson 이벤트를 받아 대상 경로의 값을 완성되는 순서대로 모읍니다."""
+
+    def __init__(self, paths: Dict[str, Optional[Iterable[str]]]):
+        self.filters = {path: _FieldFilter(fields) if fields is not None else None for path, fields in paths.items()}
+        self.path: Optional[str] = None  # 값을 만드는 중인 대상 경로
+        self.keep: Optional[_FieldFilter] = None
+        self.builder = None
+        self.depth = 0
+        self.skip_depth: Optional[int] = None  # 버리는 키의 값을 건너뛰는 중이면 그 키가 있던 깊이
+
+    def feed(self, events) -> list:
+        found = []
+        for prefix, event, value in events:
+            if self.path is None:
+                if prefix not in self.filters or event == "map_key" or event in CONTAINER_END:
+                    continue
+                if event not in CONTAINER_START:
+                    found.append((prefix, value))  # 스칼라 값
+                    continue
+                self.path, self.keep = prefix, self.filters[prefix]
+                self.builder = ijson.ObjectBuilder()
+                self.depth = 0
+
+            if event in CONTAINER_START:
+                self.depth += 1
+            elif event in CONTAINER_END:
+                self.depth -= 1
+
+            if self.skip_depth is not None:
+                # 버린 키의 값(서브트리)은 깊이만 따라가고 경로 계산 없이 통과
+                if self.depth == self.skip_depth:
+                    self.skip_depth = None
+                continue
+
+            if self.keep is None:
+                self.builder.event(event, value)
+            elif event == "map_key":
+                relative = prefix[len(self.path) + 1:] if prefix != self.path else ""
+                if self.keep(f"{relative}.{value}" if relative else value):
+                    self.builder.event(event, value)
+                else:
+                    self.skip_depth = self.depth
+            else:
+                self.builder.event(event, value)
+
+            if self.depth == 0:
+                found.append((self.path, self.builder.value))
+                self.path = self.keep = self.builder = None
+        return found
+
+
+async def iter_paths(
+    chunks: AsyncIterator[bytes],
+    paths: Dict[str, Optional[Iterable[str]]],
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    JSON 본문에서 지정한 경로의 값을 문서 순서대로 yield 합니다.
+
+    청크 단위로 ijson push 파서에 넣고 그 청크에서 나온 이벤트를 동기 루프로 처리하므로
+    이벤트마다 await 하는 비용이 없습니다.
+
+    Args:
+        chunks: 응답 본문 바이트 청크 (예: httpx Response.aiter_bytes())
+        paths: {대상 경로: 남길 하위 필드 경로 목록 또는 None(전체)}
+
+    Yields:
+        (대상 경로, 값)
+    """
+    if ijson is None:
+        body = b"".join([chunk async for chunk in chunks])
+        for item in _walk_loaded(json.loads(body) if body else None, paths):
+            yield item
+        return
+
+    extractor = _PathExtractor(paths)
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        parser.send(chunk)
+        found = extractor.feed(events)
+        del events[:]
+        for item in found:
+            yield item
+    parser.close()  # 본문 끝: 남은 이벤트 처리 + 잘린 JSON이면 예외
+    for item in extractor.feed(events):
+        yield item
+
+
+def _walk_loaded(data: Any, paths: Dict[str, Optional[Iterable[str]]]):
+    """ijson이 없을 때: 이미 읽은 JSON에서 경로별 값을 꺼냅니다 (경로 순서대로)."""
+    for path in paths:
+        for value in _resolve(data, path.split(".") if path else []):
+            yield path, value
+
+
+def _resolve(node: Any, parts: list):
+    if not parts:
+        yield node
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item" and isinstance(node, list):
+        for child in node:
+            yield from _resolve(child, rest)
+    elif isinstance(node, dict) and head in node:
+        yield from _resolve(node[head], rest)
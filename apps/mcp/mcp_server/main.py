@@ -12,10 +12,14 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 # 💡 1. 우리가 작업한 plan_router를 임포트합니다.
-from .routers import plan_router
+from .routers import plan_router, flight_router, hotel_router, admin_router, metrics_router
 # 💡 2. (선택사항) 나중에 클라이언트 인스턴스 관리를 위해 추가
 from .clients.agoda_client import AgodaClient
 from .clients.flight_client import FlightClient
+from .services.mcp_service import mcp_service_instance
+from .stores.resolution_store import resolution_store
+from .stores.poi_catalog import poi_catalog
+from .clients.exchange_client import exchange_rate_table
 # ... (다른 클라이언트들)
 
 # (참고) FastAPI의 최신 권장 방식은 lifespan을 사용하는 것입니다.
@@ -29,9 +33,18 @@ async def lifespan(app: FastAPI):
     # (mcp_service.py에서 생성하는 대신, 여기서 생성한 것을 주입(DI)할 수 있습니다)
     # -----------------------------------------------------------------
     
+    # 도시 → place_id / IATA 해석 결과를 메모리로 미리 로드
+    resolution_store.load()
+    # 주요 목적지 POI 카탈로그 mmap (없으면 라이브 API만 사용)
+    poi_catalog.load()
+    # 환율 테이블 선로딩 + 주기적 갱신 시작 (요청 경로에서 환율 API를 기다리지 않도록)
+    await exchange_rate_table.start()
+
     print("MCP 서버가 시작되었습니다.")
     yield
     # (서버 종료 시 리소스 정리 로직)
+    await exchange_rate_table.stop()
+    await mcp_service_instance.agoda_client.aclose()
     print("MCP 서버가 종료됩니다.")
 
 # 💡 3. FastAPI 앱 생성 (lifespan은 선택사항)
@@ -46,4 +59,8 @@ def health():
     return {"status": "ok", "message": "MCP server is running."}
 
 # 💡 4. 가장 중요한 부분: plan_router.py에 정의된 모든 엔드포인트(/plan/generate)를 앱에 포함시킵니다.
-app.include_router(plan_router.router)
\ No newline at end of file
+app.include_router(plan_router.router)
+app.include_router(flight_router.router)
+app.include_router(hotel_router.router)
+app.include_router(admin_router.router)
+app.include_router(metrics_router.router)
\ No newline at end of file
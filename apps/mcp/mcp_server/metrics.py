@@ -0,0 +1,26 @@
+# mcp/mcp_server/metrics.py
+"""
+MCP 서버 운영 지표 레지스트리
+
+각 컴포넌트(캐시, 환율 테이블, RapidAPI 쿼터 등)가 이름과 상태 함수(snapshot/stats)를 등록하면
+GET /metrics 가 호출 시점의 값을 모아 JSON으로 반환합니다.
+"""
+from typing import Any, Callable, Dict
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """지표 제공 함수를 등록합니다 (같은 이름이면 교체)."""
+    _providers[name] = provider
+
+
+def collect() -> Dict[str, Any]:
+    """등록된 모든 지표를 모읍니다. 한 컴포넌트가 실패해도 나머지는 반환합니다."""
+    snapshot = {}
+    for name, provider in _providers.items():
+        try:
+            snapshot[name] = provider()
+        except Exception as e:
+            snapshot[name] = {"error": str(e)}
+    return snapshot
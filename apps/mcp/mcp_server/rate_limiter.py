@@ -0,0 +1,187 @@
+# mcp/mcp_server/rate_limiter.py
+"""
+RapidAPI 호출 속도 제한 + 월간 쿼터 추적
+
+- 토큰 버킷으로 초당 요청 수를 고르게 맞춥니다 (순간적인 병렬 요청 폭주 방지).
+- 응답 헤더(X-RateLimit-Requests-Limit / -Remaining / -Reset)로 남은 쿼터를 추적합니다.
+- 남은 쿼터가 예비분 이하로 떨어지거나 429를 받으면 리셋 시각까지 "캐시 전용" 모드가 되어
+  새 RapidAPI 요청은 보내지 않고 (RapidApiQuotaExceeded) 호출 측은 캐시된 결과만 사용합니다.
+
+RateLimitedTransport로 실제 전송 transport를 감싸 붙이므로 공유 AsyncClient를 쓰는 모든 RapidAPI 호출에
+자동으로 적용됩니다. ResilientTransport 아래에 두면 재시도 한 번 한 번도 토큰/쿼터 확인을 거칩니다.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import settings
+from . import metrics
+
+
+class RapidApiQuotaExceeded(httpx.HTTPError):
+    """쿼터가 바닥나 캐시 전용 모드일 때 새 요청을 막으며 발생 (기존 httpx.HTTPError 처리 경로를 그대로 탐)"""
+
+    def __init__(self, message: str, *, request: Optional[httpx.Request] = None):
+        super().__init__(message)
+        self._request = request
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        토큰 하나를 예약하고 차례가 올 때까지 대기합니다. 기다린 시간(초)을 반환합니다.
+        (토큰이 모자라면 음수 잔고로 예약하므로 lock 없이도 요청 순서대로 간격이 벌어집니다)
+        """
+        self._refill()
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RapidApiRateLimiter:
+    """RapidAPI 공용 속도 제한기 + 쿼터 상태"""
+
+    HEADER_LIMIT = "x-ratelimit-requests-limit"
+    HEADER_REMAINING = "x-ratelimit-requests-remaining"
+    HEADER_RESET = "x-ratelimit-requests-reset"
+
+    # 429를 받았는데 Reset 헤더가 없을 때 캐시 전용으로 버티는 시간(초)
+    DEFAULT_COOLDOWN = 60.0
+
+    def __init__(
+        self,
+        rate: float = settings.RAPIDAPI_RATE_PER_SEC,
+        burst: float = settings.RAPIDAPI_BURST,
+        reserve: int = settings.RAPIDAPI_QUOTA_RESERVE,
+    ):
+        """
+        Args:
+            rate: 초당 허용 요청 수
+            burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+            reserve: 남은 쿼터가 이 값 이하이면 캐시 전용 모드
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.reserve = reserve
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch 초
+        self.blocked_until: Optional[float] = None
+        self._stats = {"requests": 0, "throttled": 0, "throttled_seconds": 0.0, "rejected": 0, "http_429": 0}
+
+    @property
+    def cached_only(self) -> bool:
+        """새 RapidAPI 요청을 보내지 말아야 하는 상태인지 (리셋 시각이 지나면 자동 해제)"""
+        if self.blocked_until is None:
+            return False
+        if time.time() >= self.blocked_until:
+            print("[RapidAPI] ✅ Quota window reset, leaving cached-only mode")
+            self.blocked_until = None
+            self.remaining = None
+            return False
+        return True
+
+    def _block(self, seconds: float, reason: str) -> None:
+        until = time.time() + max(seconds, 1.0)
+        if self.blocked_until is None:
+            print(f"[RapidAPI] ⚠️ {reason} → cached-only for {int(seconds)}s")
+        self.blocked_until = max(self.blocked_until or 0.0, until)
+
+    @staticmethod
+    def _header_number(headers: httpx.Headers, name: str) -> Optional[float]:
+        value = headers.get(name)
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def update_from_response(self, response: httpx.Response) -> None:
+        """응답 헤더에서 쿼터 상태를 갱신합니다."""
+        limit = self._header_number(response.headers, self.HEADER_LIMIT)
+        remaining = self._header_number(response.headers, self.HEADER_REMAINING)
+        reset = self._header_number(response.headers, self.HEADER_RESET)
+
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = time.time() + reset
+
+        now = time.time()
+        seconds_to_reset = self.reset_at - now if self.reset_at and self.reset_at > now else self.DEFAULT_COOLDOWN
+        if response.status_code == 429:
+            self._stats["http_429"] += 1
+            self._block(seconds_to_reset, "HTTP 429 from RapidAPI")
+        elif self.remaining is not None and self.remaining <= self.reserve:
+            self._block(seconds_to_reset, f"Quota low ({self.remaining} left, reserve {self.reserve})")
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """요청(재시도 포함) 직전: 캐시 전용 모드면 거절, 아니면 토큰을 얻을 때까지 대기"""
+        if self.cached_only:
+            self._stats["rejected"] += 1
+            raise RapidApiQuotaExceeded(f"RapidAPI quota exhausted, cached-only until {self.blocked_until:.0f}", request=request)
+        waited = await self.bucket.acquire()
+        self._stats["requests"] += 1
+        if waited > 0:
+            self._stats["throttled"] += 1
+            self._stats["throttled_seconds"] += waited
+
+    def transport(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> "RateLimitedTransport":
+        """실제 전송 transport를 이 제한기로 감쌉니다 (기본 httpx.AsyncHTTPTransport)."""
+        return RateLimitedTransport(self, transport)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """메트릭용 상태"""
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in_seconds": round(self.reset_at - time.time(), 1) if self.reset_at else None,
+            "cached_only": self.cached_only,
+            "reserve": self.reserve,
+            "tokens": round(self.bucket.tokens, 2),
+            **self._stats,
+        }
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """전송 시도마다 RapidApiRateLimiter의 토큰/쿼터를 확인하고 응답 헤더로 쿼터를 갱신하는 transport"""
+
+    def __init__(self, limiter: RapidApiRateLimiter, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.limiter = limiter
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.on_request(request)
+        response = await self.transport.handle_async_request(request)
+        self.limiter.update_from_response(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# 서버 전체 RapidAPI 호출이 공유하는 제한기
+rapidapi_limiter = RapidApiRateLimiter()
+metrics.register("rapidapi_quota", rapidapi_limiter.snapshot)
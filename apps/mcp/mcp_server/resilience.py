@@ -0,0 +1,312 @@
+# mcp/mcp_server/resilience.py
+"""
+외부 API(Agoda, Google Places, Kakao, OWM, Gemini) 공용 재시도 + 서킷 브레이커
+
+- RetryPolicy: 지수 백오프 + full jitter 재시도 (엔드포인트마다 다른 정책)
+- CircuitBreaker: 최근 호출 중 실패/지연 비율이 임계치를 넘으면 open 되어 recovery 시간 동안
+  호출을 보내지 않고 즉시 CircuitOpenError를 냅니다 (호출 측은 캐시/기본값으로 대체).
+  recovery 시간이 지나면 half-open 상태에서 시험 호출 하나를 보내 성공하면 닫힙니다.
+- ResilientTransport: httpx transport 래퍼. 클라이언트에 끼우면 그 클라이언트의 모든 요청에
+  엔드포인트별 정책/브레이커가 적용됩니다.
+- call_async / call_sync: httpx가 아닌 호출(Gemini SDK 등)에 같은 정책을 적용합니다.
+
+브레이커 상태는 metrics 레지스트리("circuit_breakers")로 노출됩니다.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .config import settings
+from . import metrics
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 재시도/실패로 보는 HTTP 상태 코드 (그 외 4xx는 호출 측 문제이므로 정상 응답으로 취급)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 재시도는 하되 브레이커 실패로 세지 않는 상태 코드 (429는 upstream 장애가 아니라 속도 제한 — 백오프는 속도 제한기가 담당)
+BREAKER_NEUTRAL_STATUSES = frozenset({429})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """브레이커가 열려 있어 호출을 보내지 않음 (기존 httpx.HTTPError 처리 경로를 그대로 탐)"""
+
+    def __init__(self, breaker_name: str, retry_in: float):
+        super().__init__(f"Circuit '{breaker_name}' is open (retry in {retry_in:.0f}s)")
+        self.breaker_name = breaker_name
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """지수 백오프 + full jitter 재시도 정책"""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.3, max_delay: float = 5.0,
+                 retry_statuses: frozenset = RETRYABLE_STATUSES):
+        """
+        Args:
+            attempts: 최초 호출을 포함한 최대 시도 횟수
+            base_delay: 첫 재시도 대기 상한(초), 이후 2배씩 증가
+            max_delay: 대기 상한(초)
+            retry_statuses: 재시도할 HTTP 상태 코드
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """attempt(0부터)번째 실패 후 대기 시간: [0, min(max_delay, base × 2^attempt)] 균등 분포"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """실패/지연 비율 기반 서킷 브레이커"""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = settings.BREAKER_WINDOW,
+        min_calls: int = settings.BREAKER_MIN_CALLS,
+        failure_rate: float = settings.BREAKER_FAILURE_RATE,
+        slow_call_seconds: float = settings.BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = settings.BREAKER_SLOW_CALL_RATE,
+        recovery_seconds: float = settings.BREAKER_RECOVERY_SECONDS,
+    ):
+        """
+        Args:
+            window: 비율 계산에 쓰는 최근 호출 수
+            min_calls: 이만큼 호출이 쌓이기 전에는 열지 않음
+            failure_rate: 실패 비율이 이 값 이상이면 open
+            slow_call_seconds: 이보다 오래 걸린 성공 호출은 '느린 호출'
+            slow_call_rate: 느린 호출 비율이 이 값 이상이면 open
+            recovery_seconds: open 후 half-open 시험 호출까지 대기 시간
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.recovery_seconds = recovery_seconds
+        self._outcomes: deque = deque(maxlen=window)  # "ok" | "slow" | "fail"
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._stats = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = STATE_HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """호출 전 확인: 열려 있으면 CircuitOpenError (half-open이면 시험 호출 하나만 통과)"""
+        state = self.state
+        if state == STATE_CLOSED:
+            return
+        if state == STATE_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self._stats["rejected"] += 1
+        retry_in = max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def abandon(self) -> None:
+        """결과 없이 끝난 호출 (취소 등): half-open 시험 호출 자리를 돌려줍니다."""
+        self._trial_in_flight = False
+
+    def record_success(self, elapsed: float) -> None:
+        self._stats["calls"] += 1
+        slow = elapsed >= self.slow_call_seconds
+        if slow:
+            self._stats["slow_calls"] += 1
+        if self._state == STATE_HALF_OPEN:
+            if slow:
+                self._open("slow trial call")
+            else:
+                print(f"[Breaker:{self.name}] ✅ Closed after successful trial call")
+                self._state = STATE_CLOSED
+                self._outcomes.clear()
+            return
+        self._outcomes.append("slow" if slow else "ok")
+        self._evaluate()
+
+    def record_failure(self) -> None:
+        self._stats["calls"] += 1
+        self._stats["failures"] += 1
+        if self._state == STATE_HALF_OPEN:
+            self._open("failed trial call")
+            return
+        self._outcomes.append("fail")
+        self._evaluate()
+
+    def _evaluate(self) -> None:
+        total = len(self._outcomes)
+        if self._state != STATE_CLOSED or total < self.min_calls:
+            return
+        failures = self._outcomes.count("fail")
+        slow = self._outcomes.count("slow")
+        if failures / total >= self.failure_rate:
+            self._open(f"failure rate {failures}/{total}")
+        elif slow / total >= self.slow_call_rate:
+            self._open(f"slow call rate {slow}/{total}")
+
+    def _open(self, reason: str) -> None:
+        print(f"[Breaker:{self.name}] 🔴 Open ({reason}), failing fast for {self.recovery_seconds:.0f}s")
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self._outcomes.clear()
+        self._stats["opened"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "recent_calls": len(self._outcomes), **self._stats}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """이름별 브레이커 (서버 전체에서 공유)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def breaker_snapshot() -> Dict[str, Any]:
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+metrics.register("circuit_breakers", breaker_snapshot)
+
+
+# 요청 → (브레이커 이름, 재시도 정책)
+Route = Callable[[httpx.Request], Tuple[str, RetryPolicy]]
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """재시도 + 서킷 브레이커를 적용하는 httpx transport"""
+
+    def __init__(self, route: Route, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            route: 요청별 (브레이커 이름, 재시도 정책)을 정하는 함수
+            transport: 실제 전송 transport (기본 httpx.AsyncHTTPTransport)
+        """
+        self.route = route
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        name, policy = self.route(request)
+        breaker = get_breaker(name)
+
+        for attempt in range(policy.attempts):
+            breaker.before_call()
+            started = time.monotonic()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt + 1 >= policy.attempts:
+                    raise
+                delay = policy.backoff(attempt)
+                print(f"[Retry:{name}] ⚠️ {type(e).__name__}, retry {attempt + 1}/{policy.attempts - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+
+            elapsed = time.monotonic() - started
+            if response.status_code not in RETRYABLE_STATUSES:
+                breaker.record_success(elapsed)
+                return response
+
+            if response.status_code in BREAKER_NEUTRAL_STATUSES:
+                breaker.abandon()
+            else:
+                breaker.record_failure()
+            if response.status_code not in policy.retry_statuses or attempt + 1 >= policy.attempts:
+                return response
+            await response.aclose()
+            delay = policy.backoff(attempt)
+            print(f"[Retry:{name}] ⚠️ HTTP {response.status_code}, retry {attempt + 1}/{policy.attempts - 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def single_route(name: str, policy: RetryPolicy) -> Route:
+    """모든 요청에 같은 브레이커/정책을 쓰는 route"""
+    return lambda request: (name, policy)
+
+
+async def call_async(name: str, policy: RetryPolicy, fn: Callable[[], Any], retry_on: tuple = (Exception,)):
+    """
+    httpx가 아닌 비동기 호출에 재시도 + 브레이커를 적용합니다.
+    모든 예외는 브레이커 실패로 기록하고, retry_on에 해당하는 예외만 재시도합니다.
+    """
+    breaker = get_breaker(name)
+    for attempt in range(policy.attempts):
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            breaker.record_failure()
+            if not isinstance(e, retry_on) or attempt + 1 >= policy.attempts:
+                raise
+            await asyncio.sleep(policy.backoff(attempt))
+            continue
+        except BaseException:
+            breaker.abandon()
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return result
+
+
+def call_sync(name: str, policy: RetryPolicy, fn: Callable[[], Any], retry_on: tuple = (Exception,)):
+    """동기 호출(Gemini generate_content 등)에 재시도 + 브레이커를 적용합니다."""
+    breaker = get_breaker(name)
+    for attempt in range(policy.attempts):
+        breaker.before_call()
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            breaker.record_failure()
+            if not isinstance(e, retry_on) or attempt + 1 >= policy.attempts:
+                raise
+            time.sleep(policy.backoff(attempt))
+            continue
+        except BaseException:
+            breaker.abandon()
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return result
+
+
+# Gemini: 일시적 오류(과부하/쿼터/타임아웃/5xx)만 재시도
+try:
+    from google.api_core import exceptions as google_exceptions
+    GEMINI_RETRY_ON: tuple = (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+except ImportError:  # google-api-core가 없으면 모든 예외를 재시도 대상으로
+    GEMINI_RETRY_ON = (Exception,)
+
+GEMINI_BREAKER = "gemini"
+GEMINI_RETRY = RetryPolicy(attempts=2, base_delay=1.0, max_delay=4.0)
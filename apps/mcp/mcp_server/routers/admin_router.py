@@ -0,0 +1,67 @@
+# mcp/mcp_server/routers/admin_router.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from ..config import settings
+from ..schemas.admin import ResolutionUpdate
+from ..stores.resolution_store import SOURCE_ADMIN, VALID_KINDS, resolution_store
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """X-Admin-Token 헤더 검증 (MCP_ADMIN_TOKEN 미설정 시 관리자 API 비활성화)"""
+    if not settings.MCP_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (MCP_ADMIN_TOKEN not set)")
+    if x_admin_token != settings.MCP_ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+
+def _check_kind(kind: str):
+    if kind not in VALID_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind '{kind}' (use one of {VALID_KINDS})")
+
+
+@router.get("/resolutions")
+def list_resolutions(
+    kind: Optional[str] = Query(None, description="place_id, iata 또는 geocode"),
+    q: Optional[str] = Query(None, description="도시 이름/값 부분 검색"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """저장된 도시 해석 결과 목록 (최근 수정순)"""
+    if kind:
+        _check_kind(kind)
+    return {"status": "success", "data": resolution_store.list(kind=kind, query=q, limit=limit)}
+
+
+@router.get("/resolutions/{kind}/{city}")
+def get_resolution(kind: str, city: str):
+    _check_kind(kind)
+    record = resolution_store.get(kind, city)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"No {kind} entry for '{city}'")
+    return {"status": "success", "data": record}
+
+
+@router.put("/resolutions/{kind}/{city}")
+def put_resolution(kind: str, city: str, body: ResolutionUpdate):
+    """관리자 보정값 저장 — 이후 자동 해석 결과로 덮어쓰지 않습니다."""
+    _check_kind(kind)
+    record = resolution_store.put(kind, city, body.value, source=SOURCE_ADMIN, confidence=body.confidence)
+    if not record:
+        raise HTTPException(status_code=400, detail="city and value must not be empty")
+    return {"status": "success", "data": record}
+
+
+@router.delete("/resolutions/{kind}/{city}")
+def delete_resolution(kind: str, city: str):
+    _check_kind(kind)
+    if not resolution_store.delete(kind, city):
+        raise HTTPException(status_code=404, detail=f"No {kind} entry for '{city}'")
+    return {"status": "success"}
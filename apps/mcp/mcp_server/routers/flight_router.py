@@ -0,0 +1,79 @@
+# mcp/mcp_server/routers/flight_router.py
+import contextlib
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ..clients.agoda_client import AgodaClient
+from ..config import settings
+from ..services.fare_calendar import build_fare_matrix, iter_fare_calendar
+from ..services.mcp_service import mcp_service_instance
+from ..services.response_formatter import dumps
+
+router = APIRouter(
+    prefix="/flights",
+    tags=["Flights"]
+)
+
+def get_agoda_client() -> AgodaClient:
+    return mcp_service_instance.agoda_client
+
+@router.get("/search/stream")
+async def stream_flight_search(
+    origin: str,
+    destination: str,
+    depart_date: str,
+    return_date: str,
+    adults: int = 1,
+    agoda_client: AgodaClient = Depends(get_agoda_client)
+):
+    """
+    항공권 검색 결과를 polling 라운드마다 NDJSON 한 줄씩 스트리밍합니다.
+
+    각 줄: {"flights": [...가격 오름차순 상위 N개...], "completed": bool, "poll": int | None, "status": str}
+    플랜/캘린더와 같은 캐시·공유 검색·쿼터/브레이커 경로를 거칩니다.
+    - 캐시에 있으면 (쿼터 소진/브레이커 open이면 캐시에 있는 것만) 완료된 한 줄만 보냅니다.
+    - 같은 검색이 진행 중이면 새로 polling 하지 않고 그 검색의 진행 상황을 함께 받습니다.
+    - 클라이언트가 중간에 연결을 끊어도 검색은 끝까지 진행되어 결과가 캐시됩니다.
+    오류가 나면 마지막 줄로 {"error": ..., "completed": true}를 보냅니다.
+    """
+    async def lines():
+        try:
+            async with contextlib.aclosing(
+                agoda_client.iter_flight_search(origin, destination, depart_date, return_date, adults)
+            ) as progress:
+                async for snapshot in progress:
+                    yield dumps(snapshot) + b"\n"
+        except Exception as e:
+            print(f"[MCP] /flights/search/stream 오류: {e}")
+            yield dumps({"error": str(e), "completed": True}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/calendar/stream")
+async def stream_fare_calendar(
+    origin: str,
+    destination: str,
+    depart_date: date,
+    return_date: date,
+    adults: int = 1,
+    flex_days: int = Query(settings.FARE_CALENDAR_FLEX_DAYS, ge=0, le=settings.FARE_CALENDAR_MAX_FLEX_DAYS),
+    agoda_client: AgodaClient = Depends(get_agoda_client)
+):
+    """
+    가는 날/오는 날 ±flex_days 범위의 최저가 캘린더를 NDJSON으로 스트리밍합니다.
+
+    - 검색이 끝난 칸부터: {"type": "cell", "depart_date", "return_date", "status", "price_krw", "airline", "flight_count"}
+    - 마지막 줄: {"type": "matrix", "depart_dates", "return_dates", "prices", "cheapest"} (히트맵용)
+    status: ok | empty | error | timeout (FARE_CALENDAR_DEADLINE 초과로 검색하지 않은 칸)
+    """
+    async def lines():
+        cells = []
+        async for cell in iter_fare_calendar(agoda_client, origin, destination, depart_date, return_date,
+                                             adults, flex_days=flex_days):
+            cells.append(cell)
+            yield dumps(cell) + b"\n"
+        yield dumps(build_fare_matrix(cells)) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
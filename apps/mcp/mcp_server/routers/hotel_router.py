@@ -0,0 +1,43 @@
+# mcp/mcp_server/routers/hotel_router.py
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..clients.agoda_client import AgodaClient
+from ..schemas.hotel import HotelDetailsBatchRequest
+from ..services.mcp_service import mcp_service_instance
+
+router = APIRouter(
+    prefix="/hotels",
+    tags=["Hotels"]
+)
+
+def get_agoda_client() -> AgodaClient:
+    return mcp_service_instance.agoda_client
+
+@router.get("/{hotel_id}/details")
+async def get_hotel_details(
+    hotel_id: str,
+    check_in: date,
+    check_out: date,
+    adults: int = 2,
+    agoda_client: AgodaClient = Depends(get_agoda_client)
+):
+    """호텔 상세 정보 (플랜 생성 시 미리 받아 둔 캐시가 있으면 즉시 반환)"""
+    details = await agoda_client.get_hotel_details(hotel_id, check_in, check_out, adults)
+    if details is None:
+        raise HTTPException(status_code=404, detail=f"Hotel details not found: {hotel_id}")
+    return {"status": "success", "data": details}
+
+@router.post("/details/batch")
+async def get_hotel_details_batch(
+    body: HotelDetailsBatchRequest,
+    agoda_client: AgodaClient = Depends(get_agoda_client)
+):
+    """
+    호텔 카드 목록의 상세 정보를 한 번에 조회합니다.
+
+    응답 data: {hotelId: 상세 정보 또는 null}
+    """
+    details = await agoda_client.get_hotel_details_batch(body.hotel_ids, body.check_in, body.check_out, body.adults)
+    return {"status": "success", "data": details}
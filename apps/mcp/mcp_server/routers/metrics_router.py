@@ -0,0 +1,15 @@
+# mcp/mcp_server/routers/metrics_router.py
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from .. import metrics
+
+router = APIRouter(
+    tags=["Metrics"]
+)
+
+@router.get("/metrics", response_model=Dict[str, Any])
+async def get_metrics():
+    """캐시 적중률, 환율 테이블, RapidAPI 쿼터 등 운영 지표"""
+    return metrics.collect()
@@ -1,10 +1,11 @@
 # mcp/mcp_server/routers/plan_router.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from ..schemas.plan import PlanRequest
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import traceback  # ← 추가!
 
 from ..services.mcp_service import MCPService, mcp_service_instance 
+from ..services import response_formatter
 
 router = APIRouter(
     prefix="/plan",
@@ -17,6 +18,9 @@ def get_mcp_service():
 @router.post("/generate", response_model=Dict[str, Any])
 async def generate_trip_plan_endpoint(
     request_data: PlanRequest, 
+    request: Request,
+    format: str = Query("v1", description="응답 포맷: v1(기존) 또는 v2(중복 제거)"),
+    fields: Optional[str] = Query(None, description="반환할 최상위 필드 (쉼표 구분, 예: schedule,hotel_candidates)"),
     mcp_service: MCPService = Depends(get_mcp_service)
 ):
     """
@@ -24,7 +28,14 @@ async def generate_trip_plan_endpoint(
     
     모든 외부 API(POI, 날씨, 항공권, 호텔) 조회를 MCP 서버에서 수행하고
     취합된 데이터를 JSON 형태로 반환합니다.
+
+    - format=v2: 중복 데이터를 제거한 압축 포맷 (services/response_formatter.py 참고)
+    - fields=a,b: 지정한 최상위 필드만 반환
+    - Accept-Encoding에 따라 gzip/br 압축
     """
+    if format not in response_formatter.SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}' (use one of {response_formatter.SUPPORTED_FORMATS})")
+
     try:
         # Pydantic 모델을 딕셔너리로 변환하여 서비스에 전달
         trip_plan_data = await mcp_service.generate_trip_data(request_data.dict()) 
@@ -32,7 +43,17 @@ async def generate_trip_plan_endpoint(
         if trip_plan_data.get("error"):
              raise HTTPException(status_code=400, detail=f"MCP Service Error: {trip_plan_data['error']}")
 
-        return {"status": "success", "data": trip_plan_data}
+        if format == "v2":
+            trip_plan_data = response_formatter.to_v2(trip_plan_data)
+        if fields:
+            trip_plan_data = response_formatter.select_fields(trip_plan_data, fields.split(","))
+
+        body = response_formatter.dumps({"status": "success", "data": trip_plan_data})
+        body, encoding = response_formatter.compress(body, request.headers.get("accept-encoding", ""))
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except Exception as e:
         # ✅ 전체 traceback 출력
@@ -0,0 +1,8 @@
+# mcp/mcp_server/schemas/admin.py
+from pydantic import BaseModel, Field
+
+
+class ResolutionUpdate(BaseModel):
+    """관리자가 도시 해석 결과(place_id / IATA)를 수정할 때 받는 Body 스키마"""
+    value: str
+    confidence: float = Field(default=1.0, ge=0.0, le=1.0)
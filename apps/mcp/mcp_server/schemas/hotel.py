@@ -0,0 +1,13 @@
+# mcp/mcp_server/schemas/hotel.py
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class HotelDetailsBatchRequest(BaseModel):
+    """여러 호텔 상세 정보를 한 번에 조회할 때 받는 Body 스키마"""
+    hotel_ids: List[str] = Field(..., min_length=1, max_length=50)
+    check_in: date
+    check_out: date
+    adults: int = Field(default=2, ge=1)
@@ -0,0 +1,160 @@
+# mcp/mcp_server/services/city_matcher.py
+"""
+도시 별칭 → IATA 코드 색인 (Aho-Corasick)
+
+사용자 입력("도쿄 3박 여행", "LA trip", "東京都")에서 도시 별칭을 찾아 IATA 코드로 변환합니다.
+모든 별칭을 한 번에 훑는 오토마톤을 미리 만들어 두므로 조회 비용은 질의 길이에 비례합니다.
+
+경계 규칙 (짧은 별칭 오탐 방지):
+- 영문 별칭: 앞뒤가 영문/숫자가 아니어야 함  ("la"는 "malaga" 안에서 매칭되지 않음)
+- 한글/한자 별칭: 앞이 한글/한자가 아니고, 뒤는 문자열 끝·공백·구두점 또는 허용된 접미사
+  ("빈"은 "빈탄"에서 매칭되지 않지만 "빈 여행", "빈에서"는 매칭)
+- 여러 별칭이 걸리면 가장 긴 별칭 → 가장 앞쪽 별칭 순으로 선택
+- 매칭이 없으면, 질의가 어떤 별칭들의 접두어이고 그 별칭들이 모두 같은 코드일 때만 그 코드를 반환
+  ("쿠알라" → "쿠알라룸푸르" → KUL)
+"""
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# 한글/한자 별칭 뒤에 붙어도 되는 접미사 (조사, '여행', '시/도/都/府' 등)
+CJK_SUFFIXES = (
+    "여행", "에서", "으로", "까지", "부터", "공항", "투어", "가는",
+    "에", "로", "행", "시", "도", "역", "은", "는", "이", "가", "을", "를", "의", "와", "과",
+    "旅行", "空港", "都", "府", "市", "県", "駅",
+)
+
+# 접두어 자동완성을 허용하는 최소 질의 길이 (영문 / 그 외)
+MIN_PREFIX_LEN_ASCII = 3
+MIN_PREFIX_LEN_CJK = 2
+
+
+def normalize(text: str) -> str:
+    """NFKC + casefold + 공백 정리"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text or "")).strip().casefold()
+
+
+def _is_ascii_word(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_cjk_word(ch: str) -> bool:
+    return not ch.isascii() and ch.isalnum()
+
+
+class CityMatcher:
+    """도시 별칭 Aho-Corasick 색인"""
+
+    def __init__(self, alias_map: Dict[str, str]):
+        self._exact: Dict[str, str] = {}
+        # 트라이 노드: children / fail 링크 / 이 노드에서 끝나는 별칭 / 하위 별칭들의 공통 코드
+        self._children: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[str, str]]] = [[]]
+        self._subtree_code: List[Optional[str]] = [None]
+        self._subtree_seen: List[bool] = [False]
+
+        for alias, code in alias_map.items():
+            key = normalize(alias)
+            if key:
+                self._exact[key] = code
+        for key, code in self._exact.items():
+            self._insert(key, code)
+        self._build_fail_links()
+
+    def _insert(self, alias: str, code: str) -> None:
+        node = 0
+        self._mark_subtree(node, code)
+        for ch in alias:
+            nxt = self._children[node].get(ch)
+            if nxt is None:
+                nxt = len(self._children)
+                self._children.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._subtree_code.append(None)
+                self._subtree_seen.append(False)
+                self._children[node][ch] = nxt
+            node = nxt
+            self._mark_subtree(node, code)
+        self._outputs[node].append((alias, code))
+
+    def _mark_subtree(self, node: int, code: str) -> None:
+        """노드 하위 별칭들이 모두 같은 코드면 그 코드, 섞여 있으면 None"""
+        if not self._subtree_seen[node]:
+            self._subtree_seen[node] = True
+            self._subtree_code[node] = code
+        elif self._subtree_code[node] != code:
+            self._subtree_code[node] = None
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._children[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._children[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._children[fail]:
+                    fail = self._fail[fail]
+                target = self._children[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+    @staticmethod
+    def _accept(text: str, start: int, end: int, alias: str) -> bool:
+        """별칭이 text[start:end]에 걸렸을 때 경계 규칙을 만족하는지 확인"""
+        before = text[start - 1] if start > 0 else ""
+        after = text[end:]
+        if alias.isascii():
+            return not (before and _is_ascii_word(before)) and not (after and _is_ascii_word(after[0]))
+        if before and _is_cjk_word(before):
+            return False
+        return not after or not after[0].isalnum() or after.startswith(CJK_SUFFIXES)
+
+    def find(self, query: str) -> Optional[Tuple[str, str]]:
+        """
+        질의에서 가장 적합한 (별칭, IATA 코드)를 찾습니다.
+
+        Returns:
+            (매칭된 별칭, 코드) 또는 None
+        """
+        text = normalize(query)
+        if not text:
+            return None
+        if text in self._exact:
+            return text, self._exact[text]
+
+        best = None  # (별칭 길이, -시작 위치, 별칭, 코드)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._children[node]:
+                node = self._fail[node]
+            node = self._children[node].get(ch, 0)
+            for alias, code in self._outputs[node]:
+                start = i + 1 - len(alias)
+                if self._accept(text, start, i + 1, alias):
+                    candidate = (len(alias), -start, alias, code)
+                    if best is None or candidate[:2] > best[:2]:
+                        best = candidate
+        if best:
+            return best[2], best[3]
+
+        return self._complete_prefix(text)
+
+    def _complete_prefix(self, text: str) -> Optional[Tuple[str, str]]:
+        min_len = MIN_PREFIX_LEN_ASCII if text.isascii() else MIN_PREFIX_LEN_CJK
+        if len(text) < min_len:
+            return None
+        node = 0
+        for ch in text:
+            node = self._children[node].get(ch)
+            if node is None:
+                return None
+        code = self._subtree_code[node]
+        return (text, code) if code else None
+
+    def match(self, query: str) -> Optional[str]:
+        """질의에 해당하는 IATA 코드 (없으면 None)"""
+        found = self.find(query)
+        return found[1] if found else None
@@ -0,0 +1,137 @@
+# mcp/mcp_server/services/fare_calendar.py
+"""
+유연한 날짜 운임 캘린더 (가는 날 ±N일 × 오는 날 ±N일)
+
+- 요청한 날짜 쌍에서 가까운 칸부터 제한된 동시성으로 왕복 검색을 보냅니다.
+- 각 칸은 AgodaClient.search_flights를 그대로 쓰므로 항공권 캐시/쿼터 제한/브레이커가 모두 적용됩니다.
+- 각 칸은 끝까지 검색한 결과를 캐시하므로 같은 날짜 조합은 다음 캘린더/플랜 요청에서 바로 응답합니다.
+- 끝나는 칸부터 바로 돌려주고, 전체 제한 시간이 지나면 남은 칸은 검색하지 않고 timeout으로 표시합니다.
+  진행 중이던 칸의 검색도 다른 요청이 같은 검색을 기다리지 않으면 함께 멈춥니다 (쿼터 절약).
+"""
+import asyncio
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+STATUS_OK = "ok"
+STATUS_EMPTY = "empty"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+
+
+def build_date_grid(depart_date: date, return_date: date, flex_days: int) -> List[Tuple[date, date]]:
+    """
+    (가는 날, 오는 날) 후보를 요청 날짜에서 가까운 순서로 반환합니다.
+    오는 날이 가는 날보다 앞서는 칸과 과거 출발 칸은 제외합니다.
+    """
+    today = date.today()
+    offsets = range(-flex_days, flex_days + 1)
+    pairs = []
+    for d_off in offsets:
+        for r_off in offsets:
+            depart = depart_date + timedelta(days=d_off)
+            ret = return_date + timedelta(days=r_off)
+            if depart < today or ret < depart:
+                continue
+            pairs.append((abs(d_off) + abs(r_off), depart, ret))
+    pairs.sort(key=lambda p: (p[0], p[1], p[2]))
+    return [(depart, ret) for _, depart, ret in pairs]
+
+
+def _cell(depart: date, ret: date, status: str, flights: Optional[list] = None) -> Dict[str, Any]:
+    cheapest = min(flights, key=lambda f: f["price_krw"]) if flights else None
+    return {
+        "type": "cell",
+        "depart_date": depart.isoformat(),
+        "return_date": ret.isoformat(),
+        "status": status,
+        "price_krw": cheapest["price_krw"] if cheapest else None,
+        "airline": cheapest.get("airline") if cheapest else None,
+        "flight_count": len(flights or []),
+    }
+
+
+async def iter_fare_calendar(
+    agoda_client,
+    origin: str,
+    destination: str,
+    depart_date: date,
+    return_date: date,
+    adults: int = 1,
+    flex_days: int = settings.FARE_CALENDAR_FLEX_DAYS,
+    concurrency: int = settings.FARE_CALENDAR_CONCURRENCY,
+    deadline: float = settings.FARE_CALENDAR_DEADLINE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    운임 캘린더 칸을 끝나는 순서대로 yield 합니다.
+
+    Yields:
+        {"type": "cell", "depart_date", "return_date", "status", "price_krw", "airline", "flight_count"}
+    """
+    pairs = build_date_grid(depart_date, return_date, flex_days)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def search(depart: date, ret: date):
+        async with semaphore:
+            try:
+                flights = await agoda_client.search_flights(
+                    origin, destination, depart.isoformat(), ret.isoformat(), adults
+                )
+            except Exception as e:
+                print(f"[FareCalendar] ❌ {depart} ~ {ret}: {e}")
+                return _cell(depart, ret, STATUS_ERROR)
+        return _cell(depart, ret, STATUS_OK if flights else STATUS_EMPTY, flights)
+
+    # 가까운 날짜부터 생성 → semaphore도 그 순서로 자리를 받음
+    tasks = {asyncio.create_task(search(depart, ret)): (depart, ret) for depart, ret in pairs}
+    loop = asyncio.get_running_loop()
+    cutoff = loop.time() + deadline
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = cutoff - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+        if pending:
+            print(f"[FareCalendar] ⏱️ Deadline reached, {len(pending)} of {len(tasks)} cells skipped")
+        for task in pending:
+            task.cancel()
+            yield _cell(*tasks[task], STATUS_TIMEOUT)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def build_fare_matrix(cells: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    칸 목록을 히트맵용 행렬로 바꿉니다.
+
+    Returns:
+        {
+            "type": "matrix",
+            "depart_dates": [...], "return_dates": [...],
+            "prices": [[가는 날 i, 오는 날 j 의 최저가 또는 None]],
+            "cheapest": 가장 싼 칸 또는 None
+        }
+    """
+    depart_dates = sorted({c["depart_date"] for c in cells})
+    return_dates = sorted({c["return_date"] for c in cells})
+    row = {d: i for i, d in enumerate(depart_dates)}
+    col = {r: j for j, r in enumerate(return_dates)}
+    prices: List[List[Optional[int]]] = [[None] * len(return_dates) for _ in depart_dates]
+    for c in cells:
+        prices[row[c["depart_date"]]][col[c["return_date"]]] = c["price_krw"]
+
+    priced = [c for c in cells if c["price_krw"] is not None]
+    return {
+        "type": "matrix",
+        "depart_dates": depart_dates,
+        "return_dates": return_dates,
+        "prices": prices,
+        "cheapest": min(priced, key=lambda c: c["price_krw"]) if priced else None,
+    }
@@ -0,0 +1,155 @@
+# mcp/mcp_server/services/geo_clustering.py
+"""
+POI를 위경도 기준으로 '하루 단위' 묶음으로 나누는 클러스터링 모듈
+
+일정 생성 전에 POI를 지리적으로 가까운 그룹으로 나눠 두면
+LLM이 하루 안에서 도시 반대편을 오가는 일정을 만드는 일을 줄일 수 있습니다.
+(균형 k-means: k-means++ 초기화 → 용량 제한이 있는 greedy 배정 반복)
+"""
+import math
+from typing import Dict, List
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _has_coords(poi: Dict) -> bool:
+    lat, lng = poi.get("lat"), poi.get("lng")
+    return isinstance(lat, (int, float)) and isinstance(lng, (int, float))
+
+
+def _project(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """위경도를 km 단위 평면 좌표로 변환 (도시 규모에서는 equirectangular 근사로 충분)"""
+    lat0 = math.radians(float(lats.mean()))
+    x = np.radians(lngs) * math.cos(lat0) * EARTH_RADIUS_KM
+    y = np.radians(lats) * EARTH_RADIUS_KM
+    return np.column_stack((x, y))
+
+
+def _kmeans_pp_init(points: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ 방식으로 서로 멀리 떨어진 초기 중심점을 고릅니다."""
+    centers = np.empty((k, 2))
+    centers[0] = points[rng.integers(len(points))]
+    closest_sq = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = closest_sq.sum()
+        if total <= 0:
+            centers[i:] = centers[0]
+            break
+        idx = rng.choice(len(points), p=closest_sq / total)
+        centers[i] = points[idx]
+        closest_sq = np.minimum(closest_sq, ((points - centers[i]) ** 2).sum(axis=1))
+    return centers
+
+
+def _balanced_assign(dist_sq: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    용량 제한이 있는 배정: 미배정 포인트가 가장 가까운 '빈자리 있는' 클러스터를 고르고,
+    넘치는 클러스터는 가까운 포인트만 남긴 뒤 나머지를 다음 라운드로 넘깁니다.
+    라운드마다 최소 하나의 클러스터가 가득 차므로 최대 k 라운드에 끝납니다.
+
+    하루에 POI가 몰리거나 비는 날이 생기지 않도록 클러스터 크기를 capacity 이하로 제한합니다.
+    """
+    n, k = dist_sq.shape
+    labels = np.full(n, -1, dtype=np.int64)
+    counts = np.zeros(k, dtype=np.int64)
+    pending = np.arange(n)
+
+    while pending.size:
+        masked = np.where(counts < capacity, dist_sq[pending], np.inf)
+        choice = masked.argmin(axis=1)
+        # 클러스터별로 거리가 가까운 순서대로 정렬한 뒤, 남은 용량만큼만 받아들임
+        order = np.lexsort((masked[np.arange(pending.size), choice], choice))
+        sorted_choice = choice[order]
+        starts = np.searchsorted(sorted_choice, sorted_choice, side="left")
+        rank = np.arange(order.size) - starts
+        accepted = rank < (capacity - counts[sorted_choice])
+
+        accepted_points = pending[order[accepted]]
+        labels[accepted_points] = sorted_choice[accepted]
+        counts += np.bincount(sorted_choice[accepted], minlength=k)
+        pending = pending[order[~accepted]]
+
+    return labels
+
+
+def cluster_points(
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    k: int,
+    max_iter: int = 20,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    좌표 배열을 크기가 균등한 k개 클러스터로 나눈 라벨 배열을 반환합니다.
+
+    Args:
+        lats, lngs: 위도/경도 배열 (길이 n)
+        k: 클러스터 수 (여행 일수)
+        max_iter: Lloyd 반복 최대 횟수
+        seed: 재현 가능한 결과를 위한 난수 시드
+
+    Returns:
+        np.ndarray: 길이 n의 클러스터 라벨 (0 ~ k-1)
+    """
+    n = len(lats)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    k = max(1, min(k, n))
+    if k == 1:
+        return np.zeros(n, dtype=np.int64)
+
+    points = _project(np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float))
+    rng = np.random.default_rng(seed)
+    centers = _kmeans_pp_init(points, k, rng)
+    capacity = math.ceil(n / k)
+
+    labels = np.full(n, -1, dtype=np.int64)
+    for _ in range(max_iter):
+        dist_sq = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_labels = _balanced_assign(dist_sq, capacity)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums = np.zeros((k, 2))
+        np.add.at(sums, labels, points)
+        counts = np.bincount(labels, minlength=k)[:, None]
+        centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers)
+
+    return labels
+
+
+def cluster_pois_by_day(pois: List[Dict], num_days: int, seed: int = 0) -> List[List[Dict]]:
+    """
+    POI 목록을 여행 일수만큼의 지리적으로 가까운 그룹으로 나눕니다.
+
+    좌표가 없는 POI는 가장 작은 그룹부터 채워 넣습니다.
+    반환되는 그룹은 중심 경도 기준(서→동)으로 정렬되어 있어 결과가 결정적입니다.
+
+    Returns:
+        List[List[Dict]]: 길이 num_days, 각 원소는 해당 일자에 배정된 POI 목록
+    """
+    num_days = max(1, num_days)
+    days: List[List[Dict]] = [[] for _ in range(num_days)]
+    if not pois:
+        return days
+
+    located = [p for p in pois if _has_coords(p)]
+    unlocated = [p for p in pois if not _has_coords(p)]
+
+    if located:
+        lats = np.fromiter((p["lat"] for p in located), dtype=float, count=len(located))
+        lngs = np.fromiter((p["lng"] for p in located), dtype=float, count=len(located))
+        labels = cluster_points(lats, lngs, num_days, seed=seed)
+
+        k = int(labels.max()) + 1
+        centroid_lng = np.bincount(labels, weights=lngs, minlength=k) / np.maximum(np.bincount(labels, minlength=k), 1)
+        day_of_label = {int(label): day for day, label in enumerate(np.argsort(centroid_lng, kind="stable"))}
+        for poi, label in zip(located, labels):
+            days[day_of_label[int(label)]].append(poi)
+
+    for poi in unlocated:
+        min(days, key=len).append(poi)
+
+    return days
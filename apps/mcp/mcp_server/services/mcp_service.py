@@ -5,6 +5,7 @@ import json
 import os
 import random
 import httpx
+from collections import deque
 from datetime import date, datetime, timedelta
 from typing import Dict, Any, List
 import google.generativeai as genai
@@ -13,6 +14,19 @@ from ..clients.poi_client import PoiClient
 from ..clients.weather_client import WeatherClient
 from ..clients.agoda_client import AgodaClient
 from ..config import settings
+from .geo_clustering import cluster_pois_by_day
+from .route_optimizer import optimize_day_route
+from .spatial_index import SpatialIndex, rank_hotels_by_poi_centroid
+from ..resilience import GEMINI_BREAKER, GEMINI_RETRY, GEMINI_RETRY_ON, call_sync
+
+# 일정 후처리(POI 부착)용 키워드 패턴 — 모듈 로드 시 한 번만 컴파일
+SKIP_EVENT_PATTERN = re.compile(r'도착|이동|알림')
+DINING_EVENT_PATTERN = re.compile(r'식사|맛집|점심|저녁')
+DINING_CATEGORY_PATTERN = re.compile(r'식당|맛집|음식점|카페|restaurant|cafe')
+DINING_ICONS = {'utensils', 'coffee'}
+SKIP_ICONS = {'home', 'plane'}
+# 식사 이벤트: 직전 장소에서 가까운 식당 후보 수 (이미 쓴 곳은 건너뜀)
+NEARBY_DINING_K = 5
 
 class MCPService:
     def __init__(self):
@@ -177,8 +191,8 @@ class MCPService:
         if secondary_guides:
             style_guide += "\n\n## 보조 스타일 가이드 (참고)\n" + "\n\n".join(secondary_guides)
         
-        # 2. POI 필터링 (평점 3.5 이상) + 셔플로 매번 다른 POI 노출
-        high_rated_pois = [p for p in poi_list if p.get('rating', 0) >= 3.5]
+        # 2. POI 필터링 (평점 3.5 이상, 평점 없는 카탈로그 POI는 rating=None) + 셔플로 매번 다른 POI 노출
+        high_rated_pois = [p for p in poi_list if (p.get('rating') or 0) >= 3.5]
         random.shuffle(high_rated_pois)
 
         # 3. POI 카테고리별 분류 (poi_client가 저장하는 실제 category 값 기준)
@@ -217,11 +231,23 @@ class MCPService:
                 items += lst[:per_day - len(items)]
             return items
 
+        # 지리적으로 가까운 POI끼리 하루 묶음을 먼저 만들고 (도시 반대편 왕복 방지)
+        # 묶음 안에서 카테고리별로 고른 뒤, 모자라면 전체 목록에서 보충
+        day_clusters = cluster_pois_by_day(high_rated_pois, num_days)
+
+        def _pick_for_day(cluster, category_list, day_idx, per_day):
+            category_ids = {id(p) for p in category_list}
+            items = [p for p in cluster if id(p) in category_ids][:per_day]
+            if len(items) < per_day:
+                picked_ids = {id(p) for p in items}
+                items += [p for p in _slice_for_day(category_list, day_idx, per_day) if id(p) not in picked_ids][:per_day - len(items)]
+            return items
+
         days_poi_sections = []
         for d in range(num_days):
-            day_restaurants = _slice_for_day(restaurants, d, 2)
-            day_cafes       = _slice_for_day(cafes, d, 1)
-            day_attractions = _slice_for_day(attractions, d, 3)
+            day_restaurants = _pick_for_day(day_clusters[d], restaurants, d, 2)
+            day_cafes       = _pick_for_day(day_clusters[d], cafes, d, 1)
+            day_attractions = _pick_for_day(day_clusters[d], attractions, d, 3)
             days_poi_sections.append(
                 f"### {d+1}일차 배정 장소\n"
                 f"관광: {', '.join(a.get('name','') for a in day_attractions)}\n"
@@ -275,9 +301,13 @@ class MCPService:
         
         # 5. LLM 호출 (동기 함수이므로 결과 반환)
         try:
-            response = self.llm_model.generate_content(
-                prompt,
-                generation_config={"response_mime_type": "application/json"}
+            response = call_sync(
+                GEMINI_BREAKER, GEMINI_RETRY,
+                lambda: self.llm_model.generate_content(
+                    prompt,
+                    generation_config={"response_mime_type": "application/json"}
+                ),
+                retry_on=GEMINI_RETRY_ON
             )
             result_text = response.text.strip()
 
@@ -335,6 +365,14 @@ class MCPService:
         return schedule
 
     def _enrich_schedule_with_pois(self, schedule: List[Any], pois: List[Dict]) -> List[Any]:
+        """
+        일정 이벤트에 실제 POI(장소명/좌표)를 붙입니다.
+
+        - LLM이 지정한 poi_name이 POI 목록에 있으면 해당 POI를 그대로 사용
+        - 없으면 식사/관광 후보를 번갈아(rotation) 배정
+        - 식사 이벤트는 같은 날 직전 장소(예: 오전 관광지)에서 가장 가까운, 아직 안 쓴 식당을 우선 배정
+        모든 분류는 한 번씩만 계산하고 rotation은 deque로 O(1)에 처리합니다.
+        """
         print(f"[DEBUG] _enrich_schedule_with_pois Called. POIs Count: {len(pois)}")
         if not schedule: return schedule
         
@@ -342,53 +380,99 @@ class MCPService:
             print("[DEBUG] ⚠️ No POIs found! Enrichment skipped.")
             return schedule
 
-        dining_pois = [p for p in pois if any(x in p.get('category','').lower() for x in ['식당','맛집','카페','restaurant','cafe'])]
-        tourist_pois = [p for p in pois if p not in dining_pois]
+        # 카테고리 분류는 POI당 한 번 (dict 비교 없는 단일 패스)
+        dining_pois, tourist_pois = deque(), deque()
+        for p in pois:
+            if DINING_CATEGORY_PATTERN.search(p.get('category', '').lower()):
+                dining_pois.append(p)
+            else:
+                tourist_pois.append(p)
+        poi_by_name = {p['name']: p for p in pois if p.get('name')}
+        
+        dining_index = SpatialIndex(dining_pois)
+        dining_ids = {id(p) for p in dining_pois}
+        used_dining = set()
         
         print(f"[DEBUG] Dining POIs: {len(dining_pois)}, Tourist POIs: {len(tourist_pois)}")
 
+        def _next(candidates: deque):
+            selected = candidates[0]
+            candidates.rotate(-1)
+            return selected
+
         enriched_count = 0
         for day in schedule:
             events = self._get_safe_value(day, 'events', [])
+            last_coords = None  # 같은 날 직전에 배정된 장소 좌표
             for event in events:
                 is_dict = isinstance(event, dict)
-                desc = (event.get('description') if is_dict else getattr(event, 'description', '')).lower()
-                icon = (event.get('icon') if is_dict else getattr(event, 'icon', '')).lower()
+                desc = (event.get('description') if is_dict else getattr(event, 'description', '')) or ''
+                icon = ((event.get('icon') if is_dict else getattr(event, 'icon', '')) or '').lower()
+                desc_lower = desc.lower()
                 
-                if '도착' in desc or '이동' in desc or '알림' in desc: continue
-
-                selected = None
-                if '식사' in desc or '맛집' in desc or '점심' in desc or '저녁' in desc or icon in ['utensils', 'coffee']:
-                    if dining_pois:
-                        selected = dining_pois.pop(0)
-                        dining_pois.append(selected)
-                else:
-                    if tourist_pois:
-                        selected = tourist_pois.pop(0)
-                        tourist_pois.append(selected)
+                if icon in SKIP_ICONS or SKIP_EVENT_PATTERN.search(desc_lower): continue
+
+                # 1. LLM이 배정한 장소가 POI 목록에 있으면 그대로 사용
+                selected = poi_by_name.get(event.get('poi_name') if is_dict else getattr(event, 'poi_name', None))
+                new_desc = desc
+
+                # 2. 없으면 이벤트 성격에 맞는 후보를 순환 배정
+                if not selected:
+                    if DINING_EVENT_PATTERN.search(desc_lower) or icon in DINING_ICONS:
+                        if last_coords and len(dining_index):
+                            nearby = dining_index.nearest(*last_coords, k=NEARBY_DINING_K)
+                            selected = next((p for p, _ in nearby if p['name'] not in used_dining), None)
+                        if not selected and dining_pois:
+                            selected = _next(dining_pois)
+                    elif tourist_pois:
+                        selected = _next(tourist_pois)
                     elif dining_pois:
-                        selected = dining_pois.pop(0)
-                        dining_pois.append(selected)
+                        selected = _next(dining_pois)
+                    if selected:
+                        new_desc = f"{selected.get('category', '명소')} - {desc}"
 
                 if selected:
                     enriched_count += 1
-                    new_name = selected['name']
-                    new_desc = f"{selected.get('category', '명소')} - {desc}"
-                    
-                    if is_dict:
-                        event['place_name'] = new_name
-                        event['description'] = new_desc
-                        event['latitude'] = selected.get('lat')
-                        event['longitude'] = selected.get('lng')
-                    else:
-                        setattr(event, 'place_name', new_name)
-                        setattr(event, 'description', new_desc)
-                        setattr(event, 'latitude', selected.get('lat'))
-                        setattr(event, 'longitude', selected.get('lng'))
+                    if id(selected) in dining_ids:
+                        used_dining.add(selected['name'])
+                    if isinstance(selected.get('lat'), (int, float)) and isinstance(selected.get('lng'), (int, float)):
+                        last_coords = (selected['lat'], selected['lng'])
+                    updates = {
+                        'poi_name': selected['name'],
+                        'place_name': selected['name'],
+                        'description': new_desc,
+                        'latitude': selected.get('lat'),
+                        'longitude': selected.get('lng'),
+                    }
+                    for key, value in updates.items():
+                        if is_dict: event[key] = value
+                        else: setattr(event, key, value)
         
         print(f"[DEBUG] Total Enriched Events: {enriched_count}")
         return schedule
 
+    def _known_coordinates(self, destination: str) -> Dict[str, float] | None:
+        """
+        요청 시작 시점에 이미 알고 있는 목적지 좌표 (POI 카탈로그 중심점, 좌표 배열만 읽음).
+        날씨 조회에 넘기면 geocoding 왕복 없이 바로 예보를 요청합니다.
+        """
+        center = self.poi_client.catalog.centroid(destination)
+        return {"lat": center[0], "lon": center[1]} if center else None
+
+    def _optimize_schedule_routes(self, schedule: List[Any]) -> List[Any]:
+        """
+        일자별 이벤트를 가까운 순서로 재배치하고 이동 시간(분)을 추가합니다.
+        좌표는 _enrich_schedule_with_pois 단계에서 채워집니다. (네트워크 호출 없음)
+        """
+        if not schedule:
+            return schedule
+
+        for day in schedule:
+            if isinstance(day, dict):
+                day['events'] = optimize_day_route(day.get('events') or [])
+
+        return schedule
+
     async def generate_trip_data(self, llm_parsed_data: dict) -> dict:
         """
         MCP 서버의 핵심 로직: 항공, 호텔, POI, 날씨, 일정을 종합적으로 생성
@@ -478,29 +562,39 @@ class MCPService:
         
         # 병렬 호출
         try:
-            # ✅ 항공편을 위한 IATA 코드 변환
-            async with httpx.AsyncClient(timeout=30.0) as iata_client:
-                dest_iata = await self.agoda_client._get_iata_code(iata_client, dest)
+            # 여행 기간/스타일에 맞춰 POI 후보 풀 크기를 정함
+            num_days = (e_date - s_date).days + 1
+
+            # 목적지 좌표를 이미 알면 날씨 조회의 geocoding 단계를 건너뜀
+            weather_coords = self._known_coordinates(dest)
+
+            # ✅ 항공편을 위한 IATA 코드 변환 (RapidAPI 속도 제한이 걸린 공유 클라이언트 사용)
+            #    출발지는 공항 후보 목록으로 변환 (예: 서울 → ICN, GMP)
+            dest_iata, origin_airports = await asyncio.gather(
+                self.agoda_client._get_iata_code(self.agoda_client._get_http_client(), dest),
+                self.agoda_client.resolve_origin_airports(origin)
+            )
             
             # IATA 코드가 없으면 항공편 검색 스킵
             if not dest_iata:
                 print(f"[MCP] ⚠️ Could not find IATA code for '{dest}', skipping flights")
                 results = await asyncio.gather(
-                    self.poi_client.search_pois(dest, is_domestic),
-                    self.weather_client.get_weather_forecast(dest, s_date, e_date),
+                    self.poi_client.search_pois(dest, is_domestic, num_days=num_days, travel_style=travel_style),
+                    self.weather_client.get_weather_forecast(dest, s_date, e_date, coords=weather_coords),
                     asyncio.sleep(0),  # 빈 슬롯 (항공편 대신)
                     self.agoda_client.search_hotels(dest, s_date.isoformat(), e_date.isoformat(), pax),
                     return_exceptions=True
                 )
             else:
-                print(f"[MCP] ✅ IATA code for '{dest}': {dest_iata}")
+                print(f"[MCP] ✅ IATA code for '{dest}': {dest_iata}, origins: {origin_airports}")
                 results = await asyncio.gather(
-                    self.poi_client.search_pois(dest, is_domestic),
-                    self.weather_client.get_weather_forecast(dest, s_date, e_date),
-                    # ✅ 동기 함수를 asyncio.to_thread로 감싸서 호출
-                    asyncio.to_thread(
-                        self.agoda_client.search_flights,
-                        "ICN", dest_iata, s_date.isoformat(), e_date.isoformat(), pax
+                    self.poi_client.search_pois(dest, is_domestic, num_days=num_days, travel_style=travel_style),
+                    self.weather_client.get_weather_forecast(dest, s_date, e_date, coords=weather_coords),
+                    # ✅ 비동기 polling (스레드 점유 없음)
+                    # 상위 후보 수만큼 모이면 Agoda 검색 완료 전이라도 먼저 반환 (검색은 뒤에서 끝까지 진행해 캐시)
+                    self.agoda_client.search_flights_from_airports(
+                        origin_airports, dest_iata, s_date.isoformat(), e_date.isoformat(), pax,
+                        min_results=self.agoda_client.FLIGHT_TOP_N
                     ),
                     self.agoda_client.search_hotels(dest, s_date, e_date, pax),
                     return_exceptions=True
@@ -508,7 +602,7 @@ class MCPService:
             
             poi_data = results[0] if not isinstance(results[0], Exception) else []
             weather_data = results[1] if not isinstance(results[1], Exception) else {}
-            flight_data = results[2] if not isinstance(results[2], Exception) else []
+            flight_data = results[2] if isinstance(results[2], list) else []  # IATA가 없으면 빈 슬롯(None)
             hotel_data = results[3] if not isinstance(results[3], Exception) else []
             
             # POI normalize
@@ -532,6 +626,10 @@ class MCPService:
             except asyncio.TimeoutError:
                 print("[MCP] ⚠️ Schedule generation timed out, using default schedule")
                 raw_schedule = self._generate_default_schedule(s_date, e_date)
+
+            # ✅ 일정 후처리: POI 정보 부착 → 일자별 동선 최적화 (로컬 하버사인 거리 기반)
+            raw_schedule = self._enrich_schedule_with_pois(raw_schedule, norm_pois)
+            raw_schedule = self._optimize_schedule_routes(raw_schedule)
             
             # ✅ 날씨를 날짜별로 매핑
             weather_by_date = {}
@@ -546,20 +644,13 @@ class MCPService:
                             "description": day_weather.get("description")
                         }
             
-            # 항공편 데이터 정리 (✅ 시간 정보 유지)
-            final_flight_list = []
-            for f in flight_data:
-                f_clean = f.copy()
-                # 시간 필드 유지
-                # outbound_departure_time, outbound_arrival_time
-                # inbound_departure_time, inbound_arrival_time
-                final_flight_list.append(f_clean)
-            
-            # 호텔 데이터 정리
-            final_hotel_list = []
-            for h in hotel_data:
-                h_clean = h.copy()
-                final_hotel_list.append(h_clean)
+            # 항공편(시간 정보 포함)/호텔 목록은 클라이언트가 새로 만든 dict이므로 복사 없이 그대로 사용
+            final_flight_list = list(flight_data)
+            # POI가 모인 곳(중심점)에 가까운 호텔이 앞에 오도록 순위 보정 (공간 인덱스, 네트워크 호출 없음)
+            final_hotel_list = rank_hotels_by_poi_centroid(list(hotel_data), norm_pois)
+
+            # 상위 호텔 상세 정보는 응답을 기다리게 하지 않고 백그라운드에서 캐시에 채움
+            self.agoda_client.prefetch_hotel_details(final_hotel_list, s_date, e_date, pax)
             
             # ✅ 최종 응답 데이터
             response_data = {
@@ -0,0 +1,110 @@
+# mcp/mcp_server/services/poi_dedup.py
+"""
+POI 중복 제거 (카테고리/제공자 검색 결과 통합용)
+
+'관광명소/맛집/카페' 검색 결과에는 같은 장소가 표기만 조금 다르게(띄어쓰기, 괄호, '본점' 등) 여러 번 나오고,
+반대로 이름이 같은 다른 지점(체인점 등)도 섞여 있습니다.
+
+- 좌표를 반경 크기의 격자 칸에 넣고, 주변 3×3 칸 안에서 반경 이내에 있는 POI끼리만 이름을 비교합니다
+  (전체 쌍 비교 없이 거의 선형 시간).
+- 이름은 정규화(NFKC, 소문자, 괄호 내용/공백/기호/흔한 접미어 제거) 후 같거나 한쪽이 다른 쪽을 포함하면 같은 장소로 봅니다.
+- 이름이 같아도 반경 밖이면 다른 장소로 남깁니다.
+- 좌표가 없는 POI는 정규화한 이름이 이미 나온 적 있으면 버립니다.
+
+먼저 나온 POI를 남기고, 비어 있는 값(별점, 주소)만 나중 POI 값으로 채웁니다.
+"""
+import math
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# 같은 장소로 보는 최대 거리(m) = 격자 칸 크기
+DEDUP_RADIUS_M = 150.0
+METERS_PER_DEGREE = 111_320.0
+
+# 포함 관계로 같은 장소를 판단할 때 짧은 쪽 이름의 최소 길이 (너무 짧은 이름은 완전 일치만)
+MIN_CONTAINED_NAME = 3
+
+_BRACKETS = re.compile(r"[\(\[\{（【].*?[\)\]\}）】]")
+_NON_WORD = re.compile(r"[\W_]+")
+_SUFFIXES = ("본점", "본관", "공식", "official")
+
+
+def normalize_poi_name(name: Optional[str]) -> str:
+    """비교용 이름: NFKC + 소문자 + 괄호 내용/공백/기호 제거 + 흔한 접미어 제거"""
+    text = unicodedata.normalize("NFKC", name or "").lower()
+    text = _NON_WORD.sub("", _BRACKETS.sub("", text))
+    for suffix in _SUFFIXES:
+        if text.endswith(suffix) and len(text) > len(suffix):
+            text = text[:-len(suffix)]
+    return text
+
+
+def _same_name(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    return len(shorter) >= MIN_CONTAINED_NAME and shorter in longer
+
+
+def _coords(poi: Dict) -> Optional[Tuple[float, float]]:
+    lat, lng = poi.get("lat"), poi.get("lng")
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+def _merge_into(kept: Dict, duplicate: Dict) -> None:
+    if not kept.get("rating") and duplicate.get("rating"):
+        kept["rating"] = duplicate["rating"]
+    if not kept.get("vicinity") and duplicate.get("vicinity"):
+        kept["vicinity"] = duplicate["vicinity"]
+
+
+def dedupe_pois(pois: List[Dict], radius_m: float = DEDUP_RADIUS_M) -> List[Dict]:
+    """
+    같은 장소로 보이는 POI를 하나로 합친 목록을 원래 순서대로 반환합니다.
+
+    Args:
+        pois: POI 목록 (name, lat, lng, rating, vicinity ...)
+        radius_m: 같은 장소로 볼 최대 거리(m)
+    """
+    located = [c for p in pois if (c := _coords(p)) is not None]
+    cos_lat0 = math.cos(math.radians(sum(lat for lat, _ in located) / len(located))) if located else 1.0
+
+    kept: List[Dict] = []
+    kept_names: List[str] = []
+    kept_xy: List[Tuple[float, float]] = []
+    grid: Dict[Tuple[int, int], List[int]] = {}
+    seen_names = set()
+
+    for poi in pois:
+        name = normalize_poi_name(poi.get("name"))
+        if not name:
+            continue
+        coords = _coords(poi)
+
+        if coords is None:
+            if name in seen_names:
+                continue
+        else:
+            x = coords[1] * cos_lat0 * METERS_PER_DEGREE
+            y = coords[0] * METERS_PER_DEGREE
+            cx, cy = math.floor(x / radius_m), math.floor(y / radius_m)
+            duplicate = next((
+                j
+                for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                for j in grid.get((cx + dx, cy + dy), ())
+                if math.hypot(x - kept_xy[j][0], y - kept_xy[j][1]) <= radius_m and _same_name(name, kept_names[j])
+            ), None)
+            if duplicate is not None:
+                _merge_into(kept[duplicate], poi)
+                continue
+            grid.setdefault((cx, cy), []).append(len(kept))
+
+        kept.append(poi)
+        kept_names.append(name)
+        kept_xy.append((x, y) if coords is not None else (math.nan, math.nan))
+        seen_names.add(name)
+
+    return kept
@@ -0,0 +1,119 @@
+# mcp/mcp_server/services/response_formatter.py
+"""
+/plan/generate 응답 포맷팅 (v1 / v2), 필드 선택, 직렬화 및 압축
+
+v1: 기존 응답 그대로 (하위 호환)
+v2: 중복 제거 버전
+    - flight_quote / hotel_quote → candidates 배열의 인덱스 (flight_quote_index, hotel_quote_index)
+    - weather_info → weather_by_date 에 일별 상세값을 합치고 weather_location 만 남김
+    - POI의 latitude/longitude 별칭 제거 (lat/lng 만 유지)
+"""
+import gzip
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 협상
+    brotli = None
+
+SUPPORTED_FORMATS = ("v1", "v2")
+
+# 이 크기보다 작은 응답은 압축 이득보다 CPU 비용이 커서 그대로 보냄
+MIN_COMPRESS_BYTES = 1024
+
+POI_ALIAS_KEYS = ("latitude", "longitude")
+
+
+def _quote_index(candidates: list, quote: Any) -> Optional[int]:
+    """quote가 candidates 중 몇 번째 항목인지 반환 (없으면 None)"""
+    if not quote:
+        return None
+    for i, candidate in enumerate(candidates):
+        if candidate is quote or candidate == quote:
+            return i
+    return None
+
+
+def to_v2(data: Dict[str, Any]) -> Dict[str, Any]:
+    """v1 응답 데이터를 중복 없는 v2 구조로 변환합니다."""
+    flights = data.get("flight_candidates") or []
+    hotels = data.get("hotel_candidates") or []
+    weather_info = data.get("weather_info") or {}
+
+    weather_by_date = {}
+    for day in weather_info.get("daily") or []:
+        if day.get("date"):
+            weather_by_date[day["date"]] = {k: v for k, v in day.items() if k != "date"}
+    for date_key, summary in (data.get("weather_by_date") or {}).items():
+        weather_by_date.setdefault(date_key, summary)
+
+    v2 = {k: v for k, v in data.items() if k not in ("flight_quote", "hotel_quote", "weather_info", "weather_by_date", "poi_list")}
+    v2.update({
+        "format": "v2",
+        "flight_quote_index": _quote_index(flights, data.get("flight_quote")),
+        "hotel_quote_index": _quote_index(hotels, data.get("hotel_quote")),
+        "weather_location": weather_info.get("location"),
+        "weather_by_date": weather_by_date,
+        "poi_list": [
+            {k: v for k, v in poi.items() if k not in POI_ALIAS_KEYS}
+            for poi in data.get("poi_list") or []
+        ],
+    })
+    return v2
+
+
+def select_fields(data: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """요청한 최상위 필드만 남깁니다. fields가 비어 있으면 전체를 반환합니다."""
+    wanted = [f.strip() for f in fields or [] if f and f.strip()]
+    if not wanted:
+        return data
+    return {k: data[k] for k in wanted if k in data}
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON 직렬화 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더를 {인코딩: q값} 으로 파싱합니다."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.lower()] = q
+    return accepted
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """
+    클라이언트가 허용한 인코딩으로 응답 본문을 압축합니다.
+
+    Returns:
+        (본문, Content-Encoding 값 또는 None)
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return brotli.compress(body, quality=5), "br"
+    if accepted.get("gzip", 0) > 0:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
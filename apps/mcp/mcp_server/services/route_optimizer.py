@@ -0,0 +1,150 @@
+# mcp/mcp_server/services/route_optimizer.py
+"""
+하루 일정의 이벤트를 가까운 순서로 재배치하는 로컬 경로 최적화 모듈
+
+Google Distance Matrix 대신 NumPy 하버사인 거리 행렬을 사용하므로 네트워크 호출이 없습니다.
+식사 이벤트(점심/저녁 등)는 시간대를 지켜야 하므로 고정 앵커로 두고,
+앵커 사이의 구간만 nearest-neighbour + 2-opt 로 순서를 바꿉니다.
+"""
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 도심 이동 추정치: 직선거리 대비 실제 경로 보정 계수, 평균 이동 속도(대중교통/택시 혼합)
+DETOUR_FACTOR = 1.3
+AVERAGE_SPEED_KMH = 20.0
+
+MEAL_ICONS = {"utensils"}
+MEAL_KEYWORDS = re.compile(r"아침|점심|저녁|식사|브런치|breakfast|lunch|dinner")
+
+
+def haversine_matrix(lats, lngs) -> np.ndarray:
+    """위경도 배열로부터 n x n 하버사인 거리 행렬(km)을 계산합니다."""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lng = np.radians(np.asarray(lngs, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def estimate_travel_minutes(distance_km: float) -> int:
+    """직선거리(km)를 예상 이동 시간(분)으로 환산합니다."""
+    return int(round(distance_km * DETOUR_FACTOR / AVERAGE_SPEED_KMH * 60))
+
+
+def _coords(event: Dict) -> Optional[tuple]:
+    lat, lng = event.get("latitude"), event.get("longitude")
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+def _is_anchor(event: Dict) -> bool:
+    """식사 이벤트와 좌표가 없는 이벤트(도착/알림 등)는 위치를 고정합니다."""
+    if _coords(event) is None:
+        return True
+    if str(event.get("icon", "")).lower() in MEAL_ICONS:
+        return True
+    return bool(MEAL_KEYWORDS.search(str(event.get("description", "")).lower()))
+
+
+def order_segment(dist: np.ndarray, inner: List[int], start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+    """
+    고정된 시작/끝 지점 사이에서 inner 노드들의 방문 순서를 정합니다.
+
+    Args:
+        dist: 거리 행렬
+        inner: 순서를 바꿀 노드 인덱스
+        start, end: 고정 앵커 인덱스 (없으면 열린 경로)
+
+    Returns:
+        List[int]: 재정렬된 inner 노드 인덱스
+    """
+    if len(inner) < 2:
+        return list(inner)
+
+    # 앵커가 없는 쪽은 모든 노드와 거리 0인 가상 노드로 처리 (열린 경로)
+    n = dist.shape[0]
+    virtual = n
+    full = np.zeros((n + 1, n + 1))
+    full[:n, :n] = dist
+    head = start if start is not None else virtual
+    tail = end if end is not None else virtual
+
+    # 1. nearest-neighbour 초기 경로
+    remaining = list(inner)
+    path = [head]
+    while remaining:
+        last = path[-1]
+        nxt = min(remaining, key=lambda j: full[last, j])
+        path.append(nxt)
+        remaining.remove(nxt)
+    path.append(tail)
+
+    # 2. 2-opt 개선 (양 끝 앵커는 고정)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(path) - 2):
+            for j in range(i + 1, len(path) - 1):
+                a, b, c, d = path[i - 1], path[i], path[j], path[j + 1]
+                if full[a, c] + full[b, d] < full[a, b] + full[c, d] - 1e-9:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+
+    return path[1:-1]
+
+
+def optimize_day_route(events: List[Dict]) -> List[Dict]:
+    """
+    하루 이벤트 목록을 근접 순서로 재배치하고 이동 정보(분/km)를 추가합니다.
+
+    - 식사 이벤트와 좌표 없는 이벤트는 원래 위치에 고정됩니다.
+    - time_slot은 '자리'에 남고, 이벤트 내용만 이동합니다 (시간표 형태 유지).
+    - 좌표가 있는 이전 이벤트와의 거리로 travel_km_from_prev / travel_minutes_from_prev를 기록합니다.
+    """
+    if not events or not all(isinstance(e, dict) for e in events):
+        return events
+
+    located = [i for i, e in enumerate(events) if _coords(e) is not None]
+    if not located:
+        return events
+
+    index_of = {pos: k for k, pos in enumerate(located)}
+    coords = np.array([_coords(events[i]) for i in located])
+    dist = haversine_matrix(coords[:, 0], coords[:, 1])
+
+    ordered = list(events)
+    anchors = [i for i, e in enumerate(events) if _is_anchor(e)]
+    bounds = [-1] + anchors + [len(events)]
+    for left, right in zip(bounds, bounds[1:]):
+        segment = list(range(left + 1, right))
+        if len(segment) < 2:
+            continue
+        start = index_of.get(left) if left >= 0 else None
+        end = index_of.get(right) if right < len(events) else None
+        new_order = order_segment(dist, [index_of[i] for i in segment], start, end)
+        moved = [events[located[k]] for k in new_order]
+        slots = [events[i].get("time_slot") for i in segment]
+        for pos, event, slot in zip(segment, moved, slots):
+            if slot is not None:
+                event["time_slot"] = slot
+            ordered[pos] = event
+
+    node_of = {id(events[pos]): k for pos, k in index_of.items()}
+    prev = None
+    for event in ordered:
+        here = node_of.get(id(event))
+        if here is None:
+            continue
+        if prev is not None:
+            km = float(dist[prev, here])
+            event["travel_km_from_prev"] = round(km, 2)
+            event["travel_minutes_from_prev"] = estimate_travel_minutes(km)
+        prev = here
+
+    return ordered
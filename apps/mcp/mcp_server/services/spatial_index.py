@@ -0,0 +1,182 @@
+# mcp/mcp_server/services/spatial_index.py
+"""
+일정 한 건의 POI/호텔 좌표에 대한 메모리 공간 인덱스 (NumPy 격자)
+
+- 위경도를 km 평면 좌표로 바꾼 뒤 cell_km 크기의 격자 칸에 나눠 담습니다.
+- 반경 검색은 반경이 닿는 칸만, k-최근접 검색은 질의 지점에서 가까운 칸(체비셰프 거리 순)부터
+  훑다가 k번째 거리가 아직 보지 않은 칸까지의 최소 거리보다 짧아지면 멈춥니다.
+- 지점이 적으면 격자 대신 전체를 한 번에 계산하는 편이 빠르므로 그대로 전수 계산합니다.
+
+도시 규모에서는 equirectangular 근사로 충분하므로 거리는 평면 거리(km)입니다.
+좌표가 없는 항목은 인덱스에서 빠집니다.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .geo_clustering import EARTH_RADIUS_KM
+
+# 이 개수 이하이면 격자 탐색 없이 전수 계산
+BRUTE_FORCE_MAX = 64
+
+
+def _coord(item: Dict, lat_key: str, lng_key: str) -> Optional[Tuple[float, float]]:
+    lat, lng = item.get(lat_key), item.get(lng_key)
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+class SpatialIndex:
+    """k-최근접/반경 검색용 격자 인덱스"""
+
+    def __init__(self, items: Sequence[Dict], lat_key: str = "lat", lng_key: str = "lng", cell_km: float = 1.0):
+        """
+        Args:
+            items: 좌표를 가진 dict 목록 (POI는 lat/lng, 호텔은 latitude/longitude)
+            lat_key, lng_key: 좌표 키
+            cell_km: 격자 칸 한 변 길이(km)
+        """
+        located = [(item, c) for item in items if (c := _coord(item, lat_key, lng_key)) is not None]
+        self.items: List[Dict] = [item for item, _ in located]
+        self.cell_km = cell_km
+        n = len(located)
+        lats = np.fromiter((c[0] for _, c in located), dtype=float, count=n)
+        lngs = np.fromiter((c[1] for _, c in located), dtype=float, count=n)
+        self._cos_lat0 = math.cos(math.radians(float(lats.mean()))) if n else 1.0
+        self._points = self._project(lats, lngs)
+
+        # 칸 번호 순으로 정렬해 두고 칸마다 [시작, 끝) 구간만 기억
+        cells = np.floor(self._points / cell_km).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0])) if n else np.empty(0, dtype=np.int64)
+        self._order = order
+        sorted_cells = cells[order]
+        if n:
+            boundary = np.flatnonzero(np.any(np.diff(sorted_cells, axis=0) != 0, axis=1)) + 1
+            starts = np.concatenate(([0], boundary))
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        self._cell_keys = sorted_cells[starts]            # (m, 2) 점이 있는 칸
+        self._cell_starts = starts
+        self._cell_ends = np.append(starts[1:], n).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _project(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        x = np.radians(lngs) * self._cos_lat0 * EARTH_RADIUS_KM
+        y = np.radians(lats) * EARTH_RADIUS_KM
+        return np.column_stack((x, y))
+
+    def _query_point(self, lat: float, lng: float) -> np.ndarray:
+        return self._project(np.array([lat], dtype=float), np.array([lng], dtype=float))[0]
+
+    def _points_in_cells(self, cell_idx: np.ndarray) -> np.ndarray:
+        if cell_idx.size == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([
+            self._order[self._cell_starts[i]:self._cell_ends[i]] for i in cell_idx
+        ])
+
+    def _results(self, idx: np.ndarray, dist: np.ndarray) -> List[Tuple[Dict, float]]:
+        ranked = np.argsort(dist, kind="stable")
+        return [(self.items[int(idx[i])], float(dist[i])) for i in ranked]
+
+    def distances_from(self, lat: float, lng: float) -> np.ndarray:
+        """모든 항목까지의 거리(km), items 순서"""
+        if not self.items:
+            return np.empty(0)
+        return np.hypot(*(self._points - self._query_point(lat, lng)).T)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[Dict, float]]:
+        """반경 radius_km 안의 항목을 가까운 순서로 (항목, 거리km) 목록으로 반환합니다."""
+        if not self.items:
+            return []
+        q = self._query_point(lat, lng)
+        if len(self.items) <= BRUTE_FORCE_MAX:
+            idx = np.arange(len(self.items))
+        else:
+            reach = math.ceil(radius_km / self.cell_km)
+            cell = np.floor(q / self.cell_km).astype(np.int64)
+            cheb = np.abs(self._cell_keys - cell).max(axis=1)
+            idx = self._points_in_cells(np.flatnonzero(cheb <= reach))
+        dist = np.hypot(*(self._points[idx] - q).T)
+        keep = dist <= radius_km
+        return self._results(idx[keep], dist[keep])
+
+    def nearest(self, lat: float, lng: float, k: int = 1, max_km: Optional[float] = None) -> List[Tuple[Dict, float]]:
+        """가장 가까운 k개를 가까운 순서로 (항목, 거리km) 목록으로 반환합니다."""
+        n = len(self.items)
+        if n == 0 or k <= 0:
+            return []
+        k = min(k, n)
+        q = self._query_point(lat, lng)
+
+        if n <= BRUTE_FORCE_MAX:
+            idx = np.arange(n)
+            dist = np.hypot(*(self._points - q).T)
+        else:
+            cell = np.floor(q / self.cell_km).astype(np.int64)
+            cheb = np.abs(self._cell_keys - cell).max(axis=1)
+            by_ring = np.argsort(cheb, kind="stable")
+            rings = cheb[by_ring]
+            idx = np.empty(0, dtype=np.int64)
+            dist = np.empty(0)
+            pos = 0
+            while pos < rings.size:
+                ring = rings[pos]
+                end = int(np.searchsorted(rings, ring, side="right"))
+                new_idx = self._points_in_cells(by_ring[pos:end])
+                idx = np.concatenate((idx, new_idx))
+                dist = np.concatenate((dist, np.hypot(*(self._points[new_idx] - q).T)))
+                pos = end
+                # 체비셰프 거리 ring 이하 칸을 모두 봤으면 ring × cell_km 이내의 점은 모두 찾은 것
+                if dist.size >= k and np.partition(dist, k - 1)[k - 1] <= ring * self.cell_km:
+                    break
+
+        if max_km is not None:
+            keep = dist <= max_km
+            idx, dist = idx[keep], dist[keep]
+        if dist.size > k:
+            top = np.argpartition(dist, k - 1)[:k]
+            idx, dist = idx[top], dist[top]
+        return self._results(idx, dist)
+
+
+def centroid(items: Sequence[Dict], lat_key: str = "lat", lng_key: str = "lng") -> Optional[Tuple[float, float]]:
+    """좌표가 있는 항목들의 중심 (위도, 경도). 좌표가 하나도 없으면 None"""
+    coords = [c for item in items if (c := _coord(item, lat_key, lng_key)) is not None]
+    if not coords:
+        return None
+    arr = np.asarray(coords, dtype=float)
+    return float(arr[:, 0].mean()), float(arr[:, 1].mean())
+
+
+def rank_hotels_by_poi_centroid(hotels: List[Dict], pois: Sequence[Dict], weight: float = 0.3) -> List[Dict]:
+    """
+    POI 중심점까지의 거리를 반영해 호텔 순서를 다시 매깁니다.
+    점수 = (1 - weight) × 기존 순위 점수 + weight × (1 - 거리 / 후보 중 최대 거리),
+    좌표가 없는 호텔은 거리 점수 0. 각 호텔에 distance_to_pois_km를 붙입니다.
+    """
+    center = centroid(pois)
+    if center is None or not hotels:
+        return hotels
+    index = SpatialIndex(hotels, lat_key="latitude", lng_key="longitude")
+    distance_by_id: Dict[int, float] = {}
+    if len(index):
+        for hotel, dist in zip(index.items, index.distances_from(*center)):
+            distance_by_id[id(hotel)] = float(dist)
+    farthest = max(distance_by_id.values(), default=0.0)
+
+    def score(pair: Tuple[int, Dict]) -> float:
+        position, hotel = pair
+        rank_score = 1 - position / len(hotels)
+        dist = distance_by_id.get(id(hotel))
+        proximity = 1 - dist / farthest if dist is not None and farthest > 0 else (1.0 if dist is not None else 0.0)
+        return (1 - weight) * rank_score + weight * proximity
+
+    for hotel in hotels:
+        dist = distance_by_id.get(id(hotel))
+        hotel["distance_to_pois_km"] = round(dist, 2) if dist is not None else None
+    return [hotel for _, hotel in sorted(enumerate(hotels), key=score, reverse=True)]
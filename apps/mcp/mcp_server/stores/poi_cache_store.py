@@ -0,0 +1,155 @@
+# mcp/mcp_server/stores/poi_cache_store.py
+"""
+목적지별 POI 검색 결과를 저장하는 영구 캐시 (SQLite)
+
+키: (정규화한 목적지, 카테고리, 제공자(google/kakao), 언어)
+- 도시의 POI는 몇 주 단위로만 바뀌므로 며칠 단위 TTL로 저장하고, 서버를 재시작해도 유지됩니다.
+- 신선도 판단(fresh/stale)과 백그라운드 갱신은 PoiClient가 fetched_at을 보고 결정합니다.
+- complete는 제공자 결과를 끝까지 받은 목록인지 표시합니다 (더 많은 POI가 필요해도 다시 부를 필요 없음).
+- 항목 수가 POI_CACHE_MAX_ENTRIES를 넘으면 가장 오래 조회하지 않은 항목부터 지웁니다.
+  조회 시각(accessed_at)은 메모리에 모아 두었다가 다음 쓰기 때나 TOUCH_FLUSH_INTERVAL마다 한 번에 기록하므로
+  캐시 hit는 SQLite 쓰기 잠금을 잡지 않습니다.
+- 메서드는 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .resolution_store import normalize_key
+
+
+class PoiCacheStore:
+    """POI 검색 결과 영구 캐시"""
+
+    # 모아 둔 조회 시각을 기록하는 최대 간격(초)
+    TOUCH_FLUSH_INTERVAL = 60.0
+
+    def __init__(self, path: str, max_entries: int = settings.POI_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touches: Dict[Tuple[str, str, str, str], float] = {}  # 키 → 아직 기록하지 않은 마지막 조회 시각
+        self._last_flush = time.time()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 워커가 동시에 읽고 쓰기 위함
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS poi_cache (
+                    destination TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    complete INTEGER NOT NULL DEFAULT 0,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (destination, category, provider, language)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_poi_cache_accessed ON poi_cache (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(destination: str, category: str, provider: str, language: str) -> Tuple[str, str, str, str]:
+        return (normalize_key(destination), category, provider, language)
+
+    def get(self, destination: str, category: str, provider: str, language: str) -> Optional[Tuple[List[Dict[str, Any]], float, bool]]:
+        """
+        저장된 (POI 목록, 가져온 시각, complete 여부)를 반환합니다 (없으면 None). 만료 여부는 판단하지 않습니다.
+        """
+        key = self.make_key(destination, category, provider, language)
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT payload, fetched_at, complete FROM poi_cache"
+                    " WHERE destination = ? AND category = ? AND provider = ? AND language = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    self._touches[key] = now
+                    if now - self._last_flush >= self.TOUCH_FLUSH_INTERVAL:
+                        self._flush_touches(conn)
+                        conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[PoiCache] ⚠️ Read failed: {e}")
+                return None
+        if row is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return json.loads(row[0]), row[1], bool(row[2])
+
+    def put(self, destination: str, category: str, provider: str, language: str,
+            pois: List[Dict[str, Any]], fetched_at: Optional[float] = None, complete: bool = False) -> None:
+        """POI 목록을 저장하고, 최대 항목 수를 넘으면 오래 안 쓴 항목을 지웁니다."""
+        key = self.make_key(destination, category, provider, language)
+        if not key[0]:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                self._flush_touches(conn)  # LRU 제거 전에 최근 조회 시각 반영
+                conn.execute(
+                    """
+                    INSERT INTO poi_cache (destination, category, provider, language, payload, complete, fetched_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(destination, category, provider, language) DO UPDATE SET
+                        payload = excluded.payload,
+                        complete = excluded.complete,
+                        fetched_at = excluded.fetched_at,
+                        accessed_at = excluded.accessed_at
+                    """,
+                    (*key, json.dumps(pois, ensure_ascii=False), int(complete), fetched_at or now, now),
+                )
+                cursor = conn.execute(
+                    """
+                    DELETE FROM poi_cache WHERE rowid IN (
+                        SELECT rowid FROM poi_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+                conn.commit()
+                self._stats["writes"] += 1
+                self._stats["evicted"] += max(cursor.rowcount, 0)
+            except (sqlite3.Error, OSError) as e:
+                print(f"[PoiCache] ⚠️ Write failed: {e}")
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """모아 둔 조회 시각을 한 번에 기록합니다 (커밋은 호출 측, self._lock 안에서 호출)."""
+        if self._touches:
+            conn.executemany(
+                "UPDATE poi_cache SET accessed_at = MAX(accessed_at, ?)"
+                " WHERE destination = ? AND category = ? AND provider = ? AND language = ?",
+                [(accessed_at, *key) for key, accessed_at in self._touches.items()],
+            )
+            self._touches.clear()
+        self._last_flush = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                entries = self._connection().execute("SELECT COUNT(*) FROM poi_cache").fetchone()[0]
+            except (sqlite3.Error, OSError):
+                entries = None
+        return {"entries": entries, **self._stats}
+
+
+# 다른 파일에서 from ..stores.poi_cache_store import poi_cache_store 로 참조
+poi_cache_store = PoiCacheStore(settings.POI_CACHE_DB_PATH)
@@ -0,0 +1,247 @@
+# mcp/mcp_server/stores/poi_catalog.py
+"""
+주요 목적지 POI 카탈로그 (오프라인 빌드 → 서버 시작 시 memory-map)
+
+scripts/build_poi_catalog.py 가 CITY_IATA_MAP 도시들의 POI를 미리 모아 이 형식의 파일 하나로 저장하고,
+서버는 시작할 때 파일을 읽기 전용 mmap으로 엽니다. 페이지는 OS 페이지 캐시를 통해 워커 프로세스끼리 공유되며
+요청 처리 중에는 해당 도시 구간만 읽어 dict로 만듭니다.
+
+파일 구조 (리틀 엔디언):
+    MAGIC(8) | 헤더 길이 uint32 | 헤더 JSON | 0 패딩(8바이트 정렬) | 배열들(각각 8바이트 정렬)
+
+    헤더: format_version, catalog_version(빌드 시각), cities {도시 키: [시작 행, 끝 행, 제공자]},
+          aliases {별칭 키: 도시 키}, query_categories, categories, arrays {이름: {dtype, offset, count}}
+    배열(행 = POI, 도시별로 연속):
+        lat, lng (float64), rating (float32, 평점 없음은 NaN), query_category (uint8, 검색 카테고리 인덱스),
+        category (uint16, POI 자체 분류 인덱스), name/vicinity/description (UTF-8 blob + int64 오프셋)
+"""
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .resolution_store import normalize_key
+
+MAGIC = b"TMPOICAT"
+FORMAT_VERSION = 1
+_ALIGN = 8
+_TEXT_COLUMNS = ("name", "vicinity", "description")
+
+
+def _pad(length: int) -> int:
+    return (-length) % _ALIGN
+
+
+def _encode_text(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [(v or "").encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def write_catalog(
+    path: str,
+    cities: Dict[str, Dict[str, List[Dict[str, Any]]]],
+    query_categories: List[str],
+    aliases: Optional[Dict[str, str]] = None,
+    providers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    카탈로그 파일을 씁니다 (임시 파일에 쓴 뒤 교체하므로 읽고 있는 워커에 영향 없음).
+
+    Args:
+        cities: {도시: {검색 카테고리: POI 목록}}
+        query_categories: 검색 카테고리 순서 (예: ["관광명소", "맛집", "카페"])
+        aliases: {별칭: 도시} (예: "tokyo" → "도쿄")
+        providers: {도시: "google" | "kakao"}
+
+    Returns:
+        헤더 dict
+    """
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    city_ranges: Dict[str, list] = {}
+    for city, by_category in cities.items():
+        key = normalize_key(city)
+        start = len(rows)
+        for qi, query_category in enumerate(query_categories):
+            for poi in by_category.get(query_category, []):
+                if isinstance(poi.get("lat"), (int, float)) and isinstance(poi.get("lng"), (int, float)):
+                    rows.append((qi, poi))
+        city_ranges[key] = [start, len(rows), (providers or {}).get(city, "google")]
+
+    categories = sorted({poi.get("category") or "" for _, poi in rows})
+    category_index = {c: i for i, c in enumerate(categories)}
+    columns: Dict[str, np.ndarray] = {
+        "lat": np.array([poi["lat"] for _, poi in rows], dtype="<f8"),
+        "lng": np.array([poi["lng"] for _, poi in rows], dtype="<f8"),
+        "rating": np.array([np.nan if poi.get("rating") is None else float(poi["rating"]) for _, poi in rows], dtype="<f4"),
+        "query_category": np.array([qi for qi, _ in rows], dtype=np.uint8),
+        "category": np.array([category_index[poi.get("category") or ""] for _, poi in rows], dtype="<u2"),
+    }
+    for column in _TEXT_COLUMNS:
+        blob, offsets = _encode_text(poi.get(column) for _, poi in rows)
+        columns[f"{column}_blob"] = blob
+        columns[f"{column}_offsets"] = offsets
+
+    header: Dict[str, Any] = {
+        "format_version": FORMAT_VERSION,
+        "catalog_version": time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()),
+        "count": len(rows),
+        "cities": city_ranges,
+        "aliases": {normalize_key(a): normalize_key(c) for a, c in (aliases or {}).items()},
+        "query_categories": list(query_categories),
+        "categories": categories,
+        "arrays": {},
+    }
+    # 배열 위치는 헤더 길이에 따라 달라지므로, 헤더 길이가 더 바뀌지 않을 때까지 다시 계산
+    header_len = 0
+    while True:
+        data_start = len(MAGIC) + 4 + header_len
+        offset = data_start + _pad(data_start)
+        for name, array in columns.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "offset": offset, "count": int(array.size)}
+            offset += array.nbytes + _pad(array.nbytes)
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(header_bytes) == header_len:
+            break
+        header_len = len(header_bytes)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * _pad(f.tell()))
+        for name, array in columns.items():
+            assert f.tell() == header["arrays"][name]["offset"]
+            f.write(array.tobytes())
+            f.write(b"\0" * _pad(array.nbytes))
+    os.replace(tmp_path, path)
+    return header
+
+
+class PoiCatalog:
+    """memory-map 한 POI 카탈로그 (읽기 전용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header: Optional[Dict[str, Any]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    @property
+    def loaded(self) -> bool:
+        return self.header is not None
+
+    def load(self) -> bool:
+        """카탈로그 파일을 mmap 합니다. 파일이 없거나 형식이 맞지 않으면 False (라이브 API만 사용)."""
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:  # 파일 없음 / 빈 파일
+            print(f"[PoiCatalog] ℹ️ No catalog at {self.path} ({e}), using live POI APIs only")
+            return False
+
+        try:
+            if mapped[:len(MAGIC)] != MAGIC:
+                raise ValueError("bad magic")
+            (header_len,) = struct.unpack_from("<I", mapped, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(mapped[start:start + header_len].decode("utf-8"))
+            if header.get("format_version") != FORMAT_VERSION:
+                raise ValueError(f"format version {header.get('format_version')} != {FORMAT_VERSION}")
+            arrays = {
+                name: np.frombuffer(mapped, dtype=np.dtype(spec["dtype"]), count=spec["count"], offset=spec["offset"])
+                for name, spec in header["arrays"].items()
+            }
+        except (ValueError, KeyError, struct.error) as e:
+            mapped.close()
+            print(f"[PoiCatalog] ⚠️ Ignoring invalid catalog {self.path}: {e}")
+            return False
+
+        self.header, self._mmap, self._arrays = header, mapped, arrays
+        print(f"[PoiCatalog] ✅ Mapped catalog {header['catalog_version']}: "
+              f"{len(header['cities'])} cities, {header['count']} POIs")
+        return True
+
+    def _text(self, column: str, row: int) -> str:
+        offsets = self._arrays[f"{column}_offsets"]
+        start, end = int(offsets[row]), int(offsets[row + 1])
+        return self._arrays[f"{column}_blob"][start:end].tobytes().decode("utf-8")
+
+    def _city_entry(self, destination: str) -> Optional[list]:
+        """목적지(별칭 포함)의 [시작 행, 끝 행, 제공자]. 카탈로그에 없으면 None."""
+        if self.header is None:
+            return None
+        key = normalize_key(destination)
+        key = self.header["aliases"].get(key, key)
+        return self.header["cities"].get(key)
+
+    def centroid(self, destination: str) -> Optional[Tuple[float, float]]:
+        """
+        목적지 POI들의 중심 (위도, 경도). 카탈로그에 없거나 POI가 없으면 None.
+        mmap 한 lat/lng 구간만 읽으므로 텍스트를 디코딩하지 않으며 hit/miss 통계에도 넣지 않습니다.
+        """
+        entry = self._city_entry(destination)
+        if entry is None or entry[1] <= entry[0]:
+            return None
+        start, end = entry[0], entry[1]
+        return float(self._arrays["lat"][start:end].mean()), float(self._arrays["lng"][start:end].mean())
+
+    def get(self, destination: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        목적지의 POI를 검색 카테고리별로 반환합니다. 카탈로그에 없는 도시면 None.
+
+        Returns:
+            {검색 카테고리: [{"name", "category", "rating", "description", "vicinity", "lat", "lng"}]}
+        """
+        if self.header is None:
+            return None
+        entry = self._city_entry(destination)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+
+        start, end = entry[0], entry[1]
+        query_categories = self.header["query_categories"]
+        categories = self.header["categories"]
+        lat, lng = self._arrays["lat"][start:end], self._arrays["lng"][start:end]
+        rating = self._arrays["rating"][start:end]
+        query_category = self._arrays["query_category"][start:end]
+        category = self._arrays["category"][start:end]
+
+        result: Dict[str, List[Dict[str, Any]]] = {c: [] for c in query_categories}
+        for i, row in enumerate(range(start, end)):
+            result[query_categories[query_category[i]]].append({
+                "name": self._text("name", row),
+                "category": categories[category[i]],
+                "rating": None if np.isnan(rating[i]) else round(float(rating[i]), 2),
+                "description": self._text("description", row),
+                "vicinity": self._text("vicinity", row),
+                "lat": float(lat[i]),
+                "lng": float(lng[i]),
+            })
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        if self.header is None:
+            return {"loaded": False, **self._stats}
+        return {
+            "loaded": True,
+            "catalog_version": self.header["catalog_version"],
+            "cities": len(self.header["cities"]),
+            "pois": self.header["count"],
+            **self._stats,
+        }
+
+
+# 다른 파일에서 from ..stores.poi_catalog import poi_catalog 로 참조 (main.py lifespan에서 load)
+poi_catalog = PoiCatalog(settings.POI_CATALOG_PATH)
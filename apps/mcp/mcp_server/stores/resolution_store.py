@@ -0,0 +1,212 @@
+# mcp/mcp_server/stores/resolution_store.py
+"""
+도시 이름 → Agoda place_id / IATA 코드 / 좌표(geocode) 해석 결과를 저장하는 영구 저장소 (SQLite)
+
+- 서버 시작 시 전체를 메모리로 읽어 두고, 조회는 메모리에서 처리합니다.
+- 메모리에 없으면 DB를 한 번 더 확인하므로 다른 워커 프로세스가 저장한 결과도 공유됩니다.
+- RESOLUTION_SYNC_INTERVAL마다 DB의 (항목 수, 최근 수정 시각)을 확인해 바뀌었으면 다시 읽으므로
+  다른 워커에서 관리자가 수정/삭제한 항목도 그 간격 안에 반영됩니다.
+- 메서드는 동기 함수(DB 접근 가능)이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+- 관리자가 수정한 항목(source="admin")은 자동 해석 결과로 덮어쓰지 않습니다.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional
+
+from ..config import settings
+
+KIND_PLACE_ID = "place_id"
+KIND_IATA = "iata"
+KIND_GEOCODE = "geocode"  # 값: "위도,경도"
+VALID_KINDS = (KIND_PLACE_ID, KIND_IATA, KIND_GEOCODE)
+
+SOURCE_ADMIN = "admin"
+
+
+def normalize_key(city: str) -> str:
+    """조회 키 정규화: NFKC + 소문자 + 공백 정리"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", city or "")).strip().lower()
+
+
+class ResolutionStore:
+    """place_id / IATA 해석 결과 저장소"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: Dict[tuple, dict] = {}
+        self._loaded = False
+        self._signature: Optional[tuple] = None  # 마지막으로 읽은 DB 상태 (항목 수, 최근 수정 시각)
+        self._checked_at = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 워커가 동시에 읽고 쓰기 위함
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resolutions (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> dict:
+        return {k: row[k] for k in ("kind", "key", "value", "source", "confidence", "updated_at")}
+
+    def _db_signature(self, conn: sqlite3.Connection) -> tuple:
+        """추가/수정은 최근 수정 시각으로, 삭제는 항목 수로 드러나는 DB 상태 요약"""
+        return tuple(conn.execute("SELECT COUNT(*), MAX(updated_at) FROM resolutions").fetchone())
+
+    def load(self) -> int:
+        """DB 전체를 메모리로 읽어 옵니다. 읽은 항목 수를 반환합니다."""
+        with self._lock:
+            self._loaded = True
+            self._checked_at = time.time()
+            try:
+                conn = self._connection()
+                self._signature = self._db_signature(conn)
+                rows = conn.execute("SELECT * FROM resolutions").fetchall()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[ResolutionStore] ⚠️ Load failed ({self.path}): {e}")
+                return 0
+            self._memory = {(r["kind"], r["key"]): self._row_to_record(r) for r in rows}
+        print(f"[ResolutionStore] ✅ Loaded {len(self._memory)} entries from {self.path}")
+        return len(self._memory)
+
+    def _sync_if_due(self) -> None:
+        """간격이 지났으면 DB 상태를 확인하고, 다른 워커가 바꿨으면 다시 읽습니다."""
+        if not self._loaded:
+            self.load()
+            return
+        if time.time() - self._checked_at < settings.RESOLUTION_SYNC_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = time.time()
+            try:
+                changed = self._db_signature(self._connection()) != self._signature
+            except (sqlite3.Error, OSError) as e:
+                print(f"[ResolutionStore] ⚠️ Sync check failed: {e}")
+                return
+        if changed:
+            self.load()
+
+    def get(self, kind: str, city: str) -> Optional[dict]:
+        """해석 결과 레코드를 반환합니다 (없으면 None)."""
+        self._sync_if_due()
+        key = (kind, normalize_key(city))
+        record = self._memory.get(key)
+        if record is not None:
+            return record
+
+        # 다른 워커가 저장했을 수 있으므로 DB 확인
+        with self._lock:
+            try:
+                row = self._connection().execute(
+                    "SELECT * FROM resolutions WHERE kind = ? AND key = ?", key
+                ).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[ResolutionStore] ⚠️ Read failed: {e}")
+                return None
+        if row is None:
+            return None
+        record = self._row_to_record(row)
+        self._memory[key] = record
+        return record
+
+    def get_value(self, kind: str, city: str) -> Optional[str]:
+        record = self.get(kind, city)
+        return record["value"] if record else None
+
+    def put(self, kind: str, city: str, value: str, source: str, confidence: float) -> Optional[dict]:
+        """
+        해석 결과를 저장합니다. 관리자가 지정한 항목은 자동 결과로 덮어쓰지 않습니다.
+
+        Returns:
+            저장된 레코드 (관리자 항목 보호로 저장하지 않은 경우 기존 레코드)
+        """
+        if kind not in VALID_KINDS:
+            raise ValueError(f"Unknown resolution kind: {kind}")
+        key = normalize_key(city)
+        if not key or not value:
+            return None
+
+        existing = self.get(kind, key)
+        if existing and existing["source"] == SOURCE_ADMIN and source != SOURCE_ADMIN:
+            return existing
+
+        record = {
+            "kind": kind,
+            "key": key,
+            "value": str(value),
+            "source": source,
+            "confidence": float(confidence),
+            "updated_at": time.time(),
+        }
+        with self._lock:
+            self._memory[(kind, key)] = record
+            try:
+                conn = self._connection()
+                conn.execute(
+                    """
+                    INSERT INTO resolutions (kind, key, value, source, confidence, updated_at)
+                    VALUES (:kind, :key, :value, :source, :confidence, :updated_at)
+                    ON CONFLICT(kind, key) DO UPDATE SET
+                        value = excluded.value,
+                        source = excluded.source,
+                        confidence = excluded.confidence,
+                        updated_at = excluded.updated_at
+                    """,
+                    record,
+                )
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                # 디스크 저장에 실패해도 이 프로세스 메모리에는 남겨 둠
+                print(f"[ResolutionStore] ⚠️ Write failed: {e}")
+        return record
+
+    def delete(self, kind: str, city: str) -> bool:
+        key = (kind, normalize_key(city))
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM resolutions WHERE kind = ? AND key = ?", key)
+            self._connection().commit()
+            self._memory.pop(key, None)
+        return cursor.rowcount > 0
+
+    def list(self, kind: Optional[str] = None, query: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """DB 기준 목록 조회 (관리자 화면용)"""
+        sql = "SELECT * FROM resolutions WHERE 1 = 1"
+        params: list = []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if query:
+            sql += " AND (key LIKE ? OR value LIKE ?)"
+            like = f"%{normalize_key(query)}%"
+            params.extend([like, like])  # SQLite LIKE는 ASCII 대소문자 무시
+        sql += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [self._row_to_record(r) for r in rows]
+
+
+# 다른 파일에서 from ..stores.resolution_store import resolution_store 로 참조
+resolution_store = ResolutionStore(settings.RESOLUTION_DB_PATH)
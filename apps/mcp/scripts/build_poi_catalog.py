@@ -0,0 +1,105 @@
+# mcp/scripts/build_poi_catalog.py
+"""
+주요 목적지 POI 카탈로그 빌드 (오프라인 배치)
+
+AgodaClient.CITY_IATA_MAP 의 도시마다 '관광명소/맛집/카페' POI를 POI_CATALOG_DAYS 일 여행에
+충분한 만큼 모아 카탈로그 파일 하나로 저장합니다. 서버는 다음 시작 때 이 파일을 mmap 합니다.
+(POI 영구 캐시를 거치므로 최근에 받은 도시는 다시 호출하지 않습니다)
+
+- 공항 코드마다 처음 나오는 한글 이름을 도시로 수집하고, 같은 코드의 다른 이름(영문/현지어/다른 표기)은
+  그 도시의 별칭으로 등록합니다.
+- 특정 공항을 가리키는 이름(인천, 나리타 등 AIRPORT_ALIASES)은 제외합니다.
+
+실행 (apps/mcp 디렉토리에서):
+    python -m scripts.build_poi_catalog
+    python -m scripts.build_poi_catalog --cities 도쿄 오사카 --output /tmp/poi_catalog.bin
+"""
+import argparse
+import asyncio
+import re
+import time
+from typing import Dict, List, Tuple
+
+from mcp_server.clients.agoda_client import AgodaClient
+from mcp_server.clients.poi_client import PoiClient
+from mcp_server.config import settings
+from mcp_server.stores.poi_catalog import write_catalog
+
+HANGUL = re.compile(r"[가-힣]")
+# 국내 공항 코드 (Kakao 로컬 검색 사용)
+DOMESTIC_AIRPORTS = {"ICN", "GMP", "CJU", "PUS", "TAE", "KWJ", "CJJ", "MWX", "YNY"}
+
+
+def catalog_cities() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    CITY_IATA_MAP 에서 카탈로그 도시와 별칭을 뽑습니다.
+
+    Returns:
+        ({도시: IATA}, {별칭: 도시})
+    """
+    cities: Dict[str, str] = {}
+    city_of_code: Dict[str, str] = {}
+    for name, code in AgodaClient.CITY_IATA_MAP.items():
+        if name in AgodaClient.AIRPORT_ALIASES or not HANGUL.search(name) or code in city_of_code:
+            continue
+        cities[name] = code
+        city_of_code[code] = name
+
+    aliases = {
+        name: city_of_code[code]
+        for name, code in AgodaClient.CITY_IATA_MAP.items()
+        if name not in cities and name not in AgodaClient.AIRPORT_ALIASES and code in city_of_code
+    }
+    return cities, aliases
+
+
+async def build(cities: Dict[str, str], aliases: Dict[str, str], output: str, days: int, concurrency: int) -> None:
+    client = PoiClient()
+    targets = PoiClient.catalog_target_counts(days)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    collected: Dict[str, Dict[str, List[dict]]] = {}
+    providers: Dict[str, str] = {}
+
+    async def collect(city: str, code: str) -> None:
+        is_domestic = code in DOMESTIC_AIRPORTS
+        async with semaphore:
+            by_category = await client.search_pois_by_category(city, is_domestic, targets, use_catalog=False)
+        count = sum(len(pois) for pois in by_category.values())
+        if count == 0:
+            print(f"  ⚠️ {city} ({code}): no POIs, skipped")
+            return
+        collected[city] = by_category
+        providers[city] = "kakao" if is_domestic else "google"
+        print(f"  ✅ {city} ({code}): {count} POIs")
+
+    print(f"Collecting {len(cities)} cities (targets per category: {targets})")
+    started = time.perf_counter()
+    await asyncio.gather(*(collect(city, code) for city, code in cities.items()))
+
+    header = write_catalog(
+        output,
+        {city: collected[city] for city in cities if city in collected},  # CITY_IATA_MAP 순서 유지
+        list(targets),
+        aliases={alias: city for alias, city in aliases.items() if city in collected},
+        providers=providers,
+    )
+    print(f"Wrote {output}: version {header['catalog_version']}, {len(header['cities'])} cities, "
+          f"{header['count']} POIs in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the prebuilt POI catalog for top destinations")
+    parser.add_argument("--output", default=settings.POI_CATALOG_PATH)
+    parser.add_argument("--days", type=int, default=settings.POI_CATALOG_DAYS, help="trip length the catalog should cover")
+    parser.add_argument("--concurrency", type=int, default=4, help="cities fetched at the same time")
+    parser.add_argument("--cities", nargs="*", help="only these cities (default: every city in CITY_IATA_MAP)")
+    args = parser.parse_args()
+
+    cities, aliases = catalog_cities()
+    if args.cities:
+        cities = {city: code for city, code in cities.items() if city in args.cities}
+    asyncio.run(build(cities, aliases, args.output, args.days, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
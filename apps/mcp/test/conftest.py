@@ -0,0 +1,18 @@
+# 테스트가 개발자의 apps/mcp/data(해석 결과/POI 캐시/카탈로그)를 읽고 쓰지 않도록
+# mcp_server를 import 하기 전에 모든 영구 데이터 경로를 임시 디렉토리로 돌립니다.
+# (.env에 경로가 지정돼 있어도 load_dotenv는 이미 설정된 환경 변수를 덮어쓰지 않음)
+import os
+import shutil
+import tempfile
+
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="mcp-test-data-")
+os.environ.update({
+    "MCP_DATA_DIR": _TEST_DATA_DIR,
+    "RESOLUTION_DB_PATH": os.path.join(_TEST_DATA_DIR, "resolutions.sqlite3"),
+    "POI_CACHE_DB_PATH": os.path.join(_TEST_DATA_DIR, "poi_cache.sqlite3"),
+    "POI_CATALOG_PATH": os.path.join(_TEST_DATA_DIR, "poi_catalog.bin"),
+})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_TEST_DATA_DIR, ignore_errors=True)
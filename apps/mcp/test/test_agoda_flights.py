@@ -0,0 +1,228 @@
+import asyncio
+
+import httpx
+
+from mcp_server.clients.agoda_client import AgodaClient
+
+
+def _bundle(price_usd, airline="Korean Air", depart="2025-12-06T09:00:00"):
+    return {
+        "bundlePrice": [{"price": {"usd": {"display": {"perBook": {"allInclusive": price_usd}}}}}],
+        "itineraries": [{"itineraryInfo": {"totalTripDuration": 150}, "inboundSlice": {"segments": [
+            {"departDateTime": "2025-12-10T18:00:00", "arrivalDateTime": "2025-12-10T20:30:00"}]}}],
+        "outboundSlice": {"segments": [{"departDateTime": depart, "arrivalDateTime": "2025-12-06T11:30:00",
+                                        "carrierContent": {"carrierName": airline}}]},
+    }
+
+
+def _client_with(responses):
+    """순서대로 응답을 돌려주는 MockTransport를 붙인 AgodaClient"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=responses[min(len(calls), len(responses)) - 1])
+
+    client = AgodaClient()
+    client.headers["X-RapidAPI-Key"] = "test-key"
+    client._get_usd_to_krw_rate = lambda: 1000.0
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, calls
+
+
+def test_search_flights_polls_until_completed():
+    client, calls = _client_with([
+        {"retry": {"next": 1}, "trips": [{"isCompleted": False, "bundles": []}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(300)]}]},
+    ])
+    flights = asyncio.run(client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10"))
+
+    assert len(calls) == 2
+    assert flights[0]["price_krw"] == 300000
+    assert flights[0]["outbound_departure_time"] == "2025-12-06T09:00:00"
+    assert flights[0]["inbound_arrival_time"] == "2025-12-10T20:30:00"
+
+
+def test_search_flights_can_be_cancelled():
+    client, calls = _client_with([{"retry": {"next": 30}, "trips": [{"isCompleted": False, "bundles": []}]}])
+
+    async def run():
+        task = asyncio.create_task(client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            cancelled = True
+        else:
+            cancelled = False
+        # 기다리는 호출자가 없으므로 공유 검색도 멈춰 더 이상 polling 하지 않음
+        await asyncio.sleep(0.1)
+        return cancelled
+
+    assert asyncio.run(run())
+    assert len(calls) == 1
+    assert client.flight_cache._inflight == {}
+
+
+def test_iter_flight_results_yields_partial_and_deduplicates():
+    client, _ = _client_with([
+        {"retry": {"next": 1}, "trips": [{"isCompleted": False, "bundles": [_bundle(400)]}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(350), _bundle(200, airline="Asiana")]}]},
+    ])
+
+    async def collect():
+        return [s async for s in client.iter_flight_results("ICN", "NRT", "2025-12-06", "2025-12-10")]
+
+    snapshots = asyncio.run(collect())
+    assert [s["completed"] for s in snapshots] == [False, True]
+    assert [f["price_krw"] for f in snapshots[0]["flights"]] == [400000]
+    # 같은 여정은 더 싼 가격으로 대체되고, 결과는 가격 오름차순
+    assert [f["price_krw"] for f in snapshots[1]["flights"]] == [200000, 350000]
+
+
+def test_search_flights_returns_early_and_caches_complete_result():
+    client, calls = _client_with([
+        {"retry": {"next": 1}, "trips": [{"isCompleted": False, "bundles": [_bundle(300), _bundle(310, airline="Asiana")]}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(100, depart="2025-12-06T07:00:00")]}]},
+    ])
+    key = ("ICN", "NRT", "2025-12-06", "2025-12-10", 1, client.FLIGHT_CABIN_CLASS)
+
+    async def run():
+        early = await client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10", min_results=2)
+        polls_at_return = len(calls)
+        # 조기 반환 뒤에도 공유 검색은 끝까지 polling 해 완전한 결과를 캐시
+        await asyncio.gather(*client._background_searches)
+        again = await client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10", min_results=2)
+        return early, polls_at_return, again
+
+    early, polls_at_return, again = asyncio.run(run())
+    assert polls_at_return == 1
+    assert [f["price_krw"] for f in early] == [300000, 310000]
+    assert [f["price_krw"] for f in client.flight_cache.peek(key).value] == [100000, 300000, 310000]
+    assert len(calls) == 2
+    assert [f["price_krw"] for f in again] == [100000, 300000, 310000]
+
+
+def test_concurrent_searches_share_polling_snapshots():
+    client, calls = _client_with([
+        {"retry": {"next": 20}, "trips": [{"isCompleted": False, "bundles": [_bundle(300)]}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(200, airline="Asiana")]}]},
+    ])
+
+    async def run():
+        return await asyncio.gather(
+            client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10", min_results=1),
+            client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10"),
+        )
+
+    early, full = asyncio.run(run())
+    assert len(calls) == 2  # 두 호출자가 하나의 polling을 공유
+    assert [f["price_krw"] for f in early] == [300000]
+    assert [f["price_krw"] for f in full] == [200000, 300000]
+
+
+def test_search_flights_uses_cache_and_records_fetch_time():
+    client, calls = _client_with([{"trips": [{"isCompleted": True, "bundles": [_bundle(300)]}]}])
+
+    async def run():
+        first = await client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10")
+        second = await client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(calls) == 1
+    assert first == second
+    assert first[0]["price_fetched_at"].endswith("+00:00")
+
+
+def test_resolve_origin_airports_expands_multi_airport_cities(monkeypatch):
+    from mcp_server.config import settings
+    client = AgodaClient()
+
+    async def run(origin):
+        return await client.resolve_origin_airports(origin)
+
+    assert asyncio.run(run("서울")) == ["ICN"]  # 기본은 대표 공항만 (쿼터 절약)
+    monkeypatch.setattr(settings, "FLIGHT_MULTI_AIRPORT_ORIGINS", True)
+    assert asyncio.run(run("서울")) == ["ICN", "GMP"]
+    assert asyncio.run(run("부산")) == ["PUS"]
+    assert asyncio.run(run("김포")) == ["GMP"]
+    assert asyncio.run(run("gmp")) == ["GMP"]
+    assert asyncio.run(run(None)) == ["ICN"]
+
+
+def test_search_flights_from_airports_merges_and_isolates_failures(monkeypatch):
+    from mcp_server.config import settings
+    monkeypatch.setattr(settings, "FLIGHT_ORIGIN_TIMEOUT", 0.05)
+    client = AgodaClient()
+
+    def flight(origin, price):
+        return {"origin": origin, "price_krw": price, "airline": "KE", "outbound_departure_time": f"{origin}-{price}",
+                "outbound_arrival_time": None, "inbound_departure_time": None, "inbound_arrival_time": None,
+                "segments": 1}
+
+    async def fake_search(origin, *args, **kwargs):
+        if origin == "SLOW":
+            await asyncio.sleep(1)
+        if origin == "FAIL":
+            raise httpx.HTTPError("upstream error")
+        return {"ICN": [flight("ICN", 300000), flight("ICN", 250000)], "GMP": [flight("GMP", 280000)]}.get(origin, [])
+
+    client.search_flights = fake_search
+    flights = asyncio.run(client.search_flights_from_airports(["ICN", "GMP", "SLOW", "FAIL"], "NRT", "2025-12-06", "2025-12-10"))
+
+    assert [(f["origin"], f["price_krw"]) for f in flights] == [("ICN", 250000), ("GMP", 280000), ("ICN", 300000)]
+
+
+def _stream_lines(client, *args):
+    import json
+    from mcp_server.routers.flight_router import stream_flight_search
+
+    async def collect():
+        response = await stream_flight_search(*args, agoda_client=client)
+        return [json.loads(line) async for line in response.body_iterator]
+    return collect()
+
+
+def test_flight_stream_serves_cached_result_as_single_line():
+    client, calls = _client_with([{"trips": [{"isCompleted": True, "bundles": [_bundle(300)]}]}])
+
+    async def run():
+        await client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10")
+        return await _stream_lines(client, "ICN", "NRT", "2025-12-06", "2025-12-10")
+
+    lines = asyncio.run(run())
+    assert len(calls) == 1
+    assert [(line["completed"], line["status"]) for line in lines] == [(True, "hit")]
+    assert lines[0]["flights"][0]["price_krw"] == 300000
+
+
+def test_flight_stream_joins_inflight_search():
+    client, calls = _client_with([
+        {"retry": {"next": 20}, "trips": [{"isCompleted": False, "bundles": [_bundle(300)]}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(200, airline="Asiana")]}]},
+    ])
+
+    async def run():
+        search = asyncio.create_task(client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10"))
+        await asyncio.sleep(0.005)
+        lines = await _stream_lines(client, "ICN", "NRT", "2025-12-06", "2025-12-10")
+        return lines, await search
+
+    lines, flights = asyncio.run(run())
+    assert len(calls) == 2  # 스트림은 진행 중인 검색에 합류 (추가 polling 없음)
+    assert [line["status"] for line in lines] == ["searching", "miss"]
+    assert [f["price_krw"] for f in lines[-1]["flights"]] == [f["price_krw"] for f in flights] == [200000, 300000]
+
+
+def test_flight_stream_ends_with_error_line():
+    from mcp_server.rate_limiter import RapidApiQuotaExceeded
+    client, _ = _client_with([])
+
+    async def quota_exceeded(*args):
+        raise RapidApiQuotaExceeded("RapidAPI quota exhausted")
+
+    client._fetch_flights_shared = quota_exceeded
+    lines = asyncio.run(_stream_lines(client, "ICN", "NRT", "2025-12-06", "2025-12-10"))
+    assert lines == [{"error": "RapidAPI quota exhausted", "completed": True}]
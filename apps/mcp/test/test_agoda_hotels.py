@@ -0,0 +1,118 @@
+import asyncio
+from datetime import date
+
+import httpx
+
+from mcp_server.clients.agoda_client import AgodaClient
+
+
+def _property(pid, price, rating):
+    return {
+        "propertyId": pid,
+        "content": {"informationSummary": {"defaultName": f"Hotel {pid}", "rating": rating,
+                                           "geoInfo": {"latitude": 35.0, "longitude": 139.0}}},
+        "pricing": {"offers": [{"roomOffers": [{"room": {"pricing": [
+            {"currency": "KRW", "price": {"perRoomPerNight": {"exclusive": {"display": price}}}}]}}]}]},
+    }
+
+
+def _client_with_pages(pages):
+    """page 파라미터별로 properties를 돌려주는 MockTransport를 붙인 AgodaClient"""
+    requested = []
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        requested.append(page)
+        return httpx.Response(200, json={"status": True, "data": {"properties": pages.get(page, [])}})
+
+    client = AgodaClient()
+    client.headers["X-RapidAPI-Key"] = "test-key"
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def place_id(_client, _destination):
+        return "1_5085"
+    client._get_place_id = place_id
+    return client, requested
+
+
+def test_search_hotels_merges_pages_and_dedupes():
+    size = AgodaClient.HOTEL_PAGE_SIZE
+    client, requested = _client_with_pages({
+        1: [_property(i, 100000 + i, 4.0) for i in range(size)],
+        2: [_property(i, 100000 + i, 4.0) for i in range(size - 5, size + 3)],  # 5개 중복, 마지막 페이지
+    })
+    hotels = asyncio.run(client.search_hotels("Tokyo", date(2025, 12, 6), date(2025, 12, 10), pages=3, top_k=100))
+
+    assert sorted(requested) == [1, 2]
+    assert len(hotels) == size + 3
+    assert len({h["id"] for h in hotels}) == size + 3
+
+
+def test_search_hotels_stops_early_when_enough_results():
+    size = AgodaClient.HOTEL_PAGE_SIZE
+    client, requested = _client_with_pages({p: [_property(p * 100 + i, 50000, 4.5) for i in range(size)] for p in range(1, 6)})
+    hotels = asyncio.run(client.search_hotels("Tokyo", "2025-12-06", "2025-12-10", pages=5, top_k=10))
+
+    assert len(requested) < 5
+    assert len(hotels) == 10
+
+
+def test_rank_hotels_applies_filters_and_prefers_cheap_high_rated():
+    hotels = [
+        {"id": 1, "price": 300000, "rating": 4.8},
+        {"id": 2, "price": 100000, "rating": 4.6},
+        {"id": 3, "price": 80000, "rating": 2.5},
+        {"id": 4, "price": 0, "rating": 5.0},
+    ]
+    ranked = AgodaClient.rank_hotels(hotels, top_k=5, min_rating=3.0, max_price=250000)
+    assert [h["id"] for h in ranked] == [2]
+
+    ranked = AgodaClient.rank_hotels(hotels, top_k=2)
+    assert ranked[0]["id"] == 2
+
+
+def _client_with_details():
+    requested = []
+
+    def handler(request):
+        hotel_id = request.url.params["hotelId"]
+        requested.append(hotel_id)
+        return httpx.Response(200, json={"data": {"hotelId": int(hotel_id), "name": f"Hotel {hotel_id}",
+                                                  "images": [{"url": "https://img/1.jpg"}]}})
+
+    client = AgodaClient()
+    client.headers["X-RapidAPI-Key"] = "test-key"
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, requested
+
+
+def test_hotel_details_batch_is_cached_per_stay():
+    client, requested = _client_with_details()
+    check_in, check_out = date(2025, 12, 6), date(2025, 12, 10)
+
+    async def run():
+        batch = await client.get_hotel_details_batch(["1", "2", "1"], check_in, check_out, 2)
+        single = await client.get_hotel_details("2", "2025-12-06", "2025-12-10", 2)
+        other_stay = await client.get_hotel_details("2", check_in, date(2025, 12, 11), 2)
+        return batch, single, other_stay
+
+    batch, single, other_stay = asyncio.run(run())
+
+    assert set(batch) == {"1", "2"}
+    assert batch["1"]["images"] == ["https://img/1.jpg"]
+    assert single["name"] == "Hotel 2"
+    assert other_stay is not None
+    assert sorted(requested) == ["1", "2", "2"]
+
+
+def test_prefetch_hotel_details_fills_cache_in_background():
+    client, requested = _client_with_details()
+    hotels = [{"id": i} for i in range(1, 8)]
+
+    async def run():
+        task = client.prefetch_hotel_details(hotels, date(2025, 12, 6), date(2025, 12, 10), 2, top_n=3)
+        await task
+        await client.get_hotel_details(1, date(2025, 12, 6), date(2025, 12, 10), 2)
+
+    asyncio.run(run())
+    assert sorted(requested) == ["1", "2", "3"]
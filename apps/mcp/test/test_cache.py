@@ -0,0 +1,115 @@
+import asyncio
+
+from mcp_server.cache import AsyncTTLCache
+
+
+def test_hit_after_miss():
+    cache = AsyncTTLCache("test", ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return "value"
+
+    async def run():
+        first = await cache.get_or_fetch("k", fetch)
+        second = await cache.get_or_fetch("k", fetch)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first[0] == second[0] == "value"
+    assert (first[2], second[2]) == ("miss", "hit")
+    assert first[1] == second[1]
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = AsyncTTLCache("test", ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert [r[0] for r in results] == [42] * 5
+    assert len(calls) == 1
+
+
+def test_stale_value_is_served_while_refreshing():
+    cache = AsyncTTLCache("test", ttl=60, stale_ttl=600)
+    cache.set("k", "old", ttl=-1)
+
+    async def fetch():
+        return "new"
+
+    async def run():
+        value, _, status = await cache.get_or_fetch("k", fetch)
+        await asyncio.sleep(0)  # 백그라운드 갱신 실행
+        await asyncio.sleep(0)
+        return value, status, cache.peek("k").value
+
+    assert asyncio.run(run()) == ("old", "stale", "new")
+
+
+def test_uncacheable_values_and_lru_eviction():
+    cache = AsyncTTLCache("test", ttl=60, max_entries=2, cacheable=bool)
+
+    async def empty():
+        return []
+
+    asyncio.run(cache.get_or_fetch("empty", empty))
+    assert cache.peek("empty") is None
+
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.peek("a") is None and cache.peek("c").value == "c"
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_fetch():
+    cache = AsyncTTLCache("test", ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        leader = asyncio.create_task(asyncio.wait_for(cache.get_or_fetch("k", fetch), timeout=0.01))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_fetch("k", fetch))
+        try:
+            await leader
+        except asyncio.TimeoutError:
+            pass
+        return await follower
+
+    value, _, status = asyncio.run(run())
+    assert (value, status) == ("value", "miss")
+    assert len(calls) == 1
+    assert cache.peek("k").value == "value"
+
+
+def test_fetch_is_cancelled_when_every_caller_is_cancelled():
+    cache = AsyncTTLCache("test", ttl=60)
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "value"
+
+    async def run():
+        callers = [asyncio.create_task(asyncio.wait_for(cache.get_or_fetch("k", fetch), timeout=0.01)) for _ in range(2)]
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert finished == []
+    assert cache.peek("k") is None
+    assert cache._inflight == {} and cache._waiters == {}
@@ -0,0 +1,25 @@
+import pytest
+
+from mcp_server.clients.agoda_client import AgodaClient
+
+# (질의, 기대 IATA 코드 또는 None) — 한국어 / 영어 / 일본어 도시 이름 정확도 세트
+CASES = [
+    # 한국어
+    ("도쿄", "NRT"), ("도쿄 3박 4일", "NRT"), ("도쿄여행", "NRT"), ("오사카에서", "KIX"),
+    ("하네다", "HND"), ("다낭 가족여행", "DAD"), ("쿠알라", "KUL"), ("쿠알라룸푸르", "KUL"),
+    ("다카마쓰", "TAK"), ("빈", "VIE"), ("빈 여행", "VIE"), ("괌", "GUM"), ("괌여행", "GUM"),
+    ("제주도", "CJU"), ("부산", "PUS"), ("하와이 신혼여행", "HNL"), ("로스앤젤레스", "LAX"),
+    ("빈탄", None), ("테니스", None), ("플로리다", None), ("로마네스크", None),
+    # 영어
+    ("Tokyo", "NRT"), ("OSAKA", "KIX"), ("LA", "LAX"), ("la trip", "LAX"), ("Kuala Lumpur", "KUL"),
+    ("New York City", "JFK"), ("kl", "KUL"), ("Ho Chi Minh City", "SGN"), ("san fran", "SFO"),
+    ("malaga", None), ("klang", None), ("Nicely done", None), ("Atlanta", None),
+    # 일본어
+    ("東京", "NRT"), ("東京都", "NRT"), ("大阪府", "KIX"), ("福岡市", "FUK"), ("沖縄旅行", "OKA"),
+    ("札幌", "CTS"), ("京都", None),
+]
+
+
+@pytest.mark.parametrize("query,expected", CASES)
+def test_city_matcher_accuracy(query, expected):
+    assert AgodaClient.CITY_MATCHER.match(query) == expected
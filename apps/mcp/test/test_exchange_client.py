@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+
+from mcp_server.clients.exchange_client import ExchangeRateTable
+
+ROWS = [
+    {"result": 1, "cur_unit": "USD", "deal_bas_r": "1,385.5"},
+    {"result": 1, "cur_unit": "JPY(100)", "deal_bas_r": "912.34"},
+    {"result": 1, "cur_unit": "EUR", "deal_bas_r": "1,501.2"},
+    {"result": 1, "cur_unit": "KRW", "deal_bas_r": "1"},
+    {"result": 1, "cur_unit": "???", "deal_bas_r": "3"},
+]
+
+
+def test_parse_rows_handles_units():
+    rates = ExchangeRateTable.parse_rows(ROWS)
+    assert rates["USD"] == 1385.5
+    assert abs(rates["JPY"] - 9.1234) < 1e-9
+    assert rates["KRW"] == 1.0
+    assert "???" not in rates
+
+
+def test_fallback_before_first_refresh():
+    table = ExchangeRateTable()
+    assert table.get_rate("usd") == 1300.0
+    assert table.get_rate("THB") is None
+    assert table.to_krw(10, "THB") is None
+
+
+def test_refresh_skips_empty_business_days(monkeypatch):
+    responses = [[], ROWS]
+
+    def handler(request):
+        return httpx.Response(200, json=responses.pop(0))
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler)))
+
+    table = ExchangeRateTable()
+    table.auth_key = "test"
+    assert asyncio.run(table.refresh())
+    assert table.to_krw(1000, "JPY") == 9123
+    assert table.snapshot()["currencies"] == 4
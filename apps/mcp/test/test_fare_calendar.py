@@ -0,0 +1,68 @@
+import asyncio
+from datetime import date, timedelta
+
+from mcp_server.services.fare_calendar import (
+    STATUS_EMPTY, STATUS_OK, STATUS_TIMEOUT, build_date_grid, build_fare_matrix, iter_fare_calendar,
+)
+
+DEPART = date.today() + timedelta(days=30)
+RETURN = DEPART + timedelta(days=4)
+
+
+class FakeAgoda:
+    FLIGHT_TOP_N = 10
+
+    def __init__(self, slow_dates=()):
+        self.slow_dates = set(slow_dates)
+        self.calls = []
+
+    async def search_flights(self, origin, destination, depart, ret, adults=1, min_results=None):
+        self.calls.append((depart, ret))
+        if depart in self.slow_dates:
+            await asyncio.sleep(1)
+        if depart == DEPART.isoformat() and ret == RETURN.isoformat():
+            return []
+        price = 200000 + (date.fromisoformat(depart) - DEPART).days * 10000
+        return [{"price_krw": price, "airline": "KE"}, {"price_krw": price + 50000, "airline": "OZ"}]
+
+
+def _run(gen):
+    async def collect():
+        return [cell async for cell in gen]
+    return asyncio.run(collect())
+
+
+def test_date_grid_starts_at_requested_dates_and_skips_invalid_pairs():
+    grid = build_date_grid(DEPART, DEPART + timedelta(days=1), 2)
+    assert grid[0] == (DEPART, DEPART + timedelta(days=1))
+    assert all(ret >= dep for dep, ret in grid)
+    assert len(grid) < 25
+
+    past = build_date_grid(date.today(), date.today() + timedelta(days=3), 1)
+    assert all(dep >= date.today() for dep, _ in past)
+
+
+def test_fare_calendar_streams_every_cell_and_builds_matrix():
+    client = FakeAgoda()
+    cells = _run(iter_fare_calendar(client, "ICN", "NRT", DEPART, RETURN, flex_days=1, concurrency=2, deadline=5))
+
+    assert len(cells) == len(client.calls) == 9
+    by_dates = {(c["depart_date"], c["return_date"]): c for c in cells}
+    assert by_dates[(DEPART.isoformat(), RETURN.isoformat())]["status"] == STATUS_EMPTY
+    assert by_dates[(DEPART.isoformat(), (RETURN + timedelta(days=1)).isoformat())]["price_krw"] == 200000
+
+    matrix = build_fare_matrix(cells)
+    assert len(matrix["prices"]) == 3 and len(matrix["prices"][0]) == 3
+    assert matrix["prices"][1][1] is None
+    assert matrix["cheapest"]["depart_date"] == (DEPART - timedelta(days=1)).isoformat()
+
+
+def test_fare_calendar_marks_unfinished_cells_as_timeout():
+    slow = (DEPART + timedelta(days=1)).isoformat()
+    cells = _run(iter_fare_calendar(FakeAgoda(slow_dates=[slow]), "ICN", "NRT", DEPART, RETURN,
+                                    flex_days=1, concurrency=9, deadline=0.2))
+
+    statuses = {c["status"] for c in cells if c["depart_date"] == slow}
+    assert statuses == {STATUS_TIMEOUT}
+    assert len(cells) == 9
+    assert any(c["status"] == STATUS_OK for c in cells)
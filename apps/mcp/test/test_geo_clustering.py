@@ -0,0 +1,33 @@
+from mcp_server.services.geo_clustering import cluster_pois_by_day
+
+
+def _spot(name, lat, lng):
+    return {"name": name, "lat": lat, "lng": lng}
+
+
+def test_clusters_are_geographically_compact():
+    # 서로 멀리 떨어진 세 지역(각 4곳)을 3일로 나누면 지역별로 묶여야 함
+    pois = []
+    for i, (lat, lng) in enumerate([(35.68, 139.76), (35.71, 139.80), (35.63, 139.88)]):
+        for j in range(4):
+            pois.append(_spot(f"{i}-{j}", lat + j * 0.001, lng + j * 0.001))
+
+    days = cluster_pois_by_day(pois, 3)
+    assert len(days) == 3
+    for day in days:
+        assert len({p["name"].split("-")[0] for p in day}) == 1
+
+
+def test_days_are_balanced_and_keep_every_poi():
+    pois = [_spot(f"p{i}", 37.5 + (i % 7) * 0.01, 127.0 + (i // 7) * 0.01) for i in range(20)]
+    pois.append({"name": "no-coords"})
+
+    days = cluster_pois_by_day(pois, 4)
+    assert sorted(p["name"] for d in days for p in d) == sorted(p["name"] for p in pois)
+    assert max(len(d) for d in days) - min(len(d) for d in days) <= 1
+
+
+def test_more_days_than_pois():
+    days = cluster_pois_by_day([_spot("a", 37.5, 127.0)], 3)
+    assert len(days) == 3
+    assert sum(len(d) for d in days) == 1
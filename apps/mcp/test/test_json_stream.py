@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from mcp_server import json_stream
+
+DOC = {
+    "status": True,
+    "data": {"properties": [
+        {"propertyId": 1, "content": {"name": "A", "reviews": [{"text": "x" * 100}]}, "pricing": {"price": 10.5}},
+        {"propertyId": 2, "content": {"name": "B", "reviews": []}, "pricing": {"price": 20}},
+    ]},
+    "aggregation": {"huge": list(range(50))},
+}
+
+
+def _chunks(doc, size=7):
+    body = json.dumps(doc).encode()
+
+    async def gen():
+        for i in range(0, len(body), size):
+            yield body[i:i + size]
+    return gen()
+
+
+def _collect(paths, limit=None):
+    async def run():
+        found = []
+        async for item in json_stream.iter_paths(_chunks(DOC), paths):
+            found.append(item)
+            if limit and len(found) >= limit:
+                break
+        return found
+    return asyncio.run(run())
+
+
+@pytest.fixture(params=["ijson", "fallback"])
+def backend(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setattr(json_stream, "ijson", None)
+    elif json_stream.ijson is None:
+        pytest.skip("ijson not installed")
+    return request.param
+
+
+def test_iter_paths_yields_scalars_and_items(backend):
+    found = _collect({"status": None, "data.properties.item": None})
+    assert found[0] == ("status", True)
+    assert [v["propertyId"] for p, v in found if p == "data.properties.item"] == [1, 2]
+
+
+def test_iter_paths_stops_when_caller_breaks(backend):
+    found = _collect({"data.properties.item": None}, limit=1)
+    assert len(found) == 1
+
+
+def test_iter_paths_keeps_only_requested_fields():
+    if json_stream.ijson is None:
+        pytest.skip("ijson not installed")
+    found = _collect({"data.properties.item": ("propertyId", "content.name", "pricing.price")})
+    assert found[0][1] == {"propertyId": 1, "content": {"name": "A"}, "pricing": {"price": 10.5}}
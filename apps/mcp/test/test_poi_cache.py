@@ -0,0 +1,185 @@
+import asyncio
+import sqlite3
+import time
+
+import httpx
+
+from mcp_server.clients.poi_client import PoiClient
+from mcp_server.stores.poi_cache_store import PoiCacheStore
+
+POIS = [{"name": "경복궁", "category": "관광명소", "rating": 4.6, "lat": 37.57, "lng": 126.97}]
+
+
+def test_store_roundtrip_survives_new_instance(tmp_path):
+    path = str(tmp_path / "poi.sqlite3")
+    PoiCacheStore(path).put(" Tokyo ", "맛집", "google", "ko", POIS)
+
+    cached = PoiCacheStore(path).get("tokyo", "맛집", "google", "ko")
+    assert cached is not None
+    pois, fetched_at, complete = cached
+    assert pois == POIS
+    assert not complete
+    assert time.time() - fetched_at < 5
+    assert PoiCacheStore(path).get("tokyo", "맛집", "kakao", "ko") is None
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    store = PoiCacheStore(str(tmp_path / "poi.sqlite3"), max_entries=2)
+    store.put("a", "맛집", "google", "ko", POIS)
+    time.sleep(0.01)
+    store.put("b", "맛집", "google", "ko", POIS)
+    time.sleep(0.01)
+    store.get("a", "맛집", "google", "ko")  # a를 최근 사용으로
+    time.sleep(0.01)
+    store.put("c", "맛집", "google", "ko", POIS)
+
+    assert store.get("b", "맛집", "google", "ko") is None
+    assert store.get("a", "맛집", "google", "ko") is not None
+    assert store.stats()["entries"] == 2
+    assert store.stats()["evicted"] == 1
+
+
+def test_cache_hits_batch_access_time_writes(tmp_path):
+    path = str(tmp_path / "poi.sqlite3")
+    store = PoiCacheStore(path)
+    store.put("a", "맛집", "google", "ko", POIS)
+
+    def accessed_at():
+        return sqlite3.connect(path).execute("SELECT accessed_at FROM poi_cache").fetchone()[0]
+
+    written = accessed_at()
+    time.sleep(0.01)
+    store.get("a", "맛집", "google", "ko")
+    assert accessed_at() == written  # hit는 쓰지 않고 메모리에만 기록
+
+    store._last_flush -= store.TOUCH_FLUSH_INTERVAL
+    store.get("a", "맛집", "google", "ko")
+    assert accessed_at() > written
+
+
+def _client(store, calls):
+    client = PoiClient(cache_store=store)
+
+    async def fake_fetch(http_client, destination, category, is_domestic, target):
+        calls.append((destination, category, is_domestic))
+        return [{**POIS[0], "name": f"{category}-{len(calls)}"}], True
+
+    client._fetch_category = fake_fetch
+    return client
+
+
+def test_search_pois_hits_disk_cache_after_restart(tmp_path):
+    path = str(tmp_path / "poi.sqlite3")
+    calls = []
+    first = asyncio.run(_client(PoiCacheStore(path), calls).search_pois("서울", is_domestic=True))
+    assert len(calls) == 3
+    assert len(first) == 3
+
+    # 재시작: 새 저장소/클라이언트 인스턴스도 API를 호출하지 않음
+    second = asyncio.run(_client(PoiCacheStore(path), calls).search_pois("서울", is_domestic=True))
+    assert len(calls) == 3
+    assert second == first
+
+
+def test_stale_entries_are_served_and_refreshed_in_background(tmp_path):
+    store = PoiCacheStore(str(tmp_path / "poi.sqlite3"))
+    calls = []
+    client = _client(store, calls)
+    old = time.time() - client.cache_ttl - 60
+    for category in ("관광명소", "맛집", "카페"):
+        store.put("파리", category, "google", "ko", POIS, fetched_at=old, complete=True)
+
+    async def run():
+        pois = await client.search_pois("파리", is_domestic=False)
+        assert [p["name"] for p in pois] == ["경복궁"]  # stale 값을 즉시 반환
+        await asyncio.gather(*client._refreshing.values())
+        assert not client._refreshing
+
+    asyncio.run(run())
+    assert len(calls) == 3
+    pois, fetched_at, _ = store.get("파리", "맛집", "google", "ko")
+    assert pois[0]["name"].startswith("맛집-")
+    assert time.time() - fetched_at < 5
+
+
+def test_target_counts_scale_with_trip_length_and_style():
+    one_day = PoiClient.target_counts(1, "sightseeing")
+    week = PoiClient.target_counts(7, "sightseeing")
+    foodie = PoiClient.target_counts(7, "foodie")
+    assert one_day == {"관광명소": 10, "맛집": 10, "카페": 10}
+    assert week["관광명소"] > week["맛집"] > week["카페"] >= 10
+    assert foodie["맛집"] > week["맛집"]
+    assert max(PoiClient.target_counts(30, "sightseeing").values()) == 60
+    assert PoiClient.target_counts() == {"관광명소": 15, "맛집": 15, "카페": 15}
+
+
+def _google_place(i):
+    return {"name": f"place-{i}", "rating": 4.5, "types": ["tourist_attraction"],
+            "geometry": {"location": {"lat": 35.0 + i / 1000, "lng": 139.0}}}
+
+
+def test_google_follows_page_tokens_until_target(monkeypatch):
+    monkeypatch.setattr("mcp_server.clients.poi_client.settings.GOOGLE_PAGE_TOKEN_DELAY", 0)
+    requests = []
+
+    def handler(request):
+        requests.append(dict(request.url.params))
+        token = request.url.params.get("pagetoken")
+        if token is None:
+            return httpx.Response(200, json={"results": [_google_place(i) for i in range(20)], "next_page_token": "t1"})
+        if token == "t1" and sum(1 for r in requests if r.get("pagetoken") == "t1") == 1:
+            return httpx.Response(200, json={"status": "INVALID_REQUEST", "results": []})  # 토큰 아직 무효
+        return httpx.Response(200, json={"results": [_google_place(i) for i in range(20, 40)], "next_page_token": "t2"})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await PoiClient()._search_google(client, "도쿄 관광명소", target=30)
+
+    pois, complete = asyncio.run(run())
+    assert len(pois) == 30
+    assert not complete
+    assert [r.get("pagetoken") for r in requests] == [None, "t1", "t1"]  # t2는 요청하지 않음
+
+
+def test_kakao_fetches_remaining_pages_concurrently():
+    pages = []
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        pages.append(page)
+        docs = [{"place_name": f"p{page}-{i}", "x": "127.0", "y": "37.5", "category_group_name": "관광명소"}
+                for i in range(15)]
+        return httpx.Response(200, json={"documents": docs, "meta": {"pageable_count": 45, "is_end": page == 3}})
+
+    async def run(target):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await PoiClient()._search_kakao(client, "부산 맛집", target=target)
+
+    pois, complete = asyncio.run(run(10))
+    assert (len(pois), complete, pages) == (10, False, [1])
+
+    pages.clear()
+    pois, complete = asyncio.run(run(60))
+    assert len(pois) == 45 and complete
+    assert sorted(pages) == [1, 2, 3]
+
+
+def test_short_cached_list_is_refetched_for_longer_trip(tmp_path):
+    store = PoiCacheStore(str(tmp_path / "poi.sqlite3"))
+    client = PoiClient(cache_store=store)
+    calls = []
+
+    async def fake_fetch(http_client, destination, category, is_domestic, target):
+        calls.append(target)
+        return [{**POIS[0], "name": f"{category}-{i}"} for i in range(min(target, 25))], target >= 25
+
+    client._fetch_category = fake_fetch
+
+    asyncio.run(client.search_pois("오사카", False, num_days=1))
+    asyncio.run(client.search_pois("오사카", False, num_days=1))
+    assert len(calls) == 3  # 두 번째는 캐시
+
+    asyncio.run(client.search_pois("오사카", False, num_days=7, travel_style="foodie"))
+    assert len(calls) == 6  # 캐시 목록이 목표보다 짧아 다시 가져옴 (결과 끝까지 받음)
+    asyncio.run(client.search_pois("오사카", False, num_days=7, travel_style="foodie"))
+    assert len(calls) == 6
@@ -0,0 +1,117 @@
+import asyncio
+
+from mcp_server.clients.poi_client import PoiClient
+from mcp_server.stores.poi_cache_store import PoiCacheStore
+from mcp_server.stores.poi_catalog import PoiCatalog, write_catalog
+
+CATEGORIES = ["관광명소", "맛집", "카페"]
+
+
+def _pois(prefix, n, lat=35.68):
+    return [
+        {"name": f"{prefix}-{i}", "category": prefix, "rating": 4.25, "description": f"{prefix} {i} 설명",
+         "vicinity": "東京都", "lat": lat + i * 0.01, "lng": 139.76}
+        for i in range(n)
+    ]
+
+
+def _write(tmp_path, attractions=40, restaurants=40, cafes=40):
+    path = str(tmp_path / "poi_catalog.bin")
+    tokyo_attractions = _pois("관광명소", attractions)
+    tokyo_attractions[0]["rating"] = None  # 평점 없는 POI
+    write_catalog(
+        path,
+        {
+            "도쿄": {"관광명소": tokyo_attractions, "맛집": _pois("맛집", restaurants), "카페": _pois("카페", cafes)},
+            "오사카": {"관광명소": _pois("오사카", 3, lat=34.69)},
+        },
+        CATEGORIES,
+        aliases={"tokyo": "도쿄", "東京": "도쿄"},
+        providers={"도쿄": "google", "오사카": "google"},
+    )
+    return path
+
+
+def test_catalog_roundtrip_through_mmap(tmp_path):
+    catalog = PoiCatalog(_write(tmp_path))
+    assert catalog.load()
+
+    tokyo = catalog.get(" Tokyo ")
+    assert [len(tokyo[c]) for c in CATEGORIES] == [40, 40, 40]
+    assert tokyo["카페"][1] == {
+        "name": "카페-1", "category": "카페", "rating": 4.25, "description": "카페 1 설명",
+        "vicinity": "東京都", "lat": 35.69, "lng": 139.76,
+    }
+    assert catalog.get("東京")["맛집"][0]["name"] == "맛집-0"
+    assert catalog.get("오사카") == {"관광명소": _pois("오사카", 3, lat=34.69), "맛집": [], "카페": []}
+    assert tokyo["관광명소"][0]["rating"] is None  # 평점 없음은 0이 아닌 None
+    assert catalog.get("파리") is None
+    assert catalog.stats()["cities"] == 2
+
+    # 중심점은 좌표 배열만 읽고 hit/miss 통계에 넣지 않음
+    lat, lng = catalog.centroid("tokyo")
+    assert abs(lat - (35.68 + 0.195)) < 1e-9 and abs(lng - 139.76) < 1e-9
+    assert catalog.centroid("파리") is None
+    assert (catalog.stats()["hits"], catalog.stats()["misses"]) == (3, 1)
+
+
+def test_missing_or_invalid_catalog_is_ignored(tmp_path):
+    assert not PoiCatalog(str(tmp_path / "missing.bin")).load()
+
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a catalog at all")
+    catalog = PoiCatalog(str(bad))
+    assert not catalog.load()
+    assert catalog.get("도쿄") is None
+
+
+def _client(tmp_path, catalog, calls, targets=None):
+    targets = {} if targets is None else targets
+    client = PoiClient(cache_store=PoiCacheStore(str(tmp_path / "cache.sqlite3")), catalog=catalog)
+
+    async def fake_fetch(http_client, destination, category, is_domestic, target):
+        calls.append(category)
+        targets[category] = target
+        return [{"name": f"live-{category}-{i}", "category": category, "rating": 4.0, "lat": 10.0 + i, "lng": 10.0}
+                for i in range(target)], True
+
+    client._fetch_category = fake_fetch
+    return client
+
+
+def test_catalog_cities_skip_live_apis_and_short_categories_are_topped_up(tmp_path):
+    catalog = PoiCatalog(_write(tmp_path, cafes=5))
+    catalog.load()
+    calls, targets = [], {}
+    client = _client(tmp_path, catalog, calls, targets)
+
+    pois = asyncio.run(client.search_pois("tokyo", is_domestic=False, num_days=3, travel_style="sightseeing"))
+    assert calls == ["카페"]  # 카페만 목표(10)보다 적어 보충
+    assert targets == {"카페": 10}  # 겹치는 결과를 걸러낼 수 있도록 목표 개수만큼 요청
+    names = {p["name"] for p in pois}
+    assert "관광명소-0" in names and "live-카페-0" in names
+    assert sum(p["category"] == "카페" for p in pois) == 10  # 카탈로그 5 + 새 POI 5
+
+    calls.clear()
+    asyncio.run(client.search_pois("오사카", is_domestic=False, num_days=1))
+    assert sorted(calls) == sorted(CATEGORIES)
+
+
+def test_top_up_skips_live_results_already_in_catalog(tmp_path):
+    catalog = PoiCatalog(_write(tmp_path, cafes=5))
+    catalog.load()
+    client = PoiClient(cache_store=PoiCacheStore(str(tmp_path / "cache.sqlite3")), catalog=catalog)
+
+    async def overlapping_fetch(http_client, destination, category, is_domestic, target):
+        # 실시간 상위 결과는 카탈로그의 카페와 같은 장소 (표기만 다름)
+        same = [{"name": f"카페-{i} (본점)", "category": category, "rating": 4.5, "lat": 35.68 + i * 0.01, "lng": 139.76}
+                for i in range(5)]
+        new = [{"name": f"new-카페-{i}", "category": category, "rating": 4.0, "lat": 10.0 + i, "lng": 10.0}
+               for i in range(target - 5)]
+        return same + new, True
+
+    client._fetch_category = overlapping_fetch
+    results = asyncio.run(client.search_pois_by_category("도쿄", False, {"카페": 10}))
+
+    names = [p["name"] for p in results["카페"]]
+    assert names == [f"카페-{i}" for i in range(5)] + [f"new-카페-{i}" for i in range(5)]
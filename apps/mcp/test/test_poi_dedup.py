@@ -0,0 +1,44 @@
+from mcp_server.services.poi_dedup import dedupe_pois, normalize_poi_name
+
+
+def _poi(name, lat, lng, **extra):
+    return {"name": name, "lat": lat, "lng": lng, **extra}
+
+
+def test_normalize_poi_name():
+    assert normalize_poi_name("도쿄 타워 (Tokyo Tower)") == "도쿄타워"
+    assert normalize_poi_name("Ｉｃｈｉｒａｎ 본점") == "ichiran"
+    assert normalize_poi_name("  ") == ""
+
+
+def test_same_place_with_different_spelling_is_merged():
+    pois = [
+        _poi("도쿄 타워", 35.65858, 139.74543, rating=0),
+        _poi("도쿄타워 (Tokyo Tower)", 35.65860, 139.74550, rating=4.5, vicinity="Minato"),
+        _poi("이치란 본점", 35.6938, 139.7034),
+        _poi("이치란", 35.69385, 139.70345),
+    ]
+    unique = dedupe_pois(pois)
+    assert [p["name"] for p in unique] == ["도쿄 타워", "이치란 본점"]
+    assert unique[0]["rating"] == 4.5  # 빈 값은 중복 POI 값으로 채움
+    assert unique[0]["vicinity"] == "Minato"
+
+
+def test_same_name_far_apart_is_kept():
+    pois = [
+        _poi("스타벅스", 35.6595, 139.7005),
+        _poi("스타벅스", 35.6717, 139.7650),  # 다른 지점 (약 6km)
+        _poi("스타벅스", 35.6596, 139.7006),  # 첫 번째와 같은 장소
+    ]
+    assert len(dedupe_pois(pois)) == 2
+
+
+def test_nearby_different_places_and_missing_coords():
+    pois = [
+        _poi("메이지 신궁", 35.6764, 139.6993),
+        _poi("요요기 공원", 35.6765, 139.6994),  # 가깝지만 다른 장소
+        {"name": "메이지신궁"},  # 좌표 없음 + 이미 나온 이름
+        {"name": "좌표 없는 카페"},
+        _poi("", 35.0, 139.0),
+    ]
+    assert [p["name"] for p in dedupe_pois(pois)] == ["메이지 신궁", "요요기 공원", "좌표 없는 카페"]
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from mcp_server import metrics
+from mcp_server.clients.agoda_client import AgodaClient
+from mcp_server.rate_limiter import RapidApiQuotaExceeded, RapidApiRateLimiter, TokenBucket
+from mcp_server.resilience import ResilientTransport, RetryPolicy, single_route
+
+
+def test_token_bucket_spaces_out_requests_beyond_burst():
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    async def run():
+        return [await bucket.acquire() for _ in range(4)]
+
+    started = time.monotonic()
+    waits = asyncio.run(run())
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0
+    assert time.monotonic() - started >= 0.03
+
+
+def _limited_client(limiter, headers, status=200):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(status, headers=headers, json={})
+
+    client = httpx.AsyncClient(transport=limiter.transport(httpx.MockTransport(handler)))
+    return client, calls
+
+
+def test_low_quota_switches_to_cached_only_until_reset():
+    limiter = RapidApiRateLimiter(rate=100, burst=10, reserve=5)
+    client, calls = _limited_client(limiter, {
+        "X-RateLimit-Requests-Limit": "500",
+        "X-RateLimit-Requests-Remaining": "3",
+        "X-RateLimit-Requests-Reset": "3600",
+    })
+
+    async def run():
+        await client.get("https://rapidapi.test/hotels")
+        with pytest.raises(RapidApiQuotaExceeded):
+            await client.get("https://rapidapi.test/hotels")
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert limiter.cached_only
+    snapshot = limiter.snapshot()
+    assert snapshot["remaining"] == 3 and snapshot["limit"] == 500 and snapshot["rejected"] == 1
+
+    limiter.blocked_until = time.time() - 1  # 리셋 시각 경과
+    assert not limiter.cached_only
+
+
+def test_http_429_blocks_with_default_cooldown():
+    limiter = RapidApiRateLimiter(rate=100, burst=10, reserve=0)
+    client, _ = _limited_client(limiter, {}, status=429)
+    asyncio.run(client.get("https://rapidapi.test/flights"))
+    assert limiter.cached_only
+    assert limiter.blocked_until - time.time() > 30
+
+
+def test_retries_go_through_the_limiter_and_stop_on_429():
+    limiter = RapidApiRateLimiter(rate=100, burst=10, reserve=0)
+    statuses = [503, 429, 200]
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[len(calls) - 1], json={})
+
+    policy = RetryPolicy(attempts=3, base_delay=0.001)
+    transport = ResilientTransport(single_route("test.rapidapi_retry", policy), limiter.transport(httpx.MockTransport(handler)))
+    client = httpx.AsyncClient(transport=transport)
+
+    with pytest.raises(RapidApiQuotaExceeded):
+        asyncio.run(client.get("https://rapidapi.test/flights"))
+    # 재시도도 토큰을 쓰고, 429 이후 시도는 보내지 않고 거절
+    assert len(calls) == 2
+    assert limiter.snapshot()["requests"] == 2 and limiter.snapshot()["rejected"] == 1
+
+
+def test_search_flights_serves_expired_cache_when_quota_exhausted():
+    client = AgodaClient()
+    client.rate_limiter = RapidApiRateLimiter(rate=100, burst=10, reserve=0)
+    client.rate_limiter.blocked_until = time.time() + 60
+    key = ("ICN", "NRT", "2025-12-06", "2025-12-10", 1, client.FLIGHT_CABIN_CLASS)
+    client.flight_cache.set(key, [{"price_krw": 300000}], ttl=0, fetched_at=time.time() - 7 * 86400)
+
+    cached = asyncio.run(client.search_flights("ICN", "NRT", "2025-12-06", "2025-12-10"))
+    missing = asyncio.run(client.search_flights("ICN", "KIX", "2025-12-06", "2025-12-10"))
+
+    assert cached[0]["price_krw"] == 300000
+    assert missing == []
+
+
+def test_metrics_collect_includes_quota_and_caches():
+    AgodaClient()
+    snapshot = metrics.collect()
+    assert "rapidapi_quota" in snapshot
+    assert "cache.flights" in snapshot and "entries" in snapshot["cache.flights"]
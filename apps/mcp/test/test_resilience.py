@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from mcp_server import metrics
+from mcp_server.resilience import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN,
+    CircuitBreaker, CircuitOpenError, ResilientTransport, RetryPolicy, call_sync, get_breaker, single_route,
+)
+
+FAST_RETRY = RetryPolicy(attempts=3, base_delay=0.0)
+
+
+def _client(name, statuses, policy=FAST_RETRY):
+    """statuses 순서대로 응답하는 MockTransport를 ResilientTransport로 감싼 클라이언트"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if status is None:
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(status, json={})
+
+    transport = ResilientTransport(single_route(name, policy), httpx.MockTransport(handler))
+    return httpx.AsyncClient(transport=transport), calls
+
+
+def test_retries_transient_errors_then_succeeds():
+    client, calls = _client("test.retry", [None, 503, 200])
+    response = asyncio.run(client.get("https://upstream.test/"))
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_returns_last_response_when_retries_exhausted():
+    client, calls = _client("test.exhausted", [503])
+    response = asyncio.run(client.get("https://upstream.test/"))
+    assert response.status_code == 503
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    client, calls = _client("test.404", [404])
+    assert asyncio.run(client.get("https://upstream.test/")).status_code == 404
+    assert len(calls) == 1
+    assert get_breaker("test.404").snapshot()["failures"] == 0
+
+
+def test_rate_limited_responses_do_not_open_breaker():
+    client, calls = _client("test.429", [429], policy=RetryPolicy(attempts=1))
+
+    async def run():
+        return [(await client.get("https://upstream.test/")).status_code for _ in range(30)]
+
+    assert set(asyncio.run(run())) == {429}
+    snapshot = get_breaker("test.429").snapshot()
+    assert snapshot["state"] == STATE_CLOSED
+    assert snapshot["failures"] == 0
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=3.0)
+    delays = [policy.backoff(4) for _ in range(200)]
+    assert all(0 <= d <= 3.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_breaker_opens_and_fails_fast():
+    client, calls = _client("test.open", [None], policy=RetryPolicy(attempts=1))
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://upstream.test/")
+        with pytest.raises(CircuitOpenError):
+            await client.get("https://upstream.test/")
+
+    asyncio.run(run())
+    assert len(calls) == 5
+    assert get_breaker("test.open").state == STATE_OPEN
+    assert metrics.collect()["circuit_breakers"]["test.open"]["state"] == STATE_OPEN
+
+
+def test_breaker_opens_on_slow_calls_and_recovers_after_trial():
+    breaker = CircuitBreaker("test.slow", window=10, min_calls=3, slow_call_seconds=1.0,
+                             slow_call_rate=0.6, recovery_seconds=0.05)
+    for _ in range(3):
+        breaker.record_success(2.0)
+    assert breaker.state == STATE_OPEN
+
+    time.sleep(0.06)
+    assert breaker.state == STATE_HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # half-open에서는 시험 호출 하나만
+    breaker.record_success(0.1)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_call_sync_does_not_retry_non_transient_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        call_sync("test.sync", RetryPolicy(attempts=3, base_delay=0.0), flaky, retry_on=(TimeoutError,))
+    assert len(attempts) == 1
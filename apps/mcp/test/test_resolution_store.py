@@ -0,0 +1,49 @@
+from mcp_server.config import settings
+from mcp_server.stores.resolution_store import KIND_IATA, KIND_PLACE_ID, ResolutionStore
+
+
+def test_put_get_and_share_between_instances(tmp_path):
+    path = str(tmp_path / "resolutions.sqlite3")
+    store = ResolutionStore(path)
+    store.put(KIND_PLACE_ID, " Tokyo ", "1_5085", source="agoda_autocomplete", confidence=0.9)
+
+    assert store.get_value(KIND_PLACE_ID, "tokyo") == "1_5085"
+
+    # 다른 워커(새 인스턴스)도 디스크에서 읽어 옴
+    other = ResolutionStore(path)
+    assert other.load() == 1
+    record = other.get(KIND_PLACE_ID, "TOKYO")
+    assert record["source"] == "agoda_autocomplete"
+    assert record["confidence"] == 0.9
+
+
+def test_admin_entries_are_not_overwritten(tmp_path):
+    store = ResolutionStore(str(tmp_path / "r.sqlite3"))
+    store.put(KIND_IATA, "라스베가스", "LAS", source="admin", confidence=1.0)
+    store.put(KIND_IATA, "라스베가스", "LAX", source="gemini", confidence=0.6)
+    assert store.get_value(KIND_IATA, "라스베가스") == "LAS"
+
+    assert store.delete(KIND_IATA, "라스베가스")
+    assert store.get(KIND_IATA, "라스베가스") is None
+
+
+def test_list_filters(tmp_path):
+    store = ResolutionStore(str(tmp_path / "r.sqlite3"))
+    store.put(KIND_IATA, "osaka", "KIX", source="gemini", confidence=0.6)
+    store.put(KIND_PLACE_ID, "osaka", "1_9590", source="agoda_autocomplete", confidence=0.9)
+    assert [r["value"] for r in store.list(kind=KIND_IATA)] == ["KIX"]
+    assert len(store.list(query="osa")) == 2
+
+
+def test_changes_from_other_workers_are_picked_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RESOLUTION_SYNC_INTERVAL", 0)
+    path = str(tmp_path / "r.sqlite3")
+    worker_a, worker_b = ResolutionStore(path), ResolutionStore(path)
+    worker_a.put(KIND_IATA, "라스베가스", "LAX", source="gemini", confidence=0.6)
+    assert worker_b.get_value(KIND_IATA, "라스베가스") == "LAX"
+
+    # 관리자 보정/삭제는 다른 워커 메모리에도 반영
+    worker_a.put(KIND_IATA, "라스베가스", "LAS", source="admin", confidence=1.0)
+    assert worker_b.get_value(KIND_IATA, "라스베가스") == "LAS"
+    worker_a.delete(KIND_IATA, "라스베가스")
+    assert worker_b.get(KIND_IATA, "라스베가스") is None
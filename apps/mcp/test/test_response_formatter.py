@@ -0,0 +1,54 @@
+import gzip
+import json
+
+from mcp_server.services import response_formatter
+
+
+def _v1_payload():
+    flights = [{"airline": "KE", "price_krw": 500000}, {"airline": "OZ", "price_krw": 550000}]
+    hotels = [{"id": 1, "name": "H1"}]
+    return {
+        "flight_candidates": flights,
+        "flight_quote": flights[0],
+        "hotel_candidates": hotels,
+        "hotel_quote": hotels[0],
+        "weather_info": {"location": "도쿄", "daily": [{"date": "2025-12-06", "temp": 10.0, "humidity": 50}]},
+        "weather_by_date": {"2025-12-06": {"temp": 10.0}},
+        "poi_list": [{"name": "A", "lat": 1.0, "lng": 2.0, "latitude": 1.0, "longitude": 2.0}],
+        "schedule": [],
+    }
+
+
+def test_v2_removes_duplicates():
+    v2 = response_formatter.to_v2(_v1_payload())
+    assert v2["format"] == "v2"
+    assert "flight_quote" not in v2 and "hotel_quote" not in v2 and "weather_info" not in v2
+    assert v2["flight_quote_index"] == 0
+    assert v2["hotel_quote_index"] == 0
+    assert v2["weather_location"] == "도쿄"
+    assert v2["weather_by_date"]["2025-12-06"] == {"temp": 10.0, "humidity": 50}
+    assert v2["poi_list"] == [{"name": "A", "lat": 1.0, "lng": 2.0}]
+
+
+def test_v2_without_quotes():
+    v2 = response_formatter.to_v2({"flight_candidates": [], "flight_quote": {}})
+    assert v2["flight_quote_index"] is None
+    assert v2["hotel_quote_index"] is None
+
+
+def test_select_fields():
+    data = _v1_payload()
+    assert list(response_formatter.select_fields(data, ["schedule", " poi_list", "missing"])) == ["schedule", "poi_list"]
+    assert response_formatter.select_fields(data, None) is data
+
+
+def test_compress_negotiation():
+    body = response_formatter.dumps({"items": ["도쿄"] * 500})
+    assert json.loads(body)["items"][0] == "도쿄"
+
+    compressed, encoding = response_formatter.compress(body, "gzip;q=1.0, identity")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+
+    assert response_formatter.compress(body, "gzip;q=0") == (body, None)
+    assert response_formatter.compress(b"{}", "gzip") == (b"{}", None)
@@ -0,0 +1,40 @@
+from mcp_server.services.route_optimizer import haversine_matrix, optimize_day_route
+
+
+def _event(slot, name, lat, lng, icon="camera", description="관광"):
+    return {"time_slot": slot, "poi_name": name, "latitude": lat, "longitude": lng, "icon": icon, "description": description}
+
+
+def test_haversine_matrix_known_distance():
+    # 서울시청 ↔ 부산시청 직선거리 약 325km
+    dist = haversine_matrix([37.5663, 35.1798], [126.9779, 129.0750])
+    assert dist[0, 0] == 0
+    assert 320 < dist[0, 1] < 330
+    assert dist[0, 1] == dist[1, 0]
+
+
+def test_reorders_by_proximity_and_keeps_meal_anchor():
+    events = [
+        _event("09:00", "A", 37.50, 127.00),
+        _event("10:30", "C", 37.50, 127.10),
+        _event("11:30", "B", 37.50, 127.05),
+        _event("12:30", "점심", 37.50, 127.12, icon="utensils", description="점심 식사"),
+        _event("14:00", "D", 37.50, 127.13),
+    ]
+    ordered = optimize_day_route(events)
+
+    assert [e["poi_name"] for e in ordered] == ["A", "B", "C", "점심", "D"]
+    assert [e["time_slot"] for e in ordered] == ["09:00", "10:30", "11:30", "12:30", "14:00"]
+    assert "travel_minutes_from_prev" not in ordered[0]
+    assert all(e["travel_minutes_from_prev"] >= 0 for e in ordered[1:])
+
+
+def test_events_without_coordinates_stay_in_place():
+    events = [
+        {"time_slot": "도착", "description": "공항 도착", "icon": "plane"},
+        _event("15:00", "far", 37.60, 127.20),
+        _event("16:00", "near", 37.50, 127.00),
+    ]
+    ordered = optimize_day_route(events)
+    assert ordered[0]["time_slot"] == "도착"
+    assert {e["poi_name"] for e in ordered[1:]} == {"far", "near"}
@@ -0,0 +1,56 @@
+from mcp_server.services.mcp_service import MCPService
+
+
+def _poi(name, category, lat, lng):
+    return {"name": name, "category": category, "lat": lat, "lng": lng}
+
+
+TOURIST = [_poi(f"명소-{i}", "관광명소", 37.50, 127.00 + i * 0.01) for i in range(3)]
+DINING = [
+    _poi("먼 식당", "음식점", 37.60, 127.20),
+    _poi("가까운 식당", "음식점", 37.501, 127.001),
+    _poi("두번째 식당", "음식점", 37.505, 127.005),
+]
+
+
+def _day(*events):
+    return {"events": [dict(e) for e in events]}
+
+
+def test_tourist_pois_rotate_without_repeats_until_exhausted():
+    schedule = [_day({"time_slot": "오전", "description": "관광", "icon": "camera"}) for _ in range(4)]
+    MCPService()._enrich_schedule_with_pois(schedule, TOURIST)
+
+    names = [day["events"][0]["poi_name"] for day in schedule]
+    assert names[:3] == ["명소-0", "명소-1", "명소-2"]
+    assert names[3] == "명소-0"  # 후보를 다 쓴 뒤에만 다시 사용
+    assert schedule[0]["events"][0]["latitude"] == 37.50
+
+
+def test_dining_picks_nearest_unused_restaurant():
+    morning = {"time_slot": "오전", "description": "관광", "icon": "camera", "poi_name": "명소-0"}
+    lunch = {"time_slot": "점심", "description": "점심 식사", "icon": "utensils"}
+    schedule = [_day(morning, lunch), _day(morning, lunch)]
+    MCPService()._enrich_schedule_with_pois(schedule, TOURIST + DINING)
+
+    assert schedule[0]["events"][1]["poi_name"] == "가까운 식당"
+    assert schedule[1]["events"][1]["poi_name"] == "두번째 식당"
+
+
+def test_events_without_coordinates_are_left_untouched():
+    arrival = {"time_slot": "도착", "description": "공항 도착 (14:00)", "icon": "plane"}
+    schedule = [_day(
+        arrival,
+        {"time_slot": "오후", "description": "관광", "icon": "camera", "poi_name": "명소-2"},
+        {"time_slot": "저녁", "description": "관광", "icon": "camera", "poi_name": "명소-0"},
+    )]
+    service = MCPService()
+    service._enrich_schedule_with_pois(schedule, TOURIST)
+    service._optimize_schedule_routes(schedule)
+
+    events = schedule[0]["events"]
+    assert events[0] == arrival  # 좌표 없는 도착 이벤트는 그대로, 이동 정보도 없음
+    assert [e["poi_name"] for e in events[1:]] == ["명소-2", "명소-0"]
+    assert [e["time_slot"] for e in events] == ["도착", "오후", "저녁"]
+    assert "travel_minutes_from_prev" not in events[1]
+    assert events[2]["travel_km_from_prev"] > 0
@@ -0,0 +1,67 @@
+import numpy as np
+
+from mcp_server.services.route_optimizer import haversine_matrix
+from mcp_server.services.spatial_index import SpatialIndex, centroid, rank_hotels_by_poi_centroid
+
+
+def _random_pois(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = 35.6 + rng.random(n) * 0.2
+    lngs = 139.6 + rng.random(n) * 0.3
+    return [{"name": f"p{i}", "lat": float(lat), "lng": float(lng)} for i, (lat, lng) in enumerate(zip(lats, lngs))]
+
+
+def _brute_force(pois, lat, lng):
+    dist = haversine_matrix([lat] + [p["lat"] for p in pois], [lng] + [p["lng"] for p in pois])[0, 1:]
+    return [pois[i]["name"] for i in np.argsort(dist)], np.sort(dist)
+
+
+def test_nearest_matches_brute_force_on_grid_path():
+    pois = _random_pois(500) + [{"name": "no-coords"}]
+    index = SpatialIndex(pois, cell_km=0.5)
+    assert len(index) == 500
+
+    for lat, lng in [(35.7, 139.75), (35.61, 139.61), (35.9, 140.2)]:  # 마지막은 점 분포 바깥
+        expected_names, expected_dist = _brute_force(pois[:500], lat, lng)
+        found = index.nearest(lat, lng, k=7)
+        assert [p["name"] for p, _ in found] == expected_names[:7]
+        np.testing.assert_allclose([d for _, d in found], expected_dist[:7], rtol=1e-2)
+
+
+def test_within_returns_sorted_points_inside_radius():
+    pois = _random_pois(300, seed=1)
+    index = SpatialIndex(pois, cell_km=1.0)
+    found = index.within(35.7, 139.75, 2.5)
+
+    names, dist = _brute_force(pois, 35.7, 139.75)
+    inside = {n for n, d in zip(names, dist) if d <= 2.45}
+    assert inside <= {p["name"] for p, _ in found}
+    assert all(d <= 2.5 for _, d in found)
+    assert [d for _, d in found] == sorted(d for _, d in found)
+
+
+def test_small_and_empty_indexes():
+    assert SpatialIndex([]).nearest(35.0, 139.0, k=3) == []
+    assert SpatialIndex([{"name": "x"}]).within(35.0, 139.0, 10) == []
+
+    pois = _random_pois(10)
+    index = SpatialIndex(pois)
+    assert len(index.nearest(35.7, 139.7, k=50)) == 10
+    assert index.nearest(35.7, 139.7, k=3, max_km=0.0) == []
+
+
+def test_hotels_near_poi_centroid_move_up():
+    pois = [{"name": "a", "lat": 35.68, "lng": 139.76}, {"name": "b", "lat": 35.69, "lng": 139.77}]
+    assert centroid(pois) == (35.685, 139.765)
+
+    hotels = [
+        {"id": 1, "latitude": 35.90, "longitude": 140.10},  # 기존 1위지만 멀리 떨어짐
+        {"id": 2, "latitude": 35.685, "longitude": 139.765},
+        {"id": 3, "latitude": None, "longitude": None},
+    ]
+    ranked = rank_hotels_by_poi_centroid(hotels, pois, weight=0.6)
+    assert [h["id"] for h in ranked] == [2, 1, 3]
+    assert ranked[0]["distance_to_pois_km"] == 0.0
+    assert ranked[2]["distance_to_pois_km"] is None
+
+    assert rank_hotels_by_poi_centroid(hotels, [{"name": "no-coords"}]) == hotels
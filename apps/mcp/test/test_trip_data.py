@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import httpx
+
+from mcp_server.services.mcp_service import MCPService
+
+REQUEST = {"destination": "도쿄", "origin": "ICN", "start_date": "2025-12-06", "end_date": "2025-12-08",
+           "party_size": 1, "interests": ["관광"]}
+
+
+def _bundle(price_usd, hour):
+    return {
+        "bundlePrice": [{"price": {"usd": {"display": {"perBook": {"allInclusive": price_usd}}}}}],
+        "itineraries": [{"itineraryInfo": {"totalTripDuration": 150}, "inboundSlice": {"segments": [
+            {"departDateTime": "2025-12-08T18:00:00", "arrivalDateTime": "2025-12-08T20:30:00"}]}}],
+        "outboundSlice": {"segments": [{"departDateTime": f"2025-12-06T{hour:02d}:00:00",
+                                        "arrivalDateTime": f"2025-12-06T{hour + 2:02d}:30:00",
+                                        "carrierContent": {"carrierName": "Korean Air"}}]},
+    }
+
+
+def _service(pois=()):
+    """항공권만 MockTransport로 실제 검색 경로를 타고, 나머지 upstream은 고정 값을 돌려주는 MCPService"""
+    service = MCPService()
+    service.llm_model = None
+    agoda = service.agoda_client
+    calls = []
+    top_n = agoda.FLIGHT_TOP_N
+    polls = [
+        {"retry": {"next": 1}, "trips": [{"isCompleted": False, "bundles": [_bundle(300 + i, 6 + i) for i in range(top_n)]}]},
+        {"retry": {"next": 1}, "trips": [{"isCompleted": True, "bundles": [_bundle(100, 5)]}]},
+    ]
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=polls[min(len(calls), len(polls)) - 1])
+
+    async def iata(client, city):
+        return "NRT"
+
+    async def no_hotels(*args, **kwargs):
+        return []
+
+    async def fixed_pois(*args, **kwargs):
+        return [dict(p) for p in pois]
+
+    async def no_weather(*args, **kwargs):
+        return {}
+
+    agoda.headers["X-RapidAPI-Key"] = "test-key"
+    agoda._get_usd_to_krw_rate = lambda: 1000.0
+    agoda._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    agoda._get_iata_code = iata
+    agoda.search_hotels = no_hotels
+    service.poi_client.search_pois = fixed_pois
+    service.weather_client.get_weather_forecast = no_weather
+    return service, calls
+
+
+def test_second_plan_serves_flights_from_cache():
+    service, calls = _service()
+
+    async def run():
+        first = await service.generate_trip_data(dict(REQUEST))
+        polls_at_return = len(calls)
+        # 첫 플랜은 상위 후보가 모이자마자 반환하고, 공유 검색은 뒤에서 완료되어 캐시됨
+        await asyncio.gather(*service.agoda_client._background_searches)
+        polls_after_search = len(calls)
+        second = await service.generate_trip_data(dict(REQUEST))
+        return first, second, polls_at_return, polls_after_search
+
+    first, second, polls_at_return, polls_after_search = asyncio.run(run())
+    assert polls_at_return == 1
+    assert len(first["flight_candidates"]) == service.agoda_client.FLIGHT_TOP_N
+    assert len(calls) == polls_after_search == 2  # 두 번째 플랜은 HTTP 호출 없음
+    assert second["flight_quote"]["price_krw"] == 100000
+
+
+class FakeLLM:
+    def __init__(self, schedule):
+        self.schedule = schedule
+
+    def generate_content(self, prompt, generation_config=None):
+        return type("Response", (), {"text": json.dumps(self.schedule, ensure_ascii=False)})()
+
+
+def test_unrated_catalog_poi_does_not_break_schedule_generation():
+    pois = [
+        {"name": "평점 없는 명소", "category": "관광명소", "rating": None, "lat": 35.68, "lng": 139.76},
+        {"name": "도쿄 타워", "category": "관광명소", "rating": 4.6, "lat": 35.6586, "lng": 139.7454},
+    ]
+    service, _ = _service(pois)
+    day = {"day": 1, "date": "1일차", "full_date": "2025-12-06",
+           "events": [{"time_slot": "10:00", "description": "도쿄 타워 전망", "icon": "camera", "poi_name": "도쿄 타워"}]}
+    service.llm_model = FakeLLM([day])
+
+    result = asyncio.run(service.generate_trip_data(dict(REQUEST)))
+
+    assert "error" not in result
+    assert result["schedule"][0]["events"][0]["poi_name"] == "도쿄 타워"
+    assert {p["name"] for p in result["poi_list"]} == {"평점 없는 명소", "도쿄 타워"}
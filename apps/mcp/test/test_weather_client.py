@@ -0,0 +1,114 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from mcp_server.clients.weather_client import WeatherClient
+from mcp_server.config import settings
+from mcp_server.stores.resolution_store import KIND_GEOCODE, ResolutionStore
+
+
+def _forecast(start: date, days: int = 2):
+    items = []
+    for i in range(days * 8):
+        dt = datetime.combine(start, datetime.min.time()) + timedelta(hours=3 * i)
+        items.append({
+            "dt": int(dt.timestamp()),
+            "dt_txt": dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "main": {"temp": 10 + i % 8, "temp_min": 8 + i % 8, "temp_max": 12 + i % 8, "humidity": 60},
+            "weather": [{"main": "Clear" if i % 8 < 5 else "Rain", "description": "맑음" if i % 8 < 5 else "비",
+                         "icon": "01d" if i % 8 < 5 else "10d"}],
+            "wind": {"speed": 3.0},
+        })
+    return {"list": items}
+
+
+def _client(store, calls, start):
+    client = WeatherClient(store=store)
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        if request.url.path == "/geo/1.0/direct":
+            return httpx.Response(200, json=[{"lat": 35.6762, "lon": 139.6503}])
+        return httpx.Response(200, json=_forecast(start))
+
+    client._new_http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_geocoding_result_is_persisted_and_reused(tmp_path):
+    path = str(tmp_path / "resolutions.sqlite3")
+    start = date.today() + timedelta(days=1)
+    calls = []
+
+    result = asyncio.run(_client(ResolutionStore(path), calls, start).get_weather_forecast("도쿄", start, start))
+    assert calls == ["/geo/1.0/direct", "/data/2.5/forecast"]
+    assert result["daily"][0]["condition"] == "Clear"
+
+    # 재시작 후에도 저장된 좌표 사용
+    calls.clear()
+    store = ResolutionStore(path)
+    asyncio.run(_client(store, calls, start).get_weather_forecast("도쿄", start, start))
+    assert calls == ["/data/2.5/forecast"]
+    assert store.get_value(KIND_GEOCODE, "도쿄") == "35.67620,139.65030"
+
+
+def test_known_coordinates_skip_geocoding(tmp_path):
+    start = date.today() + timedelta(days=1)
+    calls = []
+    client = _client(ResolutionStore(str(tmp_path / "r.sqlite3")), calls, start)
+    asyncio.run(client.get_weather_forecast("어딘가", start, start, coords={"lat": 1.0, "lon": 2.0}))
+    assert calls == ["/data/2.5/forecast"]
+
+
+def test_forecast_ttl_expires_on_provider_update_boundaries():
+    boundary = 1_700_000_000 // 10800 * 10800  # UTC 3시간 경계
+    lag = settings.WEATHER_FORECAST_PUBLISH_LAG
+    assert WeatherClient.forecast_ttl(boundary + lag + 60) == 10800 - 60
+    assert WeatherClient.forecast_ttl(boundary + lag - 60) == 60
+    assert WeatherClient.forecast_ttl(boundary + lag) == 10800
+
+
+def test_forecast_is_cached_once_per_rounded_coordinates(tmp_path):
+    start = date.today() + timedelta(days=1)
+    calls = []
+    client = _client(ResolutionStore(str(tmp_path / "r.sqlite3")), calls, start)
+
+    async def run():
+        # 동시 miss는 한 번의 호출로 합쳐지고, 다른 날짜 범위도 같은 원본에서 집계
+        first, second = await asyncio.gather(
+            client.get_weather_forecast("a", start, start, coords={"lat": 35.6762, "lon": 139.6503}),
+            client.get_weather_forecast("b", start, start + timedelta(days=1), coords={"lat": 35.6799, "lon": 139.6498}),
+        )
+        third = await client.get_weather_forecast("c", start + timedelta(days=1), start + timedelta(days=1),
+                                                  coords={"lat": 35.68, "lon": 139.65})
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert calls == ["/data/2.5/forecast"]
+    assert len(first["daily"]) == 1 and len(second["daily"]) == 2
+    assert third["daily"][0]["date"] == (start + timedelta(days=1)).isoformat()
+    assert client.forecast_cache.stats()["coalesced"] == 1
+
+
+def test_trip_beyond_forecast_horizon_skips_network(tmp_path):
+    start = date.today() + timedelta(days=30)
+    calls = []
+    client = _client(ResolutionStore(str(tmp_path / "r.sqlite3")), calls, start)
+    result = asyncio.run(client.get_weather_forecast("도쿄", start, start + timedelta(days=2)))
+    assert calls == []
+    assert [d["date"] for d in result["daily"]] == [(start + timedelta(days=i)).isoformat() for i in range(3)]
+    assert all(d["condition"] == "N/A" and d["temp"] is None for d in result["daily"])
+
+
+def test_daily_aggregation_summarizes_each_day(tmp_path):
+    start = date(2025, 12, 6)
+    items = _forecast(start - timedelta(days=1), days=3)["list"]
+    client = WeatherClient(store=ResolutionStore(str(tmp_path / "r.sqlite3")))
+    result = client._aggregate_daily("도쿄", items, start, start + timedelta(days=5))
+    assert [d["date"] for d in result["daily"]] == ["2025-12-06", "2025-12-07"]
+    assert result["daily"][0] == {
+        "date": "2025-12-06", "temp": 13.5, "temp_min": 8.0, "temp_max": 19.0,
+        "condition": "Clear", "description": "맑음", "icon": "01d", "humidity": 60, "wind_speed": 3.0,
+    }